@@ -1,3 +1,4 @@
+import { inflateSync } from 'zlib';
 import logger from '../core/logger';
 import { redisClient } from '../service/redis/client';
 import interviewSessionRepo from '../database/repositories/interview-session.repo';
@@ -16,6 +17,18 @@ interface ParsedEvent {
     event: string;
     payload: string;
     ts?: string;
+    v?: string;
+    enc?: string;
+}
+
+/**
+ * Schema v2: the conversation lives in a per-session list (index = message seq)
+ * and events carry a [from, to) seq range of it instead of the full history.
+ */
+interface HistoryRef {
+    key: string;
+    from: number;
+    to: number;
 }
 
 interface StartInterviewPayload {
@@ -26,6 +39,7 @@ interface StartInterviewPayload {
 }
 
 interface EndInterviewPayload extends StartInterviewPayload {
+    history?: HistoryRef;
     conversationHistory?: Array<{ role: string; content: string }>;
 }
 
@@ -43,6 +57,7 @@ interface QuestionEvaluatePayload extends StartInterviewPayload {
     answerEndedAt?: string;
     thinkingTime?: number;
     answerDuration?: number;
+    history?: HistoryRef;
     conversationHistory: Array<{ role: string; content: string }>;
     metrics?: Record<string, unknown>;
     interviewQuestionId?: number;
@@ -69,7 +84,26 @@ function parseEvent(fields: string[]): ParsedEvent | null {
     const event = obj.event;
     const payload = obj.payload;
     if (!event || !payload) return null;
-    return { event, payload, ts: obj.ts };
+    return { event, payload, ts: obj.ts, v: obj.v, enc: obj.enc };
+}
+
+function decodePayload(parsed: ParsedEvent): string {
+    if (parsed.enc === 'zlib+base64') {
+        return inflateSync(Buffer.from(parsed.payload, 'base64')).toString('utf8');
+    }
+    return parsed.payload;
+}
+
+/** Rebuild the conversation a v2 event references (v1 events embed it). */
+async function loadHistory(
+    ref: HistoryRef,
+): Promise<Array<{ role: string; content: string }>> {
+    if (ref.to <= ref.from) return [];
+    const items = await redisClient.getListRange(ref.key, ref.from, ref.to - 1);
+    return items.map((item) => {
+        const m = JSON.parse(item) as { role: string; content: string };
+        return { role: m.role, content: m.content };
+    });
 }
 
 async function handleStartInterview(p: StartInterviewPayload): Promise<void> {
@@ -279,13 +313,16 @@ async function handleGenerateReport(p: GenerateReportPayload): Promise<void> {
 async function handleInterviewEvent(parsed: ParsedEvent): Promise<void> {
     let payload: unknown;
     try {
-        payload = JSON.parse(parsed.payload) as Record<string, unknown>;
+        payload = JSON.parse(decodePayload(parsed)) as Record<string, unknown>;
     } catch {
         logger.warn('Invalid payload JSON', { event: parsed.event });
         return;
     }
 
     const p = payload as Record<string, unknown>;
+    if (p.history && !p.conversationHistory) {
+        p.conversationHistory = await loadHistory(p.history as HistoryRef);
+    }
     switch (parsed.event) {
         case 'start_interview':
             await handleStartInterview(p as unknown as StartInterviewPayload);
@@ -213,6 +213,17 @@ class RedisClient {
         }
     }
 
+    /**
+     * Read list elements start..stop (inclusive, like LRANGE)
+     */
+    public async getListRange(
+        key: string,
+        start: number,
+        stop: number,
+    ): Promise<string[]> {
+        return await this.redis.lrange(key, start, stop);
+    }
+
     /**
      * Close Redis connection
      */
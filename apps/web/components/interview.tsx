@@ -30,6 +30,7 @@ export default function VoiceChat({ context }: VoiceChatProps = {}) {
   const [currentTranscript, setCurrentTranscript] = useState("");
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const aiSpeakingTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+  const streamingReplyRef = useRef(false);
   const audioContextRef = useRef<AudioContext | null>(null);
 
   const scrollToBottom = () => {
@@ -250,6 +251,8 @@ export default function VoiceChat({ context }: VoiceChatProps = {}) {
             toast.error("Access denied. Please sign in again.");
           } else if (code === "SESSION_EXPIRED") {
             toast.error("Session expired or invalid. Please start the interview again.");
+          } else if (code === "NODE_AT_CAPACITY") {
+            toast.error("The interview service is busy. Please try again in a moment.");
           } else {
             toast.error(message);
           }
@@ -312,8 +315,21 @@ export default function VoiceChat({ context }: VoiceChatProps = {}) {
         }
 
         if (data.type === "llm_response") {
-          setMessages((prev) => prev.filter((m) => m.content !== "💭 Thinking..."));
-          addMessage("assistant", data.response);
+          // Streamed replies arrive as partials (partial: true) followed by the
+          // final text; they all update one bubble instead of adding new ones
+          const continuing = streamingReplyRef.current;
+          streamingReplyRef.current = !!data.partial;
+          setMessages((prev) => {
+            const next = prev.filter((m) => m.content !== "💭 Thinking...");
+            const last = next[next.length - 1];
+            if (continuing && last?.role === "assistant") {
+              next[next.length - 1] = { ...last, content: data.response };
+            } else {
+              next.push({ role: "assistant", content: data.response, timestamp: new Date() });
+            }
+            return next;
+          });
+          setTimeout(scrollToBottom, 100);
           setIsAnalyzing(false);
           // Mic and isAISpeaking are driven by ai_speaking; only set backup timeout if not already set
           if (!aiSpeakingTimeoutRef.current) {
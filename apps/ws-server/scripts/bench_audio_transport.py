@@ -0,0 +1,249 @@
+"""
+Compare the audio transports: WebRTC against binary WebSocket frames
+(?audio=pcm / ?audio=opus).
+
+For each transport, N loopback sessions are opened in this process. Each
+client streams a 20ms tone to the server while the server plays a tone back
+through a TTSAudioTrack, as an interview would. Measured:
+  - connect: from the client starting to connect until the server holds its
+    first inbound audio frame (WebRTC: offer/answer, ICE, DTLS; WebSocket:
+    TCP + upgrade)
+  - CPU: process CPU time over the measuring window, per session, in % of one core
+
+Both ends run in this process. The clients send pre-encoded frames and
+drop what they receive, but aiortc always decodes inbound RTP, so the WebRTC
+figure also carries the client's Opus decode and its half of SRTP: read it
+as an upper bound. VAD/STT are the same for every transport and are left out.
+
+Run from apps/ws-server:
+    python -m scripts.bench_audio_transport --sessions 10 --seconds 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+from aiortc import MediaStreamTrack, RTCPeerConnection
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import serve
+
+from src.core.helper import get_mono_audio
+from src.media.audio.opus import SAMPLES_PER_FRAME, encode_opus, make_packet
+from src.transport.websocket_audio import AUDIO_CODECS, InboundAudioDecoder, WebSocketAudioOutput
+from src.websocket.audio_bufffer import downsample_48k_to_16k
+from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+FRAME_SEC = 0.02
+
+
+def tone(seconds: float, rate: int, freq: float = 440.0) -> np.ndarray:
+    t = np.arange(int(seconds * rate)) / rate
+    return (np.sin(2 * np.pi * freq * t) * 8000).astype(np.int16)
+
+
+class Session:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.first_audio = asyncio.get_running_loop().create_future()
+        self.tasks: list = []
+
+    def got_audio(self):
+        if not self.first_audio.done():
+            self.first_audio.set_result(time.perf_counter() - self.started)
+
+
+def start_tts(track: TTSAudioTrack) -> asyncio.Task:
+    """
+    The server side 'speaks' for the whole run, a second at a time like
+    streamed TTS, so encoding is spread over the window as in an interview.
+    """
+    speech = tone(1.0, 48000, 220.0).tobytes()
+
+    async def speak():
+        while True:
+            if track.get_queue_duration() < 1.0:
+                await track.add_audio(speech, sample_rate=48000)
+            await asyncio.sleep(0.5)
+
+    return asyncio.create_task(speak())
+
+
+async def paced(deadline: float):
+    await asyncio.sleep(max(0.0, deadline - time.perf_counter()))
+    return deadline + FRAME_SEC
+
+
+# -------------------------
+# WebRTC
+# -------------------------
+
+class OpusToneTrack(MediaStreamTrack):
+    """Client microphone: one pre-encoded Opus packet every 20ms."""
+    kind = "audio"
+
+    def __init__(self, payload: bytes):
+        super().__init__()
+        self.payload = payload
+        self.pts = 0
+        self.deadline = time.perf_counter()
+
+    async def recv(self):
+        self.deadline = await paced(self.deadline)
+        self.pts += SAMPLES_PER_FRAME
+        return make_packet(self.payload, self.pts)
+
+
+async def drain(track, on_frame=None):
+    try:
+        while True:
+            frame = await track.recv()
+            if on_frame:
+                on_frame(frame)
+    except Exception:
+        return
+
+
+async def open_webrtc(payload: bytes) -> tuple[Session, list]:
+    session = Session()
+    server, client = RTCPeerConnection(), RTCPeerConnection()
+    tts_track = TTSAudioTrack()
+    tts_track.passthrough_enabled = True
+    server.addTrack(tts_track)
+    client.addTrack(OpusToneTrack(payload))
+
+    def ingest(frame):
+        raw = frame.to_ndarray()
+        downsample_48k_to_16k(get_mono_audio(raw, frame))
+        session.got_audio()
+
+    server.on("track", lambda track: session.tasks.append(asyncio.create_task(drain(track, ingest))))
+    client.on("track", lambda track: session.tasks.append(asyncio.create_task(drain(track))))
+
+    await client.setLocalDescription(await client.createOffer())
+    await server.setRemoteDescription(client.localDescription)
+    await server.setLocalDescription(await server.createAnswer())
+    await client.setRemoteDescription(server.localDescription)
+    session.tasks.append(start_tts(tts_track))
+    return session, [server, client]
+
+
+async def close_webrtc(session: Session, pcs: list):
+    for pc in pcs:
+        await pc.close()
+
+
+# -------------------------
+# WebSocket
+# -------------------------
+
+class WebSocketServer:
+    def __init__(self):
+        self.sessions: dict = {}
+
+    async def handler(self, conn):
+        query = parse_qs(urlparse(conn.request.path).query)
+        codec, session = query["audio"][0], self.sessions[query["s"][0]]
+        decoder = InboundAudioDecoder(codec)
+        tts_track = TTSAudioTrack()
+        output = WebSocketAudioOutput(tts_track, conn.send, codec)
+        output.start()
+        session.tasks.append(start_tts(tts_track))
+        try:
+            async for message in conn:
+                decoder.decode(message)
+                session.got_audio()
+        finally:
+            output.close()
+            tts_track.stop()
+
+
+async def open_websocket(server: WebSocketServer, url: str, codec: str, payload: bytes) -> tuple[Session, list]:
+    session = Session()
+    key = str(len(server.sessions))
+    server.sessions[key] = session
+    conn = await connect(f"{url}/ws?audio={codec}&s={key}")
+
+    async def send():
+        deadline = time.perf_counter()
+        while True:
+            deadline = await paced(deadline)
+            await conn.send(payload)
+
+    session.tasks += [asyncio.create_task(send()), asyncio.create_task(drain_socket(conn))]
+    return session, [conn]
+
+
+async def drain_socket(conn):
+    try:
+        async for _ in conn:
+            pass
+    except Exception:
+        return
+
+
+async def close_websocket(session: Session, conns: list):
+    for conn in conns:
+        await conn.close()
+
+
+# -------------------------
+# Run
+# -------------------------
+
+async def measure(name: str, open_session, close_session, sessions: int, seconds: float) -> dict:
+    opened = await asyncio.gather(*(open_session() for _ in range(sessions)))
+    connect = await asyncio.gather(*(session.first_audio for session, _ in opened))
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    await asyncio.sleep(seconds)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+
+    for session, handles in opened:
+        for task in session.tasks:
+            task.cancel()
+        await close_session(session, handles)
+    return {
+        "transport": name,
+        "connect_p50_ms": statistics.median(connect) * 1000,
+        "connect_max_ms": max(connect) * 1000,
+        "cpu_pct_per_session": cpu / wall / sessions * 100,
+    }
+
+
+async def main(transports: list, sessions: int, seconds: float):
+    mic_pcm = tone(FRAME_SEC, 16000).tobytes()
+    mic_opus = encode_opus(tone(FRAME_SEC, 48000))[0]
+    results = []
+
+    if "webrtc" in transports:
+        results.append(await measure(
+            "webrtc", lambda: open_webrtc(mic_opus), close_webrtc, sessions, seconds))
+
+    ws_server = WebSocketServer()
+    async with serve(ws_server.handler, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        for codec in AUDIO_CODECS:
+            if codec in transports:
+                payload = mic_pcm if codec == "pcm" else mic_opus
+                results.append(await measure(
+                    f"ws-{codec}", lambda: open_websocket(ws_server, f"ws://127.0.0.1:{port}", codec, payload),
+                    close_websocket, sessions, seconds))
+
+    print(f"\n{sessions} sessions, {seconds:.0f}s each")
+    print(f"{'transport':<10} {'connect p50':>12} {'connect max':>12} {'CPU/session':>12}")
+    for r in results:
+        print(f"{r['transport']:<10} {r['connect_p50_ms']:>10.1f}ms {r['connect_max_ms']:>10.1f}ms"
+              f" {r['cpu_pct_per_session']:>11.2f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--transport", nargs="+", choices=("webrtc",) + AUDIO_CODECS,
+                        default=["webrtc", *AUDIO_CODECS])
+    args = parser.parse_args()
+    asyncio.run(main(args.transport, args.sessions, args.seconds))
@@ -0,0 +1,155 @@
+import json
+
+import pytest
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the async Redis client: strings, lists, sets and
+    streams, pipelines, and the outbox's Lua scripts. Set fail_after = n to
+    drop the connection after the next pipeline has applied n commands.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.fail_after = None
+
+    # -------------------------
+    # Commands (sync; the async API wraps them)
+    # -------------------------
+
+    def _typed(self, key, kind):
+        value = self.data.get(key)
+        if value is not None and not isinstance(value, kind):
+            import redis
+            raise redis.ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _get(self, key):
+        return self._typed(key, str)
+
+    def _setex(self, key, ttl, value):
+        self.data[key] = str(value)
+        return True
+
+    def _delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def _rpush(self, key, *values):
+        items = self._typed(key, list)
+        if items is None:
+            items = self.data[key] = []
+        items.extend(values)
+        return len(items)
+
+    def _expire(self, key, ttl):
+        return key in self.data
+
+    def _lrange(self, key, start, stop):
+        items = self._typed(key, list) or []
+        return items[start:None if stop == -1 else stop + 1]
+
+    def _xadd(self, key, fields, **kwargs):
+        stream = self._typed(key, tuple)
+        self.data[key] = (stream or ()) + (dict(fields),)
+        return f"{len(self.data[key])}-0"
+
+    def _sadd(self, key, *members):
+        self.data.setdefault(key, frozenset())
+        self.data[key] = self._typed(key, frozenset) | set(members)
+        return len(members)
+
+    def _srem(self, key, *members):
+        if key in self.data:
+            self.data[key] = self._typed(key, frozenset) - set(members)
+        return len(members)
+
+    def _smembers(self, key):
+        return set(self._typed(key, frozenset) or ())
+
+    def _eval(self, script, numkeys, key, *args):
+        import redis
+        from src.services.redis.outbox import _APPEND_AT, _SET_UNLESS_NEWER
+
+        if script == _APPEND_AT:
+            ttl, start, *values = args
+            items = self._typed(key, list) or []
+            if len(items) > int(start):
+                return 0
+            if len(items) < int(start):
+                raise redis.ResponseError(f"OUTBOX_GAP list holds {len(items)} entries, append starts at {start}")
+            self._rpush(key, *values)
+            return len(values)
+        if script == _SET_UNLESS_NEWER:
+            ttl, value, epoch = args
+            current = self._get(key)
+            if current:
+                stored = json.loads(current).get("epoch")
+                if stored is not None and stored > int(epoch):
+                    return 0
+            self._setex(key, ttl, value)
+            return 1
+        raise NotImplementedError(script)
+
+    # -------------------------
+    # Client API
+    # -------------------------
+
+    def __getattr__(self, name):
+        command = getattr(type(self), f"_{name}", None)
+        if command is None:
+            raise AttributeError(name)
+
+        async def call(*args, **kwargs):
+            return command(self, *args, **kwargs)
+        return call
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, fake: FakeRedis):
+        self.fake = fake
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        command = getattr(FakeRedis, f"_{name}")
+        return lambda *args, **kwargs: self.commands.append((command, args, kwargs))
+
+    async def execute(self, raise_on_error=True):
+        import redis
+
+        results = []
+        for applied, (command, args, kwargs) in enumerate(self.commands):
+            if self.fake.fail_after == applied:
+                self.fake.fail_after = None
+                raise redis.ConnectionError("Connection reset by peer")
+            try:
+                results.append(command(self.fake, *args, **kwargs))
+            except redis.ResponseError as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        self.commands = []
+        return results
+
+
+@pytest.fixture
+def fake_redis(monkeypatch, tmp_path):
+    """Point the shared async Redis client at a FakeRedis; the event outbox spools to tmp_path."""
+    pytest.importorskip("redis")
+    from src.services.redis import async_redis_client, event_outbox
+
+    fake = FakeRedis()
+    monkeypatch.setattr(async_redis_client, "redis", fake)
+    spool = str(tmp_path / "interview-events-1.spool")
+    monkeypatch.setattr(event_outbox, "spool_path", spool)
+    monkeypatch.setattr(event_outbox, "dead_letter_path", spool + ".dead")
+    return fake
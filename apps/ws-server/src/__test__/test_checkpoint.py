@@ -0,0 +1,116 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+
+def _session(user_id="user-1", session_id="42"):
+    from src.interview_agent.history import HistoryManager
+    from src.session.checkpoint import _METRIC_FIELDS
+
+    conversation = []
+    flow = SimpleNamespace(config={"interviewId": 7, "userId": user_id, "id": 3}, current_question_index=0)
+    flow.checkpoint_state = lambda: {"question_index": flow.current_question_index}
+    flow.restore_state = lambda state: setattr(flow, "current_question_index", state.get("question_index", 0))
+    return SimpleNamespace(
+        session_id=session_id, user_id=user_id, flow_manager=flow,
+        state=SimpleNamespace(conversation_history=conversation, interview_started=True,
+                              history=HistoryManager(conversation)),
+        metrics=SimpleNamespace(**{name: 0 for name in _METRIC_FIELDS}),
+        checkpoint_epoch=0, messages_emitted=0, interview_completed=False, resumed=False,
+    )
+
+
+def _say(session, *contents):
+    session.state.conversation_history.extend({"role": "user", "content": c} for c in contents)
+
+
+def _events(fake_redis):
+    return [fields["event"] for fields in fake_redis.data.get("interview_events", ())]
+
+
+def test_live_session_is_not_resumed_until_it_disconnects(fake_redis):
+    from src.services.redis import event_outbox
+    from src.session import checkpoint
+    from src.session.registry import SessionRegistry
+
+    async def run():
+        live = _session()
+        node = SessionRegistry("node-a")
+        node.register(live)
+        _say(live, "hello")
+        checkpoint.save_checkpoint(live)
+        await event_outbox.close()
+
+        stored, owner = await checkpoint.load_checkpoint("42"), await checkpoint.load_owner("42")
+        before = checkpoint.is_live(stored, owner), checkpoint.can_resume(stored, "user-1", owner)
+
+        checkpoint.schedule_abandon(live)
+        await event_outbox.close()
+        stored = await checkpoint.load_checkpoint("42")
+        after = checkpoint.is_live(stored, owner), checkpoint.can_resume(stored, "user-1", owner)
+
+        for task in list(checkpoint._pending_abandons):
+            task.cancel()
+        node.unregister(live)
+        return owner, before, after
+
+    owner, before, after = asyncio.run(run())
+    assert owner == "node-a"
+    assert before == (True, False)
+    assert after == (False, True)
+
+
+def test_stale_connection_does_not_overwrite_or_abandon_a_resumed_session(fake_redis, monkeypatch):
+    from src.services.redis import event_outbox
+    from src.session import checkpoint
+
+    monkeypatch.setattr(checkpoint, "SESSION_RESUME_GRACE_SEC", 0)
+
+    async def run():
+        old = _session()
+        _say(old, "hello", "my answer")
+        old.flow_manager.current_question_index = 1
+        checkpoint.save_checkpoint(old)
+        await event_outbox.close()
+
+        # The old node's heartbeat lapsed: a reconnect resumes the session
+        new = _session()
+        stored = await checkpoint.load_checkpoint("42")
+        assert checkpoint.can_resume(stored, "user-1")
+        await checkpoint.restore_session(new, stored)
+        _say(new, "next answer")
+        checkpoint.save_checkpoint(new)
+        await event_outbox.close()
+
+        # Only now is the old socket seen to drop
+        checkpoint.schedule_abandon(old, reason="connection_closed")
+        await asyncio.gather(*checkpoint._pending_abandons)
+        await event_outbox.close()
+        return new, await checkpoint.load_checkpoint("42")
+
+    new, stored = asyncio.run(run())
+    assert new.checkpoint_epoch == stored["epoch"] == 1
+    assert new.flow_manager.current_question_index == 1
+    assert stored["disconnected_at"] is None and stored["messages"] == 3
+    assert [json.loads(m)["content"] for m in fake_redis.data["interview-messages-42"]] == \
+        ["hello", "my answer", "next answer"]
+    assert "abandon_interview" not in _events(fake_redis)
+
+
+def test_abandon_is_emitted_when_nobody_resumes(fake_redis, monkeypatch):
+    from src.services.redis import event_outbox
+    from src.session import checkpoint
+
+    monkeypatch.setattr(checkpoint, "SESSION_RESUME_GRACE_SEC", 0)
+
+    async def run():
+        session = _session()
+        _say(session, "hello")
+        checkpoint.save_checkpoint(session)
+        await event_outbox.close()
+        checkpoint.schedule_abandon(session, reason="connection_closed")
+        await asyncio.gather(*checkpoint._pending_abandons)
+        await event_outbox.close()
+
+    asyncio.run(run())
+    assert _events(fake_redis) == ["abandon_interview"]
@@ -0,0 +1,83 @@
+import asyncio
+
+
+def test_history_summarizes_completed_questions_within_budget(monkeypatch):
+    from src.interview_agent import ai_brain
+    from src.interview_agent.history import HistoryManager
+
+    async def summarize(messages):
+        return f"summary of {len(messages)} messages"
+
+    monkeypatch.setattr(ai_brain, "summarize_exchange", summarize)
+
+    async def run():
+        transcript = []
+        history = HistoryManager(transcript, budget_tokens=10_000)
+        for question in range(3):
+            transcript.append({"role": "assistant", "content": f"Question {question}?", "timestamp": 0})
+            transcript.append({"role": "user", "content": "answer " * 200, "timestamp": 0})
+            transcript.append({"role": "assistant", "content": "Thanks. Next one: ...", "timestamp": 0})
+            history.mark_question_boundary()
+        transcript.append({"role": "user", "content": "current answer", "timestamp": 0})
+
+        before = history.prompt_messages()  # summaries still running: verbatim
+        await asyncio.gather(*history._tasks)
+        settled = history.prompt_messages()  # summaries done mid-question: prefix unchanged
+
+        transcript.append({"role": "assistant", "content": "Good. Last one: ...", "timestamp": 0})
+        history.mark_question_boundary()
+        await asyncio.gather(*history._tasks)
+        after = history.prompt_messages()  # summaries swap in at the boundary
+
+        history.budget_tokens = 60
+        tight = history.prompt_messages()
+        transcript.append({"role": "user", "content": "a short reply", "timestamp": 0})
+        following = history.prompt_messages()
+        return transcript, before, settled, after, tight, following
+
+    transcript, before, settled, after, tight, following = asyncio.run(run())
+    assert len(before) == len(transcript) - 2  # everything up to "current answer"
+    assert settled == before
+    assert all(set(m) == {"role", "content"} for m in before)
+
+    # Four summaries, then the open exchange verbatim
+    assert [m["role"] for m in after] == ["system"] * 4 + ["assistant"]
+    assert after[-1]["content"] == "Good. Last one: ..."
+
+    # Over budget drops several of the oldest recaps at once...
+    assert tight[-1] == after[-1]
+    assert len(tight) <= len(after) - 2
+    assert "Introduction" not in " ".join(m["content"] for m in tight)
+    # ...so the next turn still extends the same prefix
+    assert following[:len(tight)] == tight
+
+
+def test_history_state_survives_a_checkpoint(monkeypatch):
+    import json
+    from src.interview_agent import ai_brain
+    from src.interview_agent.history import HistoryManager
+
+    async def summarize(messages):
+        return "intro summary"
+
+    monkeypatch.setattr(ai_brain, "summarize_exchange", summarize)
+
+    async def run():
+        transcript = [
+            {"role": "assistant", "content": "Tell me about yourself.", "timestamp": 0},
+            {"role": "user", "content": "I build backends.", "timestamp": 0},
+            {"role": "assistant", "content": "Great. First question: ...", "timestamp": 0},
+        ]
+        history = HistoryManager(transcript, budget_tokens=10_000)
+        history.mark_question_boundary()
+        await asyncio.gather(*history._tasks)
+        transcript.append({"role": "user", "content": "my answer", "timestamp": 0})
+
+        # What a reconnecting node rebuilds from the checkpoint JSON
+        restored = HistoryManager(list(transcript), budget_tokens=10_000)
+        restored.restore_state(json.loads(json.dumps(history.checkpoint_state())))
+        return history.prompt_messages(), restored.prompt_messages()
+
+    original, restored = asyncio.run(run())
+    assert restored == original
+    assert original[0]["content"].endswith("intro summary")
@@ -0,0 +1,22 @@
+def test_trivial_turns_match_and_answers_do_not():
+    from src.interview_agent.intents import READY, REPEAT_QUESTION, match_intent
+
+    assert match_intent("Can you repeat the question?") == REPEAT_QUESTION
+    assert match_intent("Sorry, I didn't hear that.") == REPEAT_QUESTION
+    assert match_intent("Um, could you say that again, please?") == REPEAT_QUESTION
+    assert match_intent("Yes, I'm ready.") == READY
+    assert match_intent("Okay, let's get started!") == READY
+
+    # Answers that only contain the words go to the LLM
+    assert match_intent("I'm ready to talk about my work on the payments team.") is None
+    assert match_intent("I didn't hear back from that vendor so we built it ourselves") is None
+    assert match_intent("Yes.") is None
+    assert match_intent("") is None
+
+
+def test_same_answer_tolerates_small_transcript_drift():
+    from src.interview_agent.intents import same_answer
+
+    partial = "I'd shard the users table by region and cache the hot rows"
+    assert same_answer(partial, "Um, I'd shard the users table by region and cache the hot rows.", 0.1)
+    assert not same_answer(partial, partial + " but first I'd measure where the reads actually go", 0.1)
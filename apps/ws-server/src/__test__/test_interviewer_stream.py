@@ -0,0 +1,157 @@
+import asyncio
+from types import SimpleNamespace
+
+
+def test_next_marker_split_across_deltas():
+    from src.interview_agent.ai_brain import NextMarkerFilter
+
+    marker = NextMarkerFilter()
+    deltas = ["Great answer. [", "NE", "XT]"]
+    out = "".join(marker.feed(d) for d in deltas) + marker.flush()
+    assert out == "Great answer. "
+    assert marker.seen
+
+    # Brackets that never become the marker are released
+    marker = NextMarkerFilter()
+    assert marker.feed("Use nums[") == "Use nums"
+    assert marker.feed("0] here") == "[0] here"
+    assert not marker.seen
+
+
+def test_stream_yields_sentences_and_reports_next(monkeypatch):
+    from src.interview_agent import ai_brain
+
+    deltas = ["Nice, that's", " right. [NE", "XT] Now, how would", " you scale it?"]
+
+    class Stream:
+        def __init__(self):
+            self.chunks = iter(deltas)
+
+        async def __anext__(self):
+            try:
+                delta = next(self.chunks)
+            except StopIteration:
+                raise StopAsyncIteration
+            return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+        async def close(self):
+            pass
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return Stream()
+
+    monkeypatch.setattr(ai_brain.llm_gateway, "backend", SimpleNamespace(name="test", create=create))
+
+    async def run():
+        stream = ai_brain.stream_interviewer_response([], "system")
+        splitter = ai_brain.SentenceSplitter()
+        sentences, next_seen_at = [], None
+        async for delta in stream:
+            sentences += splitter.feed(delta)
+            if stream.move_to_next and next_seen_at is None:
+                next_seen_at = len(stream.text)
+        return stream, sentences + splitter.flush(), next_seen_at
+
+    stream, sentences, next_seen_at = asyncio.run(run())
+    assert sentences == ["Nice, that's right.", "Now, how would you scale it?"]
+    assert stream.move_to_next
+    assert next_seen_at < len(stream.text)  # known before the reply finished
+    assert "[NEXT]" not in stream.text
+
+
+def test_turn_context_trails_a_stable_prefix():
+    from src.interview_agent.ai_brain import build_interviewer_messages
+
+    history = [{"role": "assistant", "content": "Tell me about yourself."}]
+    first = build_interviewer_messages(history, "system", {"question_progress": "1/5"})
+    history = history + [{"role": "user", "content": "I build APIs."}]
+    second = build_interviewer_messages(history, "system", {
+        "question_progress": "2/5",
+        "answer_analysis": {"is_too_brief": True},
+    })
+
+    # Everything before the turn context is a prefix of the next turn's prompt
+    assert second[:len(first) - 1] == first[:-1]
+    assert second[-1]["role"] == "system"
+    assert "2/5" in second[-1]["content"] and "brief" in second[-1]["content"]
+
+
+def test_stream_closed_early_closes_the_request(monkeypatch):
+    """A reply abandoned mid-stream (barge-in) must release the HTTP stream right away"""
+    from src.interview_agent import ai_brain
+
+    closed = []
+
+    class Stream:
+        async def __anext__(self):
+            await asyncio.sleep(0)
+            return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Okay. "))])
+
+        async def close(self):
+            closed.append(True)
+
+    async def create(**kwargs):
+        return Stream()
+
+    monkeypatch.setattr(ai_brain.llm_gateway, "backend", SimpleNamespace(name="test", create=create))
+
+    async def run():
+        deltas = aiter(ai_brain.stream_interviewer_response([], "system"))
+        async for _ in deltas:
+            break
+        await deltas.aclose()
+        assert closed == [True]  # not left for the event loop's shutdown
+
+    asyncio.run(run())
+
+
+def test_speculative_reply_buffers_ahead_and_discard_cancels(monkeypatch):
+    from src.interview_agent import ai_brain
+
+    closed = []
+
+    class Stream:
+        def __init__(self):
+            self.chunks = iter(["Got it. ", "Why did you ", "pick Kafka?"])
+
+        async def __anext__(self):
+            try:
+                delta = next(self.chunks)
+            except StopIteration:
+                await asyncio.sleep(10)  # a slow tail
+                raise StopAsyncIteration
+            return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=delta))])
+
+        async def close(self):
+            closed.append(True)
+
+    async def create(**kwargs):
+        return Stream()
+
+    monkeypatch.setattr(ai_brain.llm_gateway, "backend", SimpleNamespace(name="test", create=create))
+
+    async def run():
+        used = ai_brain.SpeculativeReply("I used Kafka", ai_brain.stream_interviewer_response([], "system"))
+        await asyncio.sleep(0.05)  # the reply is read while the candidate is still "pausing"
+        deltas = aiter(used)
+        text = "".join([await anext(deltas) for _ in range(3)])
+        await deltas.aclose()
+        await asyncio.sleep(0.01)
+        assert text == "Got it. Why did you pick Kafka?"
+        assert closed == [True]  # abandoning the replay closes the request
+
+        misses, abandoned = ai_brain._speculation_misses.value, ai_brain._speculation_abandoned.value
+        wasted = ai_brain.SpeculativeReply("I used Kafka", ai_brain.stream_interviewer_response([], "system"))
+        await asyncio.sleep(0.05)
+        wasted.discard()
+        await asyncio.sleep(0.01)
+        assert closed == [True, True]
+        # Dropped unused isn't a miss: only a transcript mismatch is
+        assert (ai_brain._speculation_misses.value, ai_brain._speculation_abandoned.value) == (misses, abandoned + 1)
+
+        missed = ai_brain.SpeculativeReply("I used Kafka", ai_brain.stream_interviewer_response([], "system"))
+        missed.discard(missed=True)
+        assert ai_brain._speculation_misses.value == misses + 1
+
+    asyncio.run(run())
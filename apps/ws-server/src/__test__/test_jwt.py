@@ -0,0 +1,25 @@
+def test_verify_jwt_parses_the_public_key_once(monkeypatch):
+    import jwt
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from src.core import helper
+
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    monkeypatch.setenv("JWT_PUBLIC_KEY", pem)
+    helper._load_jwt_public_key.cache_clear()
+
+    token = jwt.encode({"sub": "user-1"}, key, algorithm="RS256")
+    assert helper.verify_jwt(token)["sub"] == "user-1"
+    assert helper.verify_jwt(token)["sub"] == "user-1"
+    assert helper._load_jwt_public_key.cache_info().misses == 1
+
+    other = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    forged = jwt.encode({"sub": "user-1"}, other, algorithm="RS256")
+    try:
+        helper.verify_jwt(forged)
+        assert False, "token signed with another key was accepted"
+    except ValueError as e:
+        assert "Invalid token" in str(e)
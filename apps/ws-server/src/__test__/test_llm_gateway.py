@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+
+def _gateway(create):
+    from src.services.llm.gateway import LLMGateway
+
+    return LLMGateway(SimpleNamespace(name="test", create=create))
+
+
+def test_gateway_hedges_slow_requests():
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        # First request lands in the slow tail, the hedge is fast
+        await asyncio.sleep(5 if len(calls) == 1 else 0.01)
+        return f"reply {len(calls)}"
+
+    async def run():
+        gateway = _gateway(create)
+        for _ in range(gateway.hedge_min_samples):
+            gateway._kind_latency("reply").observe(0.05)
+        return gateway, await asyncio.wait_for(gateway.complete([], timeout=2), timeout=1)
+
+    gateway, reply = asyncio.run(run())
+    assert reply == "reply 2"
+    assert len(calls) == 2
+    assert 0 < calls[0]["timeout"] <= 2
+
+
+def test_gateway_hedges_per_kind_and_not_background_calls():
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        await asyncio.sleep(0.2)
+        return "reply"
+
+    async def run():
+        gateway = _gateway(create)
+        for _ in range(gateway.hedge_min_samples):
+            gateway._kind_latency("fast").observe(0.01)
+            gateway._kind_latency("slow").observe(1.0)
+        await gateway.complete([], timeout=2, kind="slow")  # within its own tail
+        await gateway.complete([], timeout=2, kind="fast", hedge=False)
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_gateway_retries_transient_errors_once():
+    calls = []
+    request = httpx.Request("POST", "https://example.invalid")
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        raise openai.APIConnectionError(request=request)
+
+    async def run():
+        try:
+            await _gateway(create).complete([], timeout=2)
+        except openai.APIConnectionError:
+            return True
+        return False
+
+    assert asyncio.run(run())
+    assert len(calls) == 2  # original + one retry, then the error surfaces
+
+
+def test_local_backend_records_and_replays(tmp_path):
+    from src.services.llm.gateway import LLMGateway
+    from src.services.llm.local import LocalLLMBackend
+    from src.services.llm.replay import RecordingLLMBackend, ReplayLLMBackend
+
+    local = LocalLLMBackend()
+    local.ttft_ms, local.tokens_per_sec = 5, 10_000
+    messages = [
+        {"role": "system", "content": "You are an interviewer."},
+        {"role": "user", "content": "I designed the billing service, split it into queues and workers, and added retries " * 2},
+        {"role": "system", "content": "When you advance (end with [NEXT]), naturally incorporate this next question: What is a mutex?"},
+    ]
+    params = {"max_tokens": 250, "stream_options": {"include_usage": True}}
+
+    async def collect(backend):
+        gateway = LLMGateway(backend)
+        text, usage = "", None
+        async for chunk in gateway.stream(messages, **params):
+            if chunk.usage:
+                usage = chunk.usage
+            if chunk.choices:
+                text += chunk.choices[0].delta.content or ""
+        return text, usage
+
+    recorded, usage = asyncio.run(collect(RecordingLLMBackend(local, str(tmp_path))))
+    assert recorded.endswith("[NEXT]") and "What is a mutex?" in recorded
+    assert usage.prompt_tokens > 0
+
+    replayed, _ = asyncio.run(collect(ReplayLLMBackend(str(tmp_path), timing=False)))
+    assert replayed == recorded
+
+    # Measured values in the turn context don't break the match...
+    messages[-1] = {**messages[-1], "content": messages[-1]["content"] + "\n- User paused for 3.4s before answering"}
+    recorded, _ = asyncio.run(collect(RecordingLLMBackend(local, str(tmp_path))))
+    messages[-1]["content"] = messages[-1]["content"].replace("3.4s", "2.9s")
+    replayed, _ = asyncio.run(collect(ReplayLLMBackend(str(tmp_path), timing=False)))
+    assert replayed == recorded
+
+    # ...and a request with no recording replays the recordings in order
+    messages[1] = {"role": "user", "content": "Something the recorded session never said."}
+    replay = ReplayLLMBackend(str(tmp_path), timing=False)
+    first, _ = asyncio.run(collect(replay))
+    second, _ = asyncio.run(collect(replay))
+    assert first != second and "What is a mutex?" in first
+
+    # ...but only recordings of the same kind: a summary request gets no interviewer turn
+    messages[0] = {"role": "system", "content": "Summarize this interview."}
+    with pytest.raises(LookupError):
+        asyncio.run(collect(ReplayLLMBackend(str(tmp_path), timing=False)))
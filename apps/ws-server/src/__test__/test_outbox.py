@@ -0,0 +1,48 @@
+import asyncio
+import json
+import os
+
+
+def test_outbox_resends_a_failed_batch_without_duplicating_appends(fake_redis, tmp_path):
+    from src.services.redis import async_redis_client
+    from src.services.redis.outbox import EventOutbox
+
+    spool = str(tmp_path / "interview-events-1.spool")
+
+    async def run():
+        outbox = EventOutbox(async_redis_client, spool_path=spool)
+        outbox.rpush("interview-messages-7", ["a"], 60, start=0)
+        outbox.rpush("interview-messages-7", ["b"], 60, start=1)
+        fake_redis.fail_after = 1  # "a" lands, then the connection drops
+        await outbox.close()
+        spooled = os.path.exists(spool)
+
+        outbox.rpush("interview-messages-7", ["c"], 60, start=2)
+        await outbox.close()  # replays the whole spooled batch, then "c"
+        return spooled
+
+    assert asyncio.run(run())
+    assert fake_redis.data["interview-messages-7"] == ["a", "b", "c"]
+    assert not os.path.exists(spool)
+
+
+def test_outbox_dead_letters_rejected_entries_and_delivers_the_rest(fake_redis, tmp_path):
+    from src.services.redis import async_redis_client
+    from src.services.redis.outbox import EventOutbox
+
+    spool = str(tmp_path / "interview-events-1.spool")
+    fake_redis.data["interview-messages-7"] = "not a list"
+
+    async def run():
+        outbox = EventOutbox(async_redis_client, spool_path=spool)
+        outbox.rpush("interview-messages-7", ["a"], 60, start=0)
+        outbox.xadd("interview_events", {"event": "start_interview"})
+        await outbox.close()
+
+    asyncio.run(run())
+    assert fake_redis.data["interview_events"] == ({"event": "start_interview"},)
+    assert not os.path.exists(spool)
+    with open(spool + ".dead", encoding="utf-8") as f:
+        dead = [json.loads(line) for line in f]
+    assert [d["entry"]["key"] for d in dead] == ["interview-messages-7"]
+    assert "WRONGTYPE" in dead[0]["error"]
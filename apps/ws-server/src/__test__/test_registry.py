@@ -0,0 +1,28 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+
+def test_admission_refuses_new_sessions_at_capacity_with_a_redirect(fake_redis, monkeypatch):
+    from src.session import registry
+
+    monkeypatch.setattr(registry, "NODE_MAX_SESSIONS", 1)
+    monkeypatch.setitem(registry.active_sessions, "user-1", SimpleNamespace(session_id="1"))
+    fake_redis.data[registry.NODES_KEY] = frozenset({"this-node", "busy", "idle"})
+    fake_redis.data[registry.node_key("busy")] = json.dumps({"url": "wss://busy", "headroom": 0})
+    fake_redis.data[registry.node_key("idle")] = json.dumps({"url": "wss://idle", "headroom": 3})
+    node = registry.SessionRegistry("this-node")
+
+    refusal = asyncio.run(node.admission(SimpleNamespace(resumed=False)))
+    assert refusal["code"] == registry.CAPACITY_CLOSE_CODE == 4029
+    assert refusal["error"] == "NODE_AT_CAPACITY"
+    assert refusal["redirect"] == "wss://idle"
+
+    # A reconnect is taken back even at capacity
+    assert asyncio.run(node.admission(SimpleNamespace(resumed=True))) is None
+
+    del fake_redis.data[registry.node_key("idle")]
+    assert asyncio.run(node.admission(SimpleNamespace(resumed=False)))["redirect"] is None
+
+    monkeypatch.setattr(registry, "NODE_MAX_SESSIONS", 2)
+    assert asyncio.run(node.admission(SimpleNamespace(resumed=False))) is None
@@ -0,0 +1,323 @@
+import asyncio
+
+import numpy as np
+
+
+def _tone(rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+
+def test_streaming_resampler_matches_one_shot():
+    """Block-by-block resampling must give the same samples as a single pass"""
+    from src.websocket.audio_bufffer import StreamingResampler
+
+    audio = _tone(16000)
+
+    one_shot = StreamingResampler(16000, 48000)
+    expected = np.concatenate([one_shot.process(audio), one_shot.flush()])
+
+    chunked = StreamingResampler(16000, 48000)
+    blocks = [chunked.process(audio[i:i + 1234]) for i in range(0, len(audio), 1234)]
+    actual = np.concatenate(blocks + [chunked.flush()])
+
+    assert len(expected) == 3 * len(audio)
+    assert np.array_equal(expected, actual)
+
+    # Still the same 440Hz tone after the filter delay is compensated
+    reference = 8000 * np.sin(2 * np.pi * 440 * np.arange(len(actual)) / 48000)
+    assert np.abs(actual[200:-200] - reference[200:-200]).max() < 50
+
+
+def test_tts_track_queues_native_and_resampled_audio():
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    async def run():
+        track = TTSAudioTrack()
+        await track.add_audio(_tone(48000, 0.5).tobytes(), 48000)
+        assert track.get_queue_size() == 24000
+
+        await track.add_audio(_tone(16000, 0.5).tobytes(), 16000)
+        assert track.get_queue_size() == 48000
+
+        frame = await track.recv()
+        assert frame.samples == track.samples_per_frame
+        assert track.get_queue_size() == 48000 - track.samples_per_frame
+
+        track.clear_queue()
+        assert track.is_empty()
+
+    asyncio.run(run())
+
+
+def test_tts_track_queues_concurrent_adds_in_call_order():
+    """A second caller's audio and silence never land between another utterance's blocks"""
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    async def run():
+        track = TTSAudioTrack()
+        ones = np.full(16000 * 2, 1000, dtype=np.int16)  # resampled in 500ms blocks, in a thread
+        first = asyncio.create_task(track.add_audio(ones.tobytes(), 16000))
+        await asyncio.sleep(0)  # first is now converting its first block
+        track.add_silence(100)
+        second = asyncio.create_task(track.add_audio(_tone(16000, 0.5).tobytes(), 16000))
+        await asyncio.sleep(0)  # second is waiting for first
+        cached = track.add_packets([b"\x00"] * 5, np.zeros(4800, dtype=np.int16).tobytes())
+        first, second = await asyncio.gather(first, second)
+
+        spans = {u.id: (u.start, u.end) for u in track._utterances}
+        assert [u.id for u in track._utterances] == [first, second, cached]
+        assert spans[first] == (0, 96000)
+        # 100ms of silence, then the second utterance, then the cached packets
+        assert spans[second][0] == 96000 + 4800
+        assert spans[cached][0] >= spans[second][1]
+        queued = np.concatenate([c if isinstance(c, np.ndarray) else c.pcm for c in track.audio_queue])
+        assert np.abs(queued[1000:95000].astype(int) - 1000).max() < 20  # the first utterance is unbroken
+        assert not queued[96000:96000 + 4800].any()
+
+    asyncio.run(run())
+
+
+def test_tts_track_reports_playback_position():
+    """Utterance events follow the samples actually pulled by recv(), not a timer"""
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    async def run():
+        track = TTSAudioTrack()
+        events = []
+        track.add_listener(lambda event, utterance_id: events.append((event, utterance_id)))
+
+        track.add_silence(20)
+        first = await track.add_audio(_tone(48000, 0.04).tobytes(), 48000)
+        second = await track.add_audio(_tone(48000, 0.02).tobytes(), 48000)
+        waiter = asyncio.create_task(track.wait_for_utterance(first))
+
+        await track.recv()  # silence
+        assert events == []
+        await track.recv()
+        assert events == [("utterance_started", first)]
+        await track.recv()
+        assert ("utterance_finished", first) in events
+        assert await waiter is True
+
+        interrupted = asyncio.create_task(track.wait_for_utterance(second))
+        await asyncio.sleep(0)
+        track.clear_queue()
+        assert await interrupted is False
+        assert events[-1] == ("utterance_interrupted", second)
+
+    asyncio.run(run())
+
+
+def test_tts_track_stop_releases_waiters():
+    """Nothing plays after stop(), so pending waits must not hang the session"""
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    async def run():
+        track = TTSAudioTrack()
+        utterance_id = await track.add_audio(_tone(48000, 0.5).tobytes(), 48000)
+        finished = asyncio.create_task(track.wait_for_utterance(utterance_id))
+        drained = asyncio.create_task(track.wait_until_drained())
+        await asyncio.sleep(0)
+
+        track.stop()
+        assert await asyncio.wait_for(finished, 1) is False
+        await asyncio.wait_for(drained, 1)
+
+    asyncio.run(run())
+
+
+def test_tts_track_suppresses_idle_frames():
+    """Long silences go out as pre-encoded packets on the same RTP timeline"""
+    from av import Packet
+    from aiortc.codecs.opus import OpusEncoder
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    async def run():
+        track = TTSAudioTrack()
+        track.passthrough_enabled = True
+        encoder = OpusEncoder()
+        timestamps = []
+
+        def send(n):
+            kinds = []
+            for _ in range(n):
+                out = track._next_frame()
+                if isinstance(out, Packet):
+                    _, timestamp = encoder.pack(out)
+                    kinds.append("packet")
+                else:
+                    payloads, timestamp = encoder.encode(out)
+                    if not payloads:
+                        continue
+                    kinds.append("frame")
+                timestamps.append(timestamp)
+            return kinds
+
+        # Only the first frame goes through aiortc's encoder; it anchors the timeline
+        idle = send(10)
+        assert idle == ["frame"] + ["packet"] * 9
+        assert track.frames_suppressed == 9
+
+        # Speech is encoded when queued, so the encoder never sees the gap
+        await track.add_audio(_tone(48000, 0.1).tobytes(), 48000)
+        assert send(6) == ["packet"] * 6
+        assert track.frames_encoded == 1
+
+        # Audio that wasn't encoded when queued is encoded by the track itself
+        track.passthrough_enabled = False
+        await track.add_audio(_tone(48000, 0.04).tobytes(), 48000)
+        track.passthrough_enabled = True
+        assert send(2) == ["packet"] * 2
+        assert track.frames_encoded == 3
+
+        assert timestamps == [960 * i for i in range(len(timestamps))]
+
+    asyncio.run(run())
+
+
+def test_tts_track_plays_cached_packets():
+    """Cached phrases go out as-is when passthrough is on, and fall back to PCM otherwise"""
+    from av import Packet
+    from src.media.audio.opus import encode_opus
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    pcm = _tone(48000, 0.1)
+    packets = encode_opus(pcm)
+
+    async def run(passthrough):
+        track = TTSAudioTrack()
+        track.passthrough_enabled = passthrough
+        track._next_frame()  # first frame always goes through the encoder
+        track.add_silence(30)  # leaves the run off a frame boundary unless padded
+        playback_id = await track.add_audio(_tone(48000, 0.01).tobytes(), 48000)
+        cached_id = track.add_packets(packets, pcm.tobytes())
+
+        out = [track._next_frame() for _ in range(12)]
+        assert await track.wait_for_utterance(playback_id)
+        assert await track.wait_for_utterance(cached_id)
+        return track, out
+
+    track, out = asyncio.run(run(True))
+    assert all(isinstance(o, Packet) for o in out)
+    # 30ms silence padded to two frames, then the 10ms clip encoded when queued
+    sent = [bytes(o) for o in out]
+    assert sent[3:3 + len(packets)] == packets
+    assert track.frames_cached == 1 + len(packets)
+    assert [o.pts for o in out] == [960 * i for i in range(1, 13)]
+
+    track, out = asyncio.run(run(False))
+    assert not any(isinstance(o, Packet) for o in out)
+    assert track.frames_cached == 0
+
+
+def test_phrase_cache_round_trips_through_disk(tmp_path):
+    from src.services.tts.local import LocalTTSBackend
+    from src.services.tts.phrase_cache import PhraseCache
+    from src.tts_service import TTSService
+
+    service = TTSService()
+    service.backend = LocalTTSBackend(service.sample_rate)
+    service.backend.latency_ms = service.backend.latency_per_char_ms = service.backend.latency_jitter_ms = 0
+
+    async def run():
+        first = await PhraseCache(service, str(tmp_path)).load("Take your time.")
+        second = await PhraseCache(service, str(tmp_path)).load("Take your time.")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.packets
+    assert len(first.pcm) <= len(first.packets) * 960 * 2
+    assert second.packets == first.packets
+    assert second.pcm == first.pcm
+
+
+def test_phrase_cache_skips_fallback_audio(tmp_path):
+    """Audio from the fallback backend must not be stored under the primary voice"""
+    from src.services.tts.base import TTSBackend
+    from src.services.tts.local import LocalTTSBackend
+    from src.services.tts.phrase_cache import PhraseCache
+    from src.tts_service import TTSService
+
+    class Unreachable(TTSBackend):
+        name = "unreachable"
+
+        async def synthesize(self, text, timeout):
+            raise ConnectionError("primary down")
+
+    service = TTSService()
+    service.backend = Unreachable(service.sample_rate)
+    service.fallback = LocalTTSBackend(service.sample_rate)
+    service.fallback.latency_ms = service.fallback.latency_per_char_ms = service.fallback.latency_jitter_ms = 0
+
+    async def run():
+        cache = PhraseCache(service, str(tmp_path))
+        return cache, await cache.load("Take your time.")
+
+    cache, phrase = asyncio.run(run())
+    assert phrase.packets  # still played this once
+    assert cache.get("Take your time.") is None
+    assert not any(tmp_path.iterdir())
+
+def test_tts_track_cuts_filler_when_reply_arrives():
+    from src.media.audio.opus import encode_opus
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    filler = _tone(48000, 0.5)
+    packets = encode_opus(filler)
+
+    async def run():
+        track = TTSAudioTrack()
+        filler_id = track.add_filler(packets, filler.tobytes())
+        for _ in range(3):
+            track._next_frame()
+
+        reply_id = await track.add_audio(_tone(48000, 0.2).tobytes(), 48000)
+        # Only a 10ms fade-out of the filler is left ahead of the reply
+        assert track.get_queue_size() == 480 + 9600
+        track._next_frame()
+        assert await asyncio.wait_for(track.wait_for_utterance(filler_id), 1)
+
+        # Fillers never play over queued audio
+        assert track.add_filler(packets, filler.tobytes()) is None
+        return reply_id
+
+    asyncio.run(run())
+
+
+def test_speech_onset_over_filler_is_heard_and_cuts_it(monkeypatch):
+    """A filler isn't interviewer speech: the candidate talking over it starts a turn"""
+    from types import SimpleNamespace
+
+    from src.media.audio import pipeline
+    from src.media.audio.opus import encode_opus
+    from src.speech_state import SpeechState
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    filler = _tone(48000, 0.5)
+    monkeypatch.setattr(pipeline, "get_vad_result", lambda chunk, vad: True)
+
+    async def run():
+        track = TTSAudioTrack()
+        filler_id = track.add_filler(encode_opus(filler), filler.tobytes())
+        track._next_frame()
+        assert track.is_playing_filler()
+        generation = track.generation
+
+        class Agent:
+            async def on_speech_started(self):
+                track.cut_filler()
+
+        session = SimpleNamespace(state=SpeechState(), tts_track=track, ws=None, agent=Agent())
+        audio = pipeline.AudioPipeline(session)
+        for _ in range(5):
+            await audio.process_chunk(b"\0" * 640)
+
+        assert session.state.is_speaking
+        assert not track.is_playing_filler()
+        assert track.get_queue_size() <= 480  # only the fade-out is left
+        assert track.generation == generation  # a reply being prepared isn't interrupted
+        track._next_frame()
+        assert await asyncio.wait_for(track.wait_for_utterance(filler_id), 1)
+
+    asyncio.run(run())
@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+
+def _tone(rate: int, seconds: float = 1.0) -> np.ndarray:
+    t = np.arange(int(rate * seconds)) / rate
+    return (8000 * np.sin(2 * np.pi * 440 * t)).astype(np.int16)
+
+
+def test_inbound_decoder_gives_16k_frames_for_pcm_and_opus():
+    from src.media.audio.opus import encode_opus
+    from src.transport.websocket_audio import InboundAudioDecoder
+
+    pcm = _tone(16000, 0.02)
+    assert np.array_equal(InboundAudioDecoder("pcm").decode(pcm.tobytes()), pcm)
+
+    decoder = InboundAudioDecoder("opus")
+    frames = [decoder.decode(packet) for packet in encode_opus(_tone(48000, 0.1))]
+    assert all(len(frame) == 320 for frame in frames)
+    assert np.abs(frames[-1]).max() > 1000  # the tone, not silence
+
+    assert len(decoder.decode(b"not opus")) == 0
+
+
+def test_websocket_audio_output_sends_speech_frames_only():
+    from src.transport.websocket_audio import WebSocketAudioOutput
+    from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+    async def run():
+        sent = []
+
+        async def send_bytes(data):
+            sent.append(data)
+
+        track = TTSAudioTrack()
+        output = WebSocketAudioOutput(track, send_bytes, "pcm")
+        await output.play_audio(_tone(48000, 0.1).tobytes(), 48000)
+        output.start()
+        await track.wait_until_drained()
+        await asyncio.sleep(0.1)  # silence from here on: nothing more is sent
+        output.close()
+        track.stop()
+        return sent
+
+    sent = asyncio.run(run())
+    assert 4 <= len(sent) <= 6
+    assert all(len(frame) == 640 for frame in sent)
+
+
+def test_pipeline_ingest_processes_whole_frames_and_keeps_the_rest():
+    from src.media.audio.pipeline import AudioPipeline
+    from src.websocket.audio_bufffer import AudioBuffer
+
+    async def run():
+        session = SimpleNamespace(state=SimpleNamespace(audio_buffer=AudioBuffer()))
+        pipeline = AudioPipeline(session)
+        chunks = []
+
+        async def process_chunk(chunk):
+            chunks.append(len(chunk))
+
+        pipeline.process_chunk = process_chunk
+        await pipeline.ingest(np.zeros(500, dtype=np.int16))
+        await pipeline.ingest(np.zeros(500, dtype=np.int16))
+        return chunks, len(session.state.audio_buffer.buffer)
+
+    chunks, remainder = asyncio.run(run())
+    assert chunks == [320, 320, 320]
+    assert remainder == 40
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+
+class SlowSocket:
+    """A client whose network only delivers when the test lets it."""
+
+    def __init__(self):
+        self.sent = []
+        self.gate = asyncio.Event()
+
+    async def send_text(self, text):
+        await self.gate.wait()
+        self.sent.append(json.loads(text))
+
+
+def test_websocket_transport_never_waits_and_skips_superseded_state():
+    from src.transport.websocket import WebSocketTransport
+
+    async def run():
+        ws = SlowSocket()
+        transport = WebSocketTransport(ws, max_queue=8)
+        transport.post({"type": "transcript", "text": "hello"})
+        await asyncio.sleep(0)  # the writer is now stuck on the first message
+        for speaking in (True, False, True, False):
+            await transport.send({"type": "ai_speaking", "speaking": speaking})
+        transport.post({"type": "llm_response", "response": "Hi", "partial": True})
+        transport.post({"type": "llm_response", "response": "Hi there", "partial": True})
+        transport.post({"type": "llm_response", "response": "Hi there."})
+        ws.gate.set()
+        assert await transport.flush()
+        transport.close()
+        return ws.sent
+
+    sent = asyncio.run(run())
+    assert sent == [
+        {"type": "transcript", "text": "hello"},
+        {"type": "ai_speaking", "speaking": False},
+        {"type": "llm_response", "response": "Hi there", "partial": True},
+        {"type": "llm_response", "response": "Hi there."},
+    ]
+
+
+def test_websocket_transport_drops_oldest_when_full():
+    from src.transport.websocket import WebSocketTransport
+
+    async def run():
+        ws = SlowSocket()
+        transport = WebSocketTransport(ws, max_queue=3)
+        for i in range(6):
+            transport.post({"type": "interviewer_tip", "message": str(i)})
+        assert transport.queue_depth() == 3
+        ws.gate.set()
+        await transport.flush()
+        transport.close()
+        return ws.sent
+
+    assert [m["message"] for m in asyncio.run(run())] == ["3", "4", "5"]
@@ -5,5 +5,14 @@ class BaseAgent:
     async def start(self):
         raise NotImplementedError
 
+    async def on_speech_started(self):
+        """VAD detected the start of user speech (before the segment is complete)."""
+
+    async def on_speech_paused(self, speech_buffer: list):
+        """The user has been silent for a moment mid-utterance; `speech_buffer` is the speech so far."""
+
+    async def on_speech_resumed(self):
+        """The user kept talking after on_speech_paused."""
+
     async def on_user_speech(self, pcm: bytes):
         raise NotImplementedError
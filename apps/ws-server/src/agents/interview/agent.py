@@ -1,8 +1,8 @@
-"""Interview agent: opening message, user speech → STT → LLM → TTS."""
+"""Interview agent: opening message (or resume), user speech → STT → LLM → TTS."""
 
 import asyncio
 from src.agents.base import BaseAgent
-from src.core.helper import send_over_ws
+from src.session.checkpoint import save_checkpoint
 from src.stt import StreamingSpeechProcessor
 
 
@@ -24,29 +24,55 @@ class InterviewAgent(BaseAgent):
         self.session.state.interview_started = True
 
         self.session.metrics.start_question()
-        await self.session.send_text(opening)
+        save_checkpoint(self.session)
+        # Openings are fixed per agent config, so later sessions reuse the encoded audio
+        await self._say(opening, cache=True)
+        print("[CHECKPOINT] opening_message_sent")
+
+    async def resume(self):
+        """Continue a session rebuilt from a checkpoint: repeat the interviewer's last line."""
+        last = next(
+            (m["content"] for m in reversed(self.session.state.conversation_history) if m["role"] == "assistant"),
+            None,
+        )
+        if last is None:
+            await self.start()
+            return
+        if self.session.ws:
+            self.session.post({
+                "type": "session_resumed",
+                "questionNumber": self.session.flow_manager.current_question_index,
+            })
+        await self.session.send_text(last)
+        await self._say(last)
+        print("[CHECKPOINT] session_resumed")
 
-        # Notify frontend that AI is about to speak (opening) so mic state stays in sync
+    async def _say(self, text: str, cache: bool = False):
+        # Notify frontend that AI is about to speak so mic state stays in sync
         self.processor.ai_speaking = True
         if self.session.ws:
-            await send_over_ws(self.session.ws, {"type": "ai_speaking", "speaking": True})
+            self.session.post({"type": "ai_speaking", "speaking": True})
+        playback_id = await self.session.speak(text, silence_before_ms=300, silence_after_ms=500, cache=cache)
+        # ai_speaking false as soon as it has played out (frontend can unmute)
+        asyncio.create_task(self._notify_opening_speech_ended(playback_id))
 
-        await self.session.speak(opening, silence_before_ms=300, silence_after_ms=500)
-        # Schedule ai_speaking false when opening TTS finishes (frontend can unmute)
-        duration = self.session.tts_track.get_queue_duration() if self.session.tts_track else 0.0
-        
-        asyncio.create_task(self._notify_opening_speech_ended(duration))
-        print("[CHECKPOINT] opening_message_sent")
+    async def _notify_opening_speech_ended(self, playback_id):
+        """Notify frontend when the opening (or resumed) line finishes so it can unmute."""
+        finished = await self.session.wait_for_playback(playback_id)
+        if not finished:
+            return  # interrupted; the interruption path already updated the frontend
+        self.processor.ai_speaking = False
+        if self.session.ws:
+            self.session.post({"type": "ai_speaking", "speaking": False})
+
+    async def on_speech_started(self):
+        self.processor.on_speech_started()
+
+    async def on_speech_paused(self, speech_buffer: list):
+        self.processor.on_speech_paused(speech_buffer)
 
-    async def _notify_opening_speech_ended(self, duration: float):
-        """Notify frontend when opening TTS finishes so it can unmute."""
-        try:
-            await asyncio.sleep(duration + 0.5)
-            self.processor.ai_speaking = False
-            if self.session.ws:
-                await send_over_ws(self.session.ws, {"type": "ai_speaking", "speaking": False})
-        except asyncio.CancelledError:
-            pass
+    async def on_speech_resumed(self):
+        self.processor.on_speech_resumed()
 
     async def on_user_speech(self, speech_buffer: list):
         """Handle user speech segment (list of PCM chunks)."""
@@ -1,3 +1,8 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
 # FIXED THRESHOLDS for natural conversation
 
 ENERGY_THRESHOLD = 150
@@ -7,4 +12,56 @@ MIN_SPEECH_DURATION = 3  # Start recording after 60ms
 SILENCE_THRESHOLD = 35  # Increased to 700ms of silence before cutting
 MAX_SPEECH_DURATION = 5000  # 6 seconds max before forcing transcription
 
-AUDIO_FREQ = 16_000
\ No newline at end of file
+AUDIO_FREQ = 16_000
+
+# TTS output format. Request synthesis at the WebRTC track rate (48kHz) so the
+# track can queue it as-is; any other rate goes through the streaming resampler.
+TTS_SAMPLE_RATE = int(os.getenv("TTS_SAMPLE_RATE", "48000"))
+
+# Fixed interviewer lines. They never change between sessions, so they are
+# synthesized once and played from the phrase cache (services/tts/phrase_cache.py).
+CLOSING_MESSAGE = "Thank you for your time. That concludes our interview. We'll be in touch!"
+APOLOGY_MESSAGE = "I apologize, I'm having technical difficulties. Could you please repeat that?"
+ELABORATE_PROMPT = "Could you elaborate on that?"
+ENCOURAGEMENT_SHORT = "Take your time to think through your answer."
+ENCOURAGEMENT_MEDIUM = "No rush. Would you like me to rephrase the question?"
+ENCOURAGEMENT_LONG = "I notice you're taking some time. Would it help if I gave you a hint or moved to a different question?"
+READY_REPLY = "Great, let's begin. Could you start by briefly introducing yourself?"  # "I'm ready" at the opening
+STATIC_PHRASES = (
+    CLOSING_MESSAGE,
+    READY_REPLY,
+    APOLOGY_MESSAGE,
+    ELABORATE_PROMPT,
+    ENCOURAGEMENT_SHORT,
+    ENCOURAGEMENT_MEDIUM,
+    ENCOURAGEMENT_LONG,
+)
+
+# Backchannel: if no reply audio is queued this long after the candidate stops
+# speaking, a short cached filler plays while the LLM and TTS finish.
+BACKCHANNEL_ENABLED = os.getenv("BACKCHANNEL_ENABLED", "1") != "0"
+BACKCHANNEL_DELAY_MS = int(os.getenv("BACKCHANNEL_DELAY_MS", "900"))
+BACKCHANNEL_PHRASES = (
+    "Mm-hmm.",
+    "Okay.",
+    "Right, let me think about that.",
+    "Okay, give me a second.",
+)
+
+# Trivial turns answered locally, without the LLM (interview_agent/intents.py)
+FAST_INTENTS = tuple(i.strip() for i in os.getenv("FAST_INTENTS", "repeat_question,ready").split(",") if i.strip())
+
+# Speculative replies: at a pause of SPECULATIVE_SILENCE_FRAMES the speech so far
+# is transcribed and the LLM reply started; it is kept if the final transcript
+# differs by at most SPECULATIVE_MAX_EDIT_RATIO (normalized), else discarded.
+SPECULATIVE_REPLY_ENABLED = os.getenv("SPECULATIVE_REPLY_ENABLED", "0") == "1"
+SPECULATIVE_SILENCE_FRAMES = int(os.getenv("SPECULATIVE_SILENCE_FRAMES", "10"))  # 200ms
+SPECULATIVE_MAX_EDIT_RATIO = float(os.getenv("SPECULATIVE_MAX_EDIT_RATIO", "0.1"))
+
+# Per-session outbound WebSocket queue (transport/websocket.py). When a slow
+# client lets it fill up, the oldest messages are dropped.
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "256"))
+
+# Idle output: when the peer negotiated Opus, the TTS track sends one
+# pre-encoded silent packet each 20ms of silence instead of encoding it.
+TTS_SILENCE_SUPPRESSION = os.getenv("TTS_SILENCE_SUPPRESSION", "1") != "0"
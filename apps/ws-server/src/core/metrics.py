@@ -0,0 +1,100 @@
+"""
+In-process metrics registry. Services record counters, gauges and latency
+histograms here; main exposes a JSON snapshot on GET /metrics.
+"""
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Gauge:
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        self.value += amount
+
+    def dec(self, amount: float = 1):
+        self.value -= amount
+
+    def snapshot(self):
+        return self.value
+
+
+class Histogram:
+    """Lifetime count/sum plus a rolling window of recent values for percentiles."""
+
+    def __init__(self, window: int = 1024):
+        self._values = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self._values.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile over the rolling window, None when empty."""
+        values = sorted(self._values)
+        if not values:
+            return None
+        rank = max(0, min(len(values) - 1, int(round(pct / 100 * len(values))) - 1))
+        return values[rank]
+
+    def __len__(self):
+        return len(self._values)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "max": max(self._values) if self._values else None,
+        }
+
+
+_registry: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def _get_or_create(name: str, kind):
+    metric = _registry.get(name)
+    if metric is None:
+        with _lock:
+            metric = _registry.setdefault(name, kind())
+    if not isinstance(metric, kind):
+        raise TypeError(f"Metric {name} already registered as {type(metric).__name__}")
+    return metric
+
+
+def counter(name: str) -> Counter:
+    return _get_or_create(name, Counter)
+
+
+def gauge(name: str) -> Gauge:
+    return _get_or_create(name, Gauge)
+
+
+def histogram(name: str) -> Histogram:
+    return _get_or_create(name, Histogram)
+
+
+def snapshot() -> Dict[str, Any]:
+    return {name: metric.snapshot() for name, metric in sorted(_registry.items())}
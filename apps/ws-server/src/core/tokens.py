@@ -0,0 +1,45 @@
+"""
+Local token counting for LLM prompts. Uses tiktoken once load_encoding() has
+run (main calls it off the event loop at startup: the first load fetches the
+BPE file); until then, or if it can't be loaded, estimates ~4 characters per token.
+"""
+import os
+from typing import Iterable
+
+try:
+    import tiktoken
+except ImportError:  # keeps the estimate working where tiktoken isn't installed
+    tiktoken = None
+
+TOKENIZER_ENCODING = os.getenv("LLM_TOKENIZER_ENCODING", "o200k_base")
+MESSAGE_OVERHEAD_TOKENS = 4  # role and separators per chat message
+
+_encoding = None
+
+
+def load_encoding() -> bool:
+    """Load the tokenizer (blocking, may download). Returns True if counts are now exact."""
+    global _encoding
+    if _encoding is not None:
+        return True
+    if tiktoken is None:
+        print("⚠️  tiktoken not installed; estimating token counts")
+        return False
+    try:
+        _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+    except Exception as e:
+        print(f"⚠️  tiktoken encoding unavailable ({e}); estimating token counts")
+        return False
+    return True
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _encoding is None:
+        return (len(text) + 3) // 4
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: Iterable[dict]) -> int:
+    return sum(count_tokens(m.get("content") or "") + MESSAGE_OVERHEAD_TOKENS for m in messages)
@@ -1,22 +1,127 @@
-from openai import AsyncAzureOpenAI
-from dotenv import load_dotenv
-import os
+import asyncio
+import json
+import re
+import time
 from .software_engineer import InterviewMetrics
+from src.constant import APOLOGY_MESSAGE, ELABORATE_PROMPT
+from src.core import metrics as service_metrics
+from src.core.tokens import count_message_tokens, count_tokens
+from src.services.llm import llm_gateway
 
-load_dotenv()
+NEXT_MARKER = "[NEXT]"
 
-api_version = os.getenv("OPENAI_API_VERSION", "")
-api_key = os.getenv("OPENAI_API_KEY", "")
-endpoint = os.getenv("OPENAI_URL", "")
-deployment = os.getenv("OPENAI_MODEL", "")
+_first_token = service_metrics.histogram("llm.first_token_sec")
+_prompt_tokens = service_metrics.histogram("llm.prompt_tokens")
+_input_tokens = service_metrics.counter("llm.input_tokens")
+_cached_tokens = service_metrics.counter("llm.cached_tokens")
+_cache_hit_ratio = service_metrics.histogram("llm.cache_hit_ratio")
+_speculations = service_metrics.counter("speculation.started")
+_speculation_hits = service_metrics.counter("speculation.hits")
+_speculation_misses = service_metrics.counter("speculation.misses")  # final transcript said something else
+_speculation_abandoned = service_metrics.counter("speculation.abandoned")  # dropped unused: speech resumed, turn cancelled, ...
+_speculation_wasted_prompt = service_metrics.counter("speculation.wasted_prompt_tokens")
+_speculation_wasted_completion = service_metrics.counter("speculation.wasted_completion_tokens")
 
-client = AsyncAzureOpenAI(
-    api_version=api_version,
-    api_key=api_key,
-    azure_endpoint=endpoint,
+SUMMARY_PROMPT = (
+    "Summarize this part of a job interview in at most two sentences for the interviewer's notes: "
+    "what was asked and the substance of the candidate's answer (key facts, strengths, gaps). "
+    "No preamble."
 )
 
-NEXT_MARKER = "[NEXT]"
+
+def build_interviewer_messages(
+    conversation_history: list,
+    system_prompt: str,
+    context: dict = None
+) -> list:
+    """
+    [system prompt] + conversation + [turn context].
+
+    The system prompt is fixed for the session and the history only grows, so
+    consecutive turns share a long prefix that the provider can serve from its
+    prompt cache. Everything that changes per turn goes in the trailing message.
+    """
+    messages = [
+        {"role": "system", "content": system_prompt}
+    ] + conversation_history
+    turn_context = build_turn_context(context)
+    if turn_context:
+        messages.append({"role": "system", "content": turn_context})
+    _log_prompt_size(messages)
+    return messages
+
+
+def build_turn_context(context: dict = None) -> str:
+    """Per-turn instructions: question progress, what to ask next, candidate behavior."""
+    if not context:
+        return ""
+    notes = []
+
+    if context.get("question_progress"):
+        notes.append(f"Current question: {context['question_progress']}")
+
+    # Add current question context (what we asked)
+    if context.get("current_question_context"):
+        notes.append(f"Current question you asked: {context['current_question_context']}")
+
+    # Add next question (for when advancing) - predefined or instruction
+    if context.get("next_question"):
+        notes.append(f"When you advance (end with [NEXT]), naturally incorporate this next question: {context['next_question']}")
+    elif context.get("next_question_instruction"):
+        notes.append(f"When you advance (end with [NEXT]), {context['next_question_instruction']}")
+
+    # Add context about user's behavior if available
+    behavior = []
+    if context.get("long_pause"):
+        behavior.append(f"- User paused for {context['long_pause']:.1f}s before answering")
+    if context.get("answer_analysis"):
+        analysis = context["answer_analysis"]
+        if analysis.get("is_struggling"):
+            behavior.append("- User seems to be struggling (many filler words or taking long time)")
+        if analysis.get("is_too_brief"):
+            behavior.append("- User gave very brief answer - DEFINITELY ask a follow-up, do NOT advance yet")
+        if analysis.get("is_confident"):
+            behavior.append("- User seems confident in their answer")
+    if behavior:
+        notes.append("Candidate behavior context:\n" + "\n".join(behavior))
+
+    return "\n\n".join(notes)
+
+
+def record_usage(usage):
+    """Export prompt-cache effectiveness from an API usage block."""
+    if not usage or not usage.prompt_tokens:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = (getattr(details, "cached_tokens", None) or 0) if details else 0
+    _input_tokens.inc(usage.prompt_tokens)
+    _cached_tokens.inc(cached)
+    _cache_hit_ratio.observe(cached / usage.prompt_tokens)
+    print(f"🧮 LLM usage: {usage.prompt_tokens} prompt tokens ({cached} cached), {usage.completion_tokens} completion")
+
+
+def _log_prompt_size(messages: list):
+    tokens = count_message_tokens(messages)
+    _prompt_tokens.observe(tokens)
+    print(f"🧮 LLM prompt: ~{tokens} tokens ({len(messages)} messages)")
+
+
+async def summarize_exchange(messages: list) -> str:
+    """Short summary of a finished question's exchange, used in place of it in later prompts."""
+    transcript = "\n".join(
+        f"{'Interviewer' if m['role'] == 'assistant' else 'Candidate'}: {m['content']}" for m in messages
+    )
+    response = await llm_gateway.complete(
+        messages=[
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": transcript},
+        ],
+        max_tokens=120,
+        temperature=0.2,
+        kind="summary",
+        hedge=False,  # background: nobody is waiting on it
+    )
+    return (response.choices[0].message.content or "").strip()
 
 
 async def get_interviewer_response(
@@ -31,55 +136,237 @@ async def get_interviewer_response(
     - move_to_next=True when LLM ends with [NEXT] (acknowledged and advancing to next question)
     - move_to_next=False when LLM is asking a follow-up (staying on same question)
     """
-    system_msg = system_prompt
-
-    # Add current question context (what we asked)
-    if context and context.get("current_question_context"):
-        system_msg += f"\n\nCurrent question you asked: {context['current_question_context']}"
-
-    # Add next question (for when advancing) - predefined or instruction
-    if context and context.get("next_question"):
-        system_msg += f"\n\nWhen you advance (end with [NEXT]), naturally incorporate this next question: {context['next_question']}"
-    elif context and context.get("next_question_instruction"):
-        system_msg += f"\n\nWhen you advance (end with [NEXT]), {context['next_question_instruction']}"
-
-    # Add context about user's behavior if available
-    if context:
-        behavior_note = "\n\nCandidate behavior context:\n"
-        
-        if context.get("long_pause"):
-            behavior_note += f"- User paused for {context['long_pause']:.1f}s before answering\n"
-            
-        if context.get("answer_analysis"):
-            analysis = context["answer_analysis"]
-            if analysis.get("is_struggling"):
-                behavior_note += "- User seems to be struggling (many filler words or taking long time)\n"
-            if analysis.get("is_too_brief"):
-                behavior_note += "- User gave very brief answer - DEFINITELY ask a follow-up, do NOT advance yet\n"
-            if analysis.get("is_confident"):
-                behavior_note += "- User seems confident in their answer\n"
-                
-        system_msg += behavior_note
-    
-    messages = [
-        {"role": "system", "content": system_msg}
-    ] + conversation_history
+    messages = build_interviewer_messages(conversation_history, system_prompt, context)
     
     try:
-        response = await client.chat.completions.create(
-            model=deployment,
-            messages=messages,
+        response = await llm_gateway.complete(
+            messages,
             max_tokens=250,
             temperature=0.8,
             top_p=0.95,
         )
+        record_usage(response.usage)
         
         raw = response.choices[0].message.content or ""
         move_to_next = NEXT_MARKER in raw
         # Strip the marker and any trailing whitespace
         text = raw.replace(NEXT_MARKER, "").strip()
-        return text or "Could you elaborate on that?", move_to_next
+        return text or ELABORATE_PROMPT, move_to_next
         
     except Exception as e:
         print(f"❌ OpenAI API error: {e}")
-        return "I apologize, I'm having technical difficulties. Could you please repeat that?", False
+        return APOLOGY_MESSAGE, False
+
+
+QUESTION_PLAN_PROMPT = """You are preparing questions for a {role} interview ({experience_level}).
+Focus areas: {focus_areas}
+
+Job Description:
+{job_description}
+
+Questions already planned (do not repeat them):
+{existing}
+
+Write the next {count} interview questions, ordered from warm-up to deeper, each one or two sentences,
+phrased so they can be asked aloud. Respond with a JSON array of strings only."""
+
+
+async def generate_question_plan(
+    role: str,
+    experience_level: str,
+    focus_areas: list,
+    job_description: str,
+    existing_questions: list,
+    count: int,
+) -> list[str]:
+    """Generate `count` interview questions up front. Raises on API or parse errors."""
+    prompt = QUESTION_PLAN_PROMPT.format(
+        role=role,
+        experience_level=experience_level.replace("_", " ").lower(),
+        focus_areas=", ".join(focus_areas) or "technical skills and problem-solving",
+        job_description=job_description[:2000],
+        existing="\n".join(f"- {q}" for q in existing_questions) or "(none)",
+        count=count,
+    )
+    response = await llm_gateway.complete(
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=120 * count,
+        temperature=0.7,
+        kind="question_plan",
+        hedge=False,  # background: turns fall back to inline questions meanwhile
+    )
+    raw = (response.choices[0].message.content or "").strip()
+    # Tolerate a ```json fence around the array
+    raw = raw[raw.find("["):raw.rfind("]") + 1]
+    questions = [q.strip() for q in json.loads(raw) if isinstance(q, str) and q.strip()]
+    return questions[:count]
+
+
+class NextMarkerFilter:
+    """
+    Removes NEXT_MARKER from streamed text. A delta that ends with the start of
+    the marker (e.g. "[NE") is held back until the next delta settles it.
+    """
+
+    def __init__(self, marker: str = NEXT_MARKER):
+        self.marker = marker
+        self.seen = False
+        self._pending = ""
+
+    def feed(self, delta: str) -> str:
+        text = self._pending + delta
+        if self.marker in text:
+            self.seen = True
+            text = text.replace(self.marker, "")
+        # Hold back the longest tail that could still grow into the marker
+        for size in range(min(len(text), len(self.marker) - 1), 0, -1):
+            if self.marker.startswith(text[-size:]):
+                self._pending = text[-size:]
+                return text[:-size]
+        self._pending = ""
+        return text
+
+    def flush(self) -> str:
+        text, self._pending = self._pending, ""
+        return text
+
+
+_SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+')
+
+
+class SentenceSplitter:
+    """
+    Cuts streamed text into sentences for TTS. Sentences shorter than
+    min_chars are joined with the next one to avoid tiny synthesis requests.
+    """
+
+    def __init__(self, min_chars: int = 20):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        self._buffer += delta
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if match.end() - start >= self.min_chars:
+                sentences.append(self._buffer[start:match.end()].strip())
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> list[str]:
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+class InterviewerStream:
+    """
+    Streaming variant of get_interviewer_response. Iterate for text deltas
+    with [NEXT] already removed; move_to_next is set as soon as the marker
+    arrives and `text` holds the reply so far.
+
+        stream = stream_interviewer_response(history, prompt, metrics, ctx)
+        async for delta in stream:
+            ...
+        reply, move_to_next = stream.text, stream.move_to_next
+    """
+
+    def __init__(self, messages: list):
+        self.messages = messages
+        self.text = ""
+        self._filter = NextMarkerFilter()
+
+    @property
+    def move_to_next(self) -> bool:
+        return self._filter.seen
+
+    async def __aiter__(self):
+        started = time.perf_counter()
+        try:
+            chunks = llm_gateway.stream(
+                self.messages,
+                max_tokens=250,
+                temperature=0.8,
+                top_p=0.95,
+                stream_options={"include_usage": True},
+            )
+            try:
+                async for chunk in chunks:
+                    if getattr(chunk, "usage", None):
+                        record_usage(chunk.usage)  # last chunk, when include_usage is honoured
+                    if not chunk.choices:
+                        continue  # usage and Azure content-filter chunks carry no choices
+                    delta = self._filter.feed(chunk.choices[0].delta.content or "")
+                    if delta:
+                        if not self.text:
+                            _first_token.observe(time.perf_counter() - started)
+                        self.text += delta
+                        yield delta
+            finally:
+                # Closes the HTTP stream now if the caller stopped reading early
+                await chunks.aclose()
+            delta = self._filter.flush()
+        except Exception as e:
+            print(f"❌ OpenAI API error: {e}")
+            # Keep whatever was already said; apologize only if nothing was
+            delta = "" if self.text.strip() else APOLOGY_MESSAGE
+        if not (self.text + delta).strip():
+            delta = ELABORATE_PROMPT
+        if delta:
+            self.text += delta
+            yield delta
+        self.text = self.text.strip()
+
+
+def stream_interviewer_response(
+    conversation_history: list,
+    system_prompt: str,
+    metrics: InterviewMetrics = None,
+    context: dict = None
+) -> InterviewerStream:
+    """Start a streamed interviewer reply (see InterviewerStream)."""
+    return InterviewerStream(build_interviewer_messages(conversation_history, system_prompt, context))
+
+
+class SpeculativeReply:
+    """
+    An interviewer reply started on the transcript at a pause, before the end
+    of the turn is confirmed. Deltas are read (and buffered) as they arrive;
+    iterating replays them and continues with the live stream. Call use() or
+    discard() once the final transcript is known.
+    """
+
+    def __init__(self, text: str, stream: InterviewerStream):
+        self.text = text
+        self.stream = stream
+        self._deltas: asyncio.Queue = asyncio.Queue()
+        self._reader = asyncio.create_task(self._read())
+        _speculations.inc()
+
+    async def _read(self):
+        try:
+            async for delta in self.stream:
+                self._deltas.put_nowait(delta)
+        finally:
+            self._deltas.put_nowait(None)
+
+    async def __aiter__(self):
+        try:
+            while (delta := await self._deltas.get()) is not None:
+                yield delta
+        finally:
+            self._reader.cancel()  # closes the LLM stream if the reply is abandoned
+
+    def use(self):
+        _speculation_hits.inc()
+
+    def discard(self, missed: bool = False):
+        """
+        Cancel the request and count what it cost. missed: the final transcript
+        didn't match it; otherwise it was abandoned before it could be judged.
+        """
+        self._reader.cancel()
+        (_speculation_misses if missed else _speculation_abandoned).inc()
+        _speculation_wasted_prompt.inc(count_message_tokens(self.stream.messages))
+        _speculation_wasted_completion.inc(count_tokens(self.stream.text))
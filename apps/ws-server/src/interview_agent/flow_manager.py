@@ -4,14 +4,21 @@ InterviewFlowManager: Fetches interview config from Redis and manages the dynami
 - Questions: CUSTOM_ONLY (use provided), AI_ONLY (generate all), MIXED (use provided + generate remaining)
 - Flow: opening first, then next question based on user's answer
 """
+import asyncio
+import hashlib
 import json
 import logging
+import os
 from typing import Any, Dict, List, Optional, Tuple
 
-from src.services.redis import redis_client
+from src.services.redis import async_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Generated question plans are shared by every session of the same agent config
+QUESTION_PLAN_TTL_SEC = int(os.getenv("QUESTION_PLAN_TTL_SEC", str(7 * 24 * 3600)))
+QUESTION_PLAN_SHARED = os.getenv("QUESTION_PLAN_SHARED", "1") != "0"
+
 QUESTION_SELECTION_MODE = {
     "CUSTOM_ONLY": "custom_only",
     "AI_ONLY": "ai_only",
@@ -37,13 +44,23 @@ class InterviewFlowManager:
         self._data: Optional[Dict[str, Any]] = None
         self._questions: List[Dict] = []
         self._questions_sorted: List[Dict] = []
+        self._planned_questions: List[str] = []  # generated to follow _questions_sorted
+        self._plan_from = 0  # first question index the plan may fill (set when it lands)
+        self._plan_task: Optional[asyncio.Task] = None
         self.current_question_index = 0
-        self._load_session()
+        self._system_prompt: Optional[str] = None
+
+    @classmethod
+    async def load(cls, session_id: str) -> "InterviewFlowManager":
+        """Flow manager for a session whose config is in Redis. Raises SessionNotFoundError."""
+        manager = cls(session_id)
+        await manager._load_session()
+        return manager
 
-    def _load_session(self) -> None:
+    async def _load_session(self) -> None:
         """Fetch session data from Redis. Key format: session-{sessionId} (matches Node backend)."""
         key = f"session-{self.session_id}"
-        raw = redis_client.get(key)
+        raw = await async_redis_client.get(key)
         if not raw:
             logger.error(f"Session not found in Redis: {key}")
             raise SessionNotFoundError(f"Session expired or invalid. Please start the interview again.")
@@ -103,8 +120,17 @@ class InterviewFlowManager:
             f"Don't worry if you need hints or want to think out loud. Ready to begin?"
         )
 
-    def get_system_prompt(self, current_question_count: int) -> str:
-        """Generate dynamic system prompt based on interview config."""
+    def get_system_prompt(self) -> str:
+        """
+        System prompt for the whole session, built once from the interview config.
+        It must not change between turns: the provider caches prompt prefixes, so
+        per-turn values (question progress, behavior notes) go in a trailing message.
+        """
+        if self._system_prompt is None:
+            self._system_prompt = self._build_system_prompt()
+        return self._system_prompt
+
+    def _build_system_prompt(self) -> str:
         focus_str = ", ".join(self.focus_areas) if self.focus_areas else "technical skills"
         return f"""You are an experienced technical interviewer conducting a CONVERSATIONAL interview for a {self.role} position. This is NOT a quiz - engage naturally with the candidate's answers.
 
@@ -113,7 +139,6 @@ Interview Context:
 - Experience Level: {self.experience_level}
 - Focus Areas: {focus_str}
 - Total Questions: {self.total_questions}
-- Current Question: {current_question_count + 1}/{self.total_questions}
 
 Job Description:
 {self.job_description[:2000]}
@@ -143,10 +168,12 @@ Output format: End your response with exactly [NEXT] ONLY when moving to the nex
         - next_question_text: the next question to ask when advancing (predefined or instruction for LLM)
         """
         if self.current_question_index >= self.total_questions:
-            return "", None, self.get_system_prompt(self.current_question_index), {}
+            return "", None, self.get_system_prompt(), {}
 
-        system_prompt = self.get_system_prompt(self.current_question_index)
-        llm_context: Dict[str, Any] = {}
+        system_prompt = self.get_system_prompt()
+        llm_context: Dict[str, Any] = {
+            "question_progress": f"{self.current_question_index + 1}/{self.total_questions}",
+        }
 
         # Current question context - what we asked (for follow-up awareness)
         if self.current_question_index == 0:
@@ -180,14 +207,102 @@ Output format: End your response with exactly [NEXT] ONLY when moving to the nex
 
         return current_context, next_question_text, system_prompt, llm_context
 
+    # -------------------------
+    # Question plan (AI_ONLY / MIXED)
+    # -------------------------
+
+    def start_question_plan(self) -> None:
+        """
+        Generate the questions the agent doesn't define in the background, so
+        advancing turns only phrase a known question instead of inventing one.
+        Until the plan is ready, turns fall back to inline generation.
+        """
+        if self.question_selection_mode.upper() not in ("AI_ONLY", "MIXED"):
+            return
+        if self._missing_question_count() <= 0 or self._plan_task or self._planned_questions:
+            return
+        self._plan_task = asyncio.create_task(self._prepare_question_plan())
+
+    def _missing_question_count(self) -> int:
+        # The last slot is the closing, not a question
+        return self.total_questions - 1 - len(self._questions_sorted)
+
+    def _apply_question_plan(self, questions: List[str]) -> None:
+        """
+        Questions already asked were generated inline; a plan that lands late
+        only fills the slots from the current one on.
+        """
+        self._plan_from = max(len(self._questions_sorted), self.current_question_index)
+        self._planned_questions = questions
+
+    def _question_plan_key(self) -> str:
+        fingerprint = json.dumps({
+            "role": self.role,
+            "level": self.experience_level,
+            "focus": self.focus_areas,
+            "jd": self.job_description,
+            "total": self.total_questions,
+            "questions": [q.get("questionText") for q in self._questions_sorted],
+        }, sort_keys=True)
+        digest = hashlib.sha1(fingerprint.encode()).hexdigest()[:16]
+        return f"question-plan-{self.config.get('id', 'agent')}-{digest}"
+
+    async def _prepare_question_plan(self) -> None:
+        # Imported here: ai_brain is only needed once a plan must be generated
+        from src.interview_agent.ai_brain import generate_question_plan
+
+        key = self._question_plan_key()
+        try:
+            if QUESTION_PLAN_SHARED:
+                cached = await async_redis_client.get(key)
+                if cached:
+                    self._apply_question_plan(json.loads(cached))
+                    logger.info(f"Question plan loaded from cache ({len(self._planned_questions)} questions)")
+                    return
+
+            existing = [self._get_question_text_at(i) for i in range(len(self._questions_sorted))]
+            questions = await generate_question_plan(
+                self.role,
+                self.experience_level,
+                self.focus_areas,
+                self.job_description,
+                [q for q in existing if q],
+                self._missing_question_count(),
+            )
+            self._apply_question_plan(questions)
+            logger.info(f"Question plan generated ({len(self._planned_questions)} questions)")
+
+            if QUESTION_PLAN_SHARED and self._planned_questions:
+                await async_redis_client.set(key, json.dumps(self._planned_questions), QUESTION_PLAN_TTL_SEC)
+        except Exception as e:
+            logger.warning(f"Question plan unavailable, questions will be generated inline: {e}")
+
     def _get_question_text_at(self, index: int) -> Optional[str]:
-        """Get predefined question text at index, or None if none."""
-        if index < 0 or index >= len(self._questions_sorted):
+        """Get question text at index (predefined, then planned), or None if none."""
+        if index >= len(self._questions_sorted):
+            planned = index - len(self._questions_sorted)
+            if index >= self._plan_from and planned < len(self._planned_questions):
+                return self._planned_questions[planned]
+            return None
+        if index < 0:
             return None
         q = self._questions_sorted[index]
         text = q.get("questionText") or ""
         return text.strip() if text else None
 
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Flow position and generated questions, for a session checkpoint (session/checkpoint.py)."""
+        return {
+            "question_index": self.current_question_index,
+            "planned_questions": self._planned_questions,
+            "plan_from": self._plan_from,
+        }
+
+    def restore_state(self, state: Dict[str, Any]) -> None:
+        self.current_question_index = state.get("question_index", 0)
+        self._planned_questions = state.get("planned_questions") or []
+        self._plan_from = state.get("plan_from", 0)
+
     def advance_to_next_question(self) -> None:
         """Call when LLM has decided to move to the next question."""
         self.current_question_index += 1
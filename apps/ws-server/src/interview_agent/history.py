@@ -0,0 +1,124 @@
+"""
+HistoryManager: the conversation as the interviewer LLM sees it.
+
+The full transcript stays in SpeechState.conversation_history (reports and
+events need all of it). For prompts, the current question's exchange is kept
+verbatim and each completed question is replaced by a short summary written
+in the background after the flow advances. Everything is fitted to a token
+budget, dropping the oldest questions first.
+
+Consecutive prompts should share as long a prefix as possible (the provider
+caches it), so the earlier part only changes in coarse steps: a completed
+question's representation is fixed until the next question boundary (a summary
+that lands mid-question waits for it), and when the budget overflows the oldest
+questions are dropped down to LLM_HISTORY_TRIM_RATIO of it rather than one per turn.
+"""
+import asyncio
+import logging
+import os
+from typing import Dict, List, Optional
+
+from src.core.tokens import count_message_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryManager:
+    def __init__(self, messages: List[Dict], budget_tokens: Optional[int] = None):
+        self.messages = messages  # shared with SpeechState.conversation_history
+        self.budget_tokens = budget_tokens or int(os.getenv("LLM_HISTORY_TOKEN_BUDGET", "3000"))
+        self.trim_ratio = float(os.getenv("LLM_HISTORY_TRIM_RATIO", "0.75"))
+        self._boundaries = [0]  # index in messages where each question's exchange starts
+        self._summaries: Dict[int, str] = {}  # question number -> summary
+        self._window_start = 0  # oldest completed question still in the prompt
+        self._frozen: Dict[int, List[Dict]] = {}  # question -> representation in the current prompt
+        self._tasks: set = set()
+
+    @property
+    def completed_questions(self) -> int:
+        return len(self._boundaries) - 1
+
+    def mark_question_boundary(self):
+        """
+        Call after the flow advances. The advancing reply (which asks the next
+        question) opens the new exchange; everything before it is summarized.
+        """
+        start = self._boundaries[-1]
+        end = max(start, len(self.messages) - 1)
+        question = self.completed_questions
+        self._boundaries.append(end)
+        self._frozen.clear()  # the prefix changes here anyway: let finished summaries in
+        if end > start:
+            task = asyncio.create_task(self._summarize(question, self.messages[start:end]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, question: int, exchange: List[Dict]):
+        # Imported here: ai_brain builds prompts from this module's output
+        from src.interview_agent.ai_brain import summarize_exchange
+        try:
+            summary = await summarize_exchange(_for_llm(exchange))
+        except Exception as e:
+            logger.warning(f"History summary for question {question} failed, keeping it verbatim: {e}")
+            return
+        if summary:
+            self._summaries[question] = summary
+
+    def checkpoint_state(self) -> Dict:
+        """Question boundaries and summaries, for a session checkpoint (session/checkpoint.py)."""
+        return {
+            "boundaries": list(self._boundaries),
+            "summaries": {str(q): s for q, s in self._summaries.items()},
+            "window_start": self._window_start,
+        }
+
+    def restore_state(self, state: Dict):
+        self._boundaries = list(state.get("boundaries") or [0])
+        self._summaries = {int(q): s for q, s in (state.get("summaries") or {}).items()}
+        self._window_start = state.get("window_start", 0)
+        self._frozen.clear()
+
+    def prompt_messages(self) -> List[Dict]:
+        """Messages for the next LLM call, within budget_tokens."""
+        current = _for_llm(self.messages[self._boundaries[-1]:])
+        used = count_message_tokens(current)
+
+        # Current exchange is kept verbatim; only trim it if it alone is over budget
+        while used > self.budget_tokens and len(current) > 2:
+            used -= count_message_tokens(current[:1])
+            current = current[1:]
+
+        earlier = self._earlier_units()
+        if used + sum(cost for _, cost in earlier) > self.budget_tokens:
+            # Over budget: re-fit to a lower target so the next few turns don't trim again
+            self._frozen.clear()
+            earlier = self._earlier_units()
+            target = self.budget_tokens * self.trim_ratio
+            while earlier and used + sum(cost for _, cost in earlier) > target:
+                earlier.pop(0)
+                self._window_start += 1
+
+        return [m for unit, _ in earlier for m in unit] + current
+
+    def _earlier_units(self) -> List[tuple]:
+        """(messages, tokens) for each completed question in the window, oldest first."""
+        units = []
+        for question in range(self._window_start, self.completed_questions):
+            if question not in self._frozen:
+                self._frozen[question] = self._completed_unit(question)
+            unit = self._frozen[question]
+            units.append((unit, count_message_tokens(unit)))
+        return units
+
+    def _completed_unit(self, question: int) -> List[Dict]:
+        summary = self._summaries.get(question)
+        if summary:
+            label = "Introduction" if question == 0 else f"Question {question}"
+            return [{"role": "system", "content": f"Earlier in the interview ({label}): {summary}"}]
+        start, end = self._boundaries[question], self._boundaries[question + 1]
+        return _for_llm(self.messages[start:end])
+
+
+def _for_llm(messages: List[Dict]) -> List[Dict]:
+    """Drop transcript-only fields (timestamps) before sending to the API."""
+    return [{"role": m["role"], "content": m["content"]} for m in messages]
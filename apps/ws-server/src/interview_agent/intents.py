@@ -0,0 +1,60 @@
+"""
+Local intent matcher for trivial turns ("Can you repeat the question?",
+"Yes, I'm ready"). A match is answered without an LLM round-trip; anything
+else goes through the interviewer LLM as usual.
+
+Only short utterances are considered, and a pattern must cover the whole
+utterance (after fillers and punctuation are dropped), so an answer that
+merely contains "ready" or "again" never takes the fast path.
+"""
+import difflib
+import re
+from typing import Optional
+
+from src.constant import FAST_INTENTS
+
+REPEAT_QUESTION = "repeat_question"
+READY = "ready"
+
+MAX_INTENT_WORDS = 10
+
+_FILLERS = re.compile(r"\b(um+|uh+|er+|oh|so|okay|ok|yeah|yes|sure|sorry|please|just)\b")
+_NON_WORD = re.compile(r"[^a-z' ]+")
+
+_PATTERNS = {
+    REPEAT_QUESTION: re.compile(
+        r"^(?:(?:can|could|would) you )?(?:repeat|say|ask|rephrase)(?: (?:the|that|your))?"
+        r"(?: question| it| that)?(?: (?:again|one more time))?(?: for me)?$"
+        r"|^(?:i )?(?:didn't|did not|couldn't|could not) (?:hear|catch|get|understand)(?: (?:that|you|the question|it))?$"
+        r"|^(?:pardon|come again|what was the question|what was that)$"
+    ),
+    READY: re.compile(
+        r"^(?:i'm|i am|we're)? ?ready(?: to (?:start|begin|go))?$"
+        r"|^(?:let's|let us) (?:start|begin|go|get started|do it|do this)$"
+        r"|^(?:i'm|i am) good to go$"
+    ),
+}
+
+
+def normalize(text: str) -> str:
+    text = _NON_WORD.sub(" ", text.lower().replace("’", "'"))
+    text = _FILLERS.sub(" ", text)
+    return " ".join(text.split())
+
+
+def match_intent(text: str) -> Optional[str]:
+    """The enabled intent that `text` expresses, or None."""
+    if not text or len(text.split()) > MAX_INTENT_WORDS:
+        return None
+    normalized = normalize(text)
+    for intent in FAST_INTENTS:
+        pattern = _PATTERNS.get(intent)
+        if pattern and pattern.match(normalized):
+            return intent
+    return None
+
+
+def same_answer(first: str, second: str, max_edit_ratio: float) -> bool:
+    """True if two transcripts of an answer differ by at most `max_edit_ratio` once normalized."""
+    a, b = normalize(first), normalize(second)
+    return 1 - difflib.SequenceMatcher(None, a, b).ratio() <= max_edit_ratio
@@ -1,4 +1,5 @@
 import time
+from src.constant import ENCOURAGEMENT_SHORT, ENCOURAGEMENT_MEDIUM, ENCOURAGEMENT_LONG
 
 SYSTEM_PROMPT = """You are an experienced technical interviewer conducting an interview for a Software Engineer position.
 
@@ -56,21 +57,7 @@ class InterviewMetrics:
         
     def analyze_answer_pace(self, duration: float, text: str) -> dict:
         """Analyze if answer was too fast, too slow, or struggling"""
-        word_count = len(text.split())
-        
-        # Struggling indicators
-        struggling_words = ['um', 'uh', 'hmm', 'err', 'like', 'you know', 'ahh']
-        struggle_count = sum(1 for word in struggling_words if word in text.lower())
-        
-        analysis = {
-            "duration": duration,
-            "word_count": word_count,
-            "words_per_second": word_count / duration if duration > 0 else 0,
-            "is_struggling": struggle_count > 2 or duration > 45,
-            "is_too_brief": word_count < 10 and duration < 5,
-            "is_confident": struggle_count == 0 and 15 < word_count < 100,
-            "needs_encouragement": duration > 30
-        }
+        analysis = assess_answer_pace(duration, text)
         
         if analysis["is_struggling"]:
             self.struggling_indicators += 1
@@ -81,16 +68,35 @@ class InterviewMetrics:
         return analysis
 
 
+def assess_answer_pace(duration: float, text: str) -> dict:
+    """Pace analysis of an answer, without recording it in the session metrics"""
+    word_count = len(text.split())
+    
+    # Struggling indicators
+    struggling_words = ['um', 'uh', 'hmm', 'err', 'like', 'you know', 'ahh']
+    struggle_count = sum(1 for word in struggling_words if word in text.lower())
+    
+    return {
+        "duration": duration,
+        "word_count": word_count,
+        "words_per_second": word_count / duration if duration > 0 else 0,
+        "is_struggling": struggle_count > 2 or duration > 45,
+        "is_too_brief": word_count < 10 and duration < 5,
+        "is_confident": struggle_count == 0 and 15 < word_count < 100,
+        "needs_encouragement": duration > 30
+    }
+
+
 async def provide_encouragement(pause_duration: float) -> str:
     """Generate encouragement based on pause length"""
     if pause_duration < 12:
         return None  # No need for encouragement
     elif pause_duration < 20:
-        return "Take your time to think through your answer."
+        return ENCOURAGEMENT_SHORT
     elif pause_duration < 30:
-        return "No rush. Would you like me to rephrase the question?"
+        return ENCOURAGEMENT_MEDIUM
     else:
-        return "I notice you're taking some time. Would it help if I gave you a hint or moved to a different question?"
+        return ENCOURAGEMENT_LONG
 
 
 async def start_interview() -> str:
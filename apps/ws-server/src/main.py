@@ -8,21 +8,116 @@ setup_gcp_cred()
 
 from aiortc import MediaStreamTrack
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
 import asyncio
+import time
 from src.websocket.websocket_conn import handle_websocket_message
-from src.core.helper import get_token_and_session, send_over_ws
+from src.core.helper import get_query_param, get_token_and_session, send_over_ws
 from src.session.session import InterviewSession
-from src.manager.webrtc_audio_input import WebRTCAudioInput
+from src.manager.webrtc_audio_input import WebRTCAudioInput, create_peer_connection
+from src.manager.websocket_audio_input import WebSocketAudioInput
+from src.transport.websocket_audio import AUDIO_CODECS
 from src.interview_agent.flow_manager import InterviewFlowManager, SessionNotFoundError
 from src.services.redis.event_emitter import emit_start_interview
+from src.session.checkpoint import can_resume, is_live, load_checkpoint, load_owner, restore_session, supersede
+from src.session.registry import session_registry
+from src.services.redis import async_redis_client, event_outbox
+from src.core import metrics, tokens
+from src.constant import STATIC_PHRASES, BACKCHANNEL_PHRASES
+from src.services.tts.phrase_cache import phrase_cache
+from src.services.llm import llm_gateway
 
 
 # Global states
 app = FastAPI()
 
+
+@app.on_event("startup")
+async def warm_phrase_cache():
+    """Synthesize and encode the fixed interviewer phrases and fillers before the first session needs them."""
+    asyncio.create_task(phrase_cache.warm(STATIC_PHRASES + BACKCHANNEL_PHRASES))
+
+
+@app.on_event("startup")
+async def load_tokenizer():
+    """Load the prompt tokenizer in a worker thread; token counts are estimated until it's ready."""
+    asyncio.create_task(asyncio.to_thread(tokens.load_encoding))
+
+
+@app.on_event("startup")
+async def prewarm_llm_connections():
+    """Open LLM connections up front so the first turn doesn't pay for the TLS handshake."""
+    asyncio.create_task(llm_gateway.prewarm())
+
+
+@app.on_event("startup")
+async def start_event_outbox():
+    """Start the event flusher; replays events spooled during an earlier Redis outage."""
+    event_outbox.start()
+
+
+@app.on_event("startup")
+async def start_session_registry():
+    """Publish this node's load (heartbeat) and start measuring event loop lag."""
+    session_registry.start()
+
+
+@app.on_event("shutdown")
+async def close_redis_pool():
+    await session_registry.stop()
+    await event_outbox.close()
+    await async_redis_client.close()
+
+
+@app.get('/metrics')
+async def get_metrics():
+    """Process-wide service metrics (TTS latency, errors, ...)."""
+    return metrics.snapshot()
+
+
+@app.get('/headroom')
+async def get_headroom():
+    """This node's load and projected headroom, for the autoscaler and load balancer (503 when full)."""
+    load = session_registry.load()
+    return JSONResponse(load, status_code=200 if load["headroom"] > 0 else 503)
+
+
+def _connect_phase(phase: str, seconds: float):
+    metrics.histogram(f"connect.{phase}_sec").observe(seconds)
+
+
+async def _timed(phase: str, awaitable):
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        _connect_phase(phase, time.perf_counter() - started)
+
+
+def _timed_sync(phase: str, fn):
+    started = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        _connect_phase(phase, time.perf_counter() - started)
+
+
+async def _load_resume_state(session_id: str):
+    """
+    The session's checkpoint and the node that claims it, if any. When Redis
+    can't tell, the session starts fresh rather than failing the connection.
+    """
+    try:
+        return await asyncio.gather(load_checkpoint(session_id), load_owner(session_id))
+    except Exception as e:
+        print(f"⚠️  Checkpoint lookup failed for session {session_id}, starting fresh: {e}")
+        return None, None
+
+
 @app.websocket('/ws')
 async def websocket_endpoint(ws: WebSocket):
     await ws.accept()
+    accepted_at = time.perf_counter()
     print("WebSocket connection accepted")
 
     token, session_id = get_token_and_session(str(ws.url))
@@ -37,35 +132,100 @@ async def websocket_endpoint(ws: WebSocket):
         await ws.close(code=4001, reason="Missing token or session ID")
         return
 
-    session = InterviewSession(token, str(session_id))
-    payload = session.verify_jwt()
-    if payload is None:
+    # Audio path: WebRTC (default) or binary frames on this socket (?audio=pcm|opus)
+    audio_mode = get_query_param(str(ws.url), "audio") or "webrtc"
+    if audio_mode != "webrtc" and audio_mode not in AUDIO_CODECS:
         await send_over_ws(ws, {
             "type": "error",
-            "code": "FORBIDDEN",
-            "message": "Invalid or expired access. Please sign in again."
+            "code": "UNSUPPORTED_AUDIO_TRANSPORT",
+            "message": f"Unsupported audio transport '{audio_mode}'. Use webrtc, {' or '.join(AUDIO_CODECS)}."
         })
-        await ws.close(code=4003, reason="Invalid or expired token")
+        await ws.close(code=4005, reason="Unsupported audio transport")
         return
 
-    # Load interview config from Redis
+    session = InterviewSession(token, str(session_id))
+    session.accepted_at = accepted_at
+
+    # Bootstrap concurrently: the session config and checkpoint are fetched and
+    # the peer connection (WebRTC only) built while the token is verified
+    config_task = asyncio.create_task(_timed("config", InterviewFlowManager.load(str(session_id))))
+    checkpoint_task = asyncio.create_task(_load_resume_state(str(session_id)))
+    peer = _timed_sync("peer", create_peer_connection) if audio_mode == "webrtc" else None
+    payload = await _timed("verify", asyncio.to_thread(session.verify_jwt))
+
+    async def abort(code: int, error: str, message: str, reason: str, **extra):
+        for task in (config_task, checkpoint_task):
+            task.cancel()
+        await asyncio.gather(config_task, checkpoint_task, return_exceptions=True)
+        if peer:
+            await peer[0].close()
+            peer[1].stop()
+        await send_over_ws(ws, {"type": "error", "code": error, "message": message, **extra})
+        await ws.close(code=code, reason=reason)
+
+    if payload is None:
+        await abort(4003, "FORBIDDEN", "Invalid or expired access. Please sign in again.", "Invalid or expired token")
+        return
+
+    # Interview config from Redis; a checkpoint means this is a reconnect
     try:
-        session.flow_manager = InterviewFlowManager(str(session_id))
+        session.flow_manager = await config_task
+        checkpoint, owner = await checkpoint_task
     except SessionNotFoundError as e:
-        await send_over_ws(ws, {
-            "type": "error",
-            "code": "SESSION_EXPIRED",
-            "message": str(e)
-        })
-        await ws.close(code=4004, reason="Session expired or invalid")
+        await abort(4004, "SESSION_EXPIRED", str(e), "Session expired or invalid")
+        return
+    except Exception as e:
+        print(f"❌ Could not load session {session_id}: {e}")
+        await abort(1011, "SERVER_ERROR", "Could not load the interview. Please try again.", "Session load failed")
         return
 
-    print(f"[CHECKPOINT] user_connected user_id={session.user_id}")
+    # Two connections on one interview would write the same transcript: only resume once the other is gone
+    if is_live(checkpoint, owner):
+        await abort(
+            4009, "SESSION_IN_USE",
+            "This interview is already open in another tab or window. Close it and try again.",
+            "Session already in use",
+        )
+        return
+    try:
+        if can_resume(checkpoint, session.user_id, owner):
+            await restore_session(session, checkpoint)
+        elif checkpoint and checkpoint.get("user_id") == session.user_id:
+            await supersede(session, checkpoint)
+    except Exception as e:
+        print(f"❌ Could not restore session {session_id}: {e}")
+        await abort(1011, "SERVER_ERROR", "Could not load the interview. Please try again.", "Session restore failed")
+        return
+
+    # Admission control
+    refusal = await session_registry.admission(session)
+    if refusal:
+        await abort(**refusal)
+        return
+
+    session.flow_manager.start_question_plan()
+
+    bootstrap_sec = time.perf_counter() - accepted_at
+    _connect_phase("bootstrap", bootstrap_sec)
+    print(f"[CHECKPOINT] user_connected user_id={session.user_id} resumed={session.resumed}"
+          f" bootstrap={bootstrap_sec * 1000:.0f}ms")
 
     # Emit start_interview event for worker to update DB
-    emit_start_interview(session)
+    if not session.resumed:
+        emit_start_interview(session)
+
+    if audio_mode != "webrtc":
+        ws_audio = WebSocketAudioInput(ws, session.user_id, session, audio_mode)
+        await ws_audio.start_processor()
+        receive_task = asyncio.create_task(ws_audio.receive())
+        await ws_audio.process_audio()
+        try:
+            await receive_task
+        finally:
+            await ws_audio.cleanup()
+        return
 
-    webrtc_input = WebRTCAudioInput(ws, session.user_id, session)
+    webrtc_input = WebRTCAudioInput(ws, session.user_id, session, peer)
     await webrtc_input.start_processor()
     
     @webrtc_input.pc.on('track')
@@ -9,10 +9,10 @@ from src.constant import FRAME_SIZE
 from src.websocket.audio_bufffer import downsample_48k_to_16k
 from src.core.helper import get_token
 from src.session.session import InterviewSession
+from src.session.registry import session_registry
 from src.agents.interview.agent import InterviewAgent
 from src.media.audio.pipeline import AudioPipeline
 
-active_sessions: dict[str, InterviewSession] = {}
 
 
 class AudioManager:
@@ -30,7 +30,7 @@ class AudioManager:
         session.tts_track = self.tts_track
         session.agent = InterviewAgent(session)
         session.audio_pipeline = AudioPipeline(session)
-        active_sessions[user_id] = session
+        session_registry.register(session)
 
         self.should_stop = asyncio.Event()
         self.connection_ready = asyncio.Event()
@@ -121,8 +121,7 @@ class AudioManager:
         await asyncio.sleep(0.1)
         try:
             await self.pc.close()
-            if self.user_id in active_sessions:
-                del active_sessions[self.user_id]
+            session_registry.unregister(self.session)
             print("✅ Connection closed gracefully")
         except Exception as e:
             print(f"❌ Error during cleanup: {e}")
@@ -5,42 +5,54 @@ WebRTC audio input: I/O only.
 - Pass PCM chunks to session.audio_pipeline
 """
 import asyncio
+import time
 from aiortc import MediaStreamTrack, RTCPeerConnection
 from fastapi import WebSocket
 import numpy as np
 from src.websocket.webrtc_tts_track import TTSAudioTrack
 from src.core.helper import get_mono_audio
-from src.constant import FRAME_SIZE
+from src.core import metrics
 from src.websocket.audio_bufffer import downsample_48k_to_16k
 from src.session.session import InterviewSession
+from src.session.registry import session_registry
 from src.agents.interview.agent import InterviewAgent
 from src.media.audio.pipeline import AudioPipeline
 from src.transport.websocket import WebSocketTransport
 from src.transport.webrtc_output import WebRTCOutput
 from src.transport.composite import CompositeTransport
-from src.services.redis.event_emitter import emit_abandon_interview
+from src.session.checkpoint import schedule_abandon
 from aiortc import RTCConfiguration, RTCIceServer
-active_sessions: dict[str, InterviewSession] = {}
 
+_first_audio = metrics.histogram("connect.first_audio_sec")
 
-class WebRTCAudioInput:
-    def __init__(self, ws: WebSocket, user_id: str, session: InterviewSession):
-        self.pc = RTCPeerConnection(
-            configuration=RTCConfiguration(
-                iceServers=[
-                    RTCIceServer(urls=["stun:stun.l.google.com:19302"]),
-                    # Add TURN server for production
-                ]
-            )
+
+def create_peer_connection() -> tuple[RTCPeerConnection, TTSAudioTrack]:
+    """
+    Peer connection with the TTS track attached. It doesn't depend on the
+    session, so websocket_endpoint builds it while the session is loading.
+    """
+    pc = RTCPeerConnection(
+        configuration=RTCConfiguration(
+            iceServers=[
+                RTCIceServer(urls=["stun:stun.l.google.com:19302"]),
+                # Add TURN server for production
+            ]
         )
+    )
+    tts_track = TTSAudioTrack()
+    pc.addTrack(tts_track)
+    print("🔊 TTS audio track added to peer connection")
+    return pc, tts_track
+
+
+class WebRTCAudioInput:
+    def __init__(self, ws: WebSocket, user_id: str, session: InterviewSession,
+                 peer: tuple[RTCPeerConnection, TTSAudioTrack] | None = None):
+        self.pc, self.tts_track = peer or create_peer_connection()
         self.user_id = user_id
         self.session = session
-        self.tts_track = TTSAudioTrack()
         self.ws = ws
 
-        self.pc.addTrack(self.tts_track)
-        print("🔊 TTS audio track added to peer connection")
-
         session.ws = ws
         session.tts_track = self.tts_track
         session.transport = CompositeTransport(
@@ -49,7 +61,7 @@ class WebRTCAudioInput:
         )
         session.agent = InterviewAgent(session)
         session.audio_pipeline = AudioPipeline(session)
-        active_sessions[user_id] = session
+        session_registry.register(session)
 
         self.should_stop = asyncio.Event()
         self.connection_ready = asyncio.Event()
@@ -76,12 +88,7 @@ class WebRTCAudioInput:
                         audio_mono = (audio_mono * 32767).astype(np.int16)
 
                     pcm_16k = downsample_48k_to_16k(audio_mono)
-                    self.session.state.audio_buffer.add(pcm_16k)
-                    
-                    while len(self.session.state.audio_buffer.buffer) >= FRAME_SIZE:
-                        chunk = self.session.state.audio_buffer.buffer[:FRAME_SIZE]
-                        self.session.state.audio_buffer.buffer = self.session.state.audio_buffer.buffer[FRAME_SIZE:]
-                        await self.session.audio_pipeline.process_chunk(chunk)
+                    await self.session.audio_pipeline.ingest(pcm_16k)
                 except asyncio.TimeoutError:
                     continue
                 except Exception as e:
@@ -113,7 +120,13 @@ class WebRTCAudioInput:
             await asyncio.wait_for(self.audio_ready.wait(), timeout=5.0)
             print("Audio track ready")
             await asyncio.sleep(0.5)
-            await self.session.agent.start()
+            if self.session.resumed:
+                await self.session.agent.resume()
+            else:
+                await self.session.agent.start()
+            if self.session.accepted_at is not None:
+                # What the candidate experiences as "the interview is loading"
+                _first_audio.observe(time.perf_counter() - self.session.accepted_at)
         except asyncio.TimeoutError:
             print("❌ Connection timeout - peer connection didn't establish")
         except Exception as e:
@@ -127,16 +140,14 @@ class WebRTCAudioInput:
         await self.session.agent.processor.stop()
         await asyncio.sleep(0.1)
         try:
-            # Emit abandon_interview if not successfully completed
-            if not getattr(self.session, "interview_completed", False) and self.session.flow_manager:
-                emit_abandon_interview(
-                    self.session,
-                    reason="connection_closed",
-                    conversation_history=getattr(self.session.state, "conversation_history", []),
-                )
+            # Not finished: keep it resumable for the grace period before emitting abandon_interview
+            if not self.session.interview_completed and self.session.flow_manager:
+                schedule_abandon(self.session, reason="connection_closed")
             await self.pc.close()
-            if self.user_id in active_sessions:
-                del active_sessions[self.user_id]
+            self.tts_track.stop()  # leave the shared media clock
+            self.session.transport.close()  # stop the WebSocket writer
+            print(f"📊 TTS frames: {self.tts_track.frames_encoded} encoded, {self.tts_track.frames_suppressed} suppressed")
+            session_registry.unregister(self.session)
             print("✅ Connection closed gracefully")
         except Exception as e:
             print(f"❌ Error during cleanup: {e}")
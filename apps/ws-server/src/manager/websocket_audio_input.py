@@ -0,0 +1,110 @@
+"""
+WebSocket audio input: I/O only, the ?audio=pcm|opus alternative to WebRTCAudioInput.
+- Receive binary audio frames on the WebSocket (transport/websocket_audio.py)
+- Decode to 16kHz PCM
+- Pass it to session.audio_pipeline
+TTS goes back on the same socket through WebSocketAudioOutput.
+"""
+import asyncio
+import time
+from fastapi import WebSocket, WebSocketDisconnect
+from src.websocket.webrtc_tts_track import TTSAudioTrack
+from src.core import metrics
+from src.session.session import InterviewSession
+from src.session.registry import session_registry
+from src.session.checkpoint import schedule_abandon
+from src.agents.interview.agent import InterviewAgent
+from src.media.audio.pipeline import AudioPipeline
+from src.transport.websocket import WebSocketTransport
+from src.transport.websocket_audio import InboundAudioDecoder, WebSocketAudioOutput
+from src.transport.composite import CompositeTransport
+
+_first_audio = metrics.histogram("connect.first_audio_sec")
+
+
+class WebSocketAudioInput:
+    def __init__(self, ws: WebSocket, user_id: str, session: InterviewSession, codec: str):
+        self.user_id = user_id
+        self.session = session
+        self.ws = ws
+        self.tts_track = TTSAudioTrack()
+        self.audio_output = WebSocketAudioOutput(self.tts_track, ws.send_bytes, codec)
+        self.decoder = InboundAudioDecoder(codec)
+
+        session.ws = ws
+        session.tts_track = self.tts_track
+        session.transport = CompositeTransport(WebSocketTransport(ws), self.audio_output)
+        session.agent = InterviewAgent(session)
+        session.audio_pipeline = AudioPipeline(session)
+        session_registry.register(session)
+
+        self.should_stop = asyncio.Event()
+        self.audio_ready = asyncio.Event()
+        print(f"🔊 WebSocket audio ({codec}) for user {user_id}")
+
+    async def start_processor(self):
+        await self.session.agent.processor.start()
+        self.audio_output.start()
+
+    async def receive(self):
+        """Binary messages are audio frames; text messages carry no audio-path control yet."""
+        try:
+            while not self.should_stop.is_set():
+                try:
+                    # Timeout so we can check should_stop periodically
+                    message = await asyncio.wait_for(self.ws.receive(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    continue
+                if message["type"] == "websocket.disconnect":
+                    print("🔌 WebSocket disconnected by client")
+                    break
+                data = message.get("bytes")
+                if not data:
+                    continue
+                self.audio_ready.set()
+                await self.session.audio_pipeline.ingest(self.decoder.decode(data))
+        except WebSocketDisconnect:
+            print("🔌 WebSocket disconnected by client")
+        except Exception as e:
+            print(f"❌ WebSocket audio error: {e}")
+            import traceback
+            traceback.print_exc()
+        finally:
+            self.should_stop.set()
+
+    async def process_audio(self):
+        """Start the interview once the client's microphone frames arrive."""
+        try:
+            await asyncio.wait_for(self.audio_ready.wait(), timeout=10.0)
+            print("Audio stream ready")
+            if self.session.resumed:
+                await self.session.agent.resume()
+            else:
+                await self.session.agent.start()
+            if self.session.accepted_at is not None:
+                _first_audio.observe(time.perf_counter() - self.session.accepted_at)
+        except asyncio.TimeoutError:
+            print("❌ Timeout - no audio received over the WebSocket")
+            self.should_stop.set()
+        except Exception as e:
+            print(f"❌ Error during initialization: {e}")
+            import traceback
+            traceback.print_exc()
+
+    async def cleanup(self):
+        print("🧹 Cleaning up connection...")
+        self.should_stop.set()
+        await self.session.agent.processor.stop()
+        await asyncio.sleep(0.1)
+        try:
+            # Not finished: keep it resumable for the grace period before emitting abandon_interview
+            if not self.session.interview_completed and self.session.flow_manager:
+                schedule_abandon(self.session, reason="connection_closed")
+            self.session.transport.close()  # stop the WebSocket writer and audio sender
+            self.tts_track.stop()  # leave the shared media clock
+            print(f"📊 TTS frames: {self.tts_track.frames_encoded} encoded, {self.tts_track.frames_suppressed} suppressed")
+            session_registry.unregister(self.session)
+            print("✅ Connection closed gracefully")
+        except Exception as e:
+            print(f"❌ Error during cleanup: {e}")
+        self.session.state.reset()
@@ -0,0 +1,106 @@
+"""
+Process-wide media clock for outbound audio.
+
+A single task ticks every 20ms on the event loop's monotonic clock and, in one
+pass, builds the next frame for every TTS track waiting in recv(). With N
+sessions that is one timer wakeup per tick instead of N, and every track is
+paced from the same schedule.
+"""
+
+import asyncio
+from typing import Dict, Optional, Set
+
+from src.core import metrics
+
+FRAME_DURATION = 0.020  # seconds per audio frame
+MAX_LAG_FRAMES = 5  # beyond this the clock (or a track) resyncs instead of bursting
+
+
+class MediaClock:
+    def __init__(self, frame_duration: float = FRAME_DURATION, max_lag_frames: int = MAX_LAG_FRAMES):
+        self.frame_duration = frame_duration
+        self.max_lag_frames = max_lag_frames
+        self.tick = 0
+
+        self._tracks: Set = set()
+        self._waiters: Dict[object, asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+
+        self._late_ms = metrics.histogram("media_clock.late_ms")
+        self._jitter_ms = metrics.histogram("media_clock.jitter_ms")
+        self._late_ticks = metrics.counter("media_clock.late_ticks")
+        self._resyncs = metrics.counter("media_clock.resyncs")
+        self._active_tracks = metrics.gauge("media_clock.tracks")
+
+    def register(self, track):
+        """Start pacing a track from the current tick."""
+        track._clock_origin = self.tick
+        self._tracks.add(track)
+        self._active_tracks.set(len(self._tracks))
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def unregister(self, track):
+        self._tracks.discard(track)
+        self._active_tracks.set(len(self._tracks))
+        waiter = self._waiters.pop(track, None)
+        if waiter and not waiter.done():
+            waiter.cancel()
+        if not self._tracks and self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def next_frame(self, track):
+        """Return the track's next frame once the clock says it is due."""
+        if track not in self._tracks:
+            self.register(track)
+
+        behind = (self.tick - track._clock_origin) - track._frames_sent
+        if behind > self.max_lag_frames:
+            # Consumer stalled (e.g. slow encode) - skip ahead rather than burst
+            track._clock_origin = self.tick - track._frames_sent
+        elif behind > 0:
+            # Frame already due: catch up without waiting for the next tick
+            return track._next_frame()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[track] = waiter
+        return await waiter
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time() - self.tick * self.frame_duration
+        last_tick_at = None
+
+        while self._tracks:
+            deadline = start + (self.tick + 1) * self.frame_duration
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            now = loop.time()
+            late = now - deadline
+            self._late_ms.observe(late * 1000)
+            if late > self.frame_duration:
+                self._late_ticks.inc()
+            if last_tick_at is not None:
+                self._jitter_ms.observe(abs((now - last_tick_at) - self.frame_duration) * 1000)
+            last_tick_at = now
+
+            if late > self.max_lag_frames * self.frame_duration:
+                # Loop was blocked for several frames: rebase instead of firing a burst of ticks
+                self._resyncs.inc()
+                start = now - (self.tick + 1) * self.frame_duration
+
+            self.tick += 1
+            waiters, self._waiters = self._waiters, {}
+            for track, waiter in waiters.items():
+                if waiter.done():
+                    continue
+                try:
+                    waiter.set_result(track._next_frame())
+                except Exception as e:
+                    waiter.set_exception(e)
+
+
+media_clock = MediaClock()
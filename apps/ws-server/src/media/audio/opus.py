@@ -0,0 +1,93 @@
+"""
+Opus helpers for the outbound WebRTC path.
+
+aiortc sends an av.Packet returned from track.recv() as-is (no encode), so
+pre-encoded payloads must match its Opus encoder: 48kHz, 20ms frames.
+Verified against aiortc 1.14.0 and av 16.1.0 (see requirements.txt).
+"""
+
+import fractions
+from functools import lru_cache
+
+import numpy as np
+from av import AudioFrame, Packet
+from aiortc.codecs.opus import OpusEncoder, SAMPLES_PER_FRAME, SAMPLE_RATE
+
+TIME_BASE = fractions.Fraction(1, SAMPLE_RATE)
+
+
+@lru_cache(maxsize=1)
+def silent_opus_payload() -> bytes:
+    """One 20ms Opus packet of digital silence, encoded once per process."""
+    encoder = OpusEncoder()
+    frame = AudioFrame.from_ndarray(np.zeros((1, SAMPLES_PER_FRAME), dtype=np.int16), format="s16", layout="mono")
+    frame.sample_rate = SAMPLE_RATE
+    frame.pts = 0
+    frame.time_base = TIME_BASE
+    payloads, _ = encoder.encode(frame)
+    return payloads[0]
+
+
+def make_packet(payload: bytes, pts: int) -> Packet:
+    """Wrap a pre-encoded Opus payload so aiortc packs it with RTP timestamp `pts`."""
+    packet = Packet(payload)
+    packet.pts = pts
+    packet.time_base = TIME_BASE
+    return packet
+
+
+class OpusStreamEncoder:
+    """
+    Encodes 48kHz mono int16 PCM arriving in blocks of any size into 20ms Opus
+    packets, one per frame. Samples short of a whole frame are held for the
+    next block; flush() zero-pads them. The encoder only ever sees a
+    contiguous timeline, so its output never depends on caller timestamps.
+    """
+
+    def __init__(self):
+        self._encoder = OpusEncoder()
+        self._pending = np.zeros(0, dtype=np.int16)
+        self._pts = 0
+
+    def encode(self, pcm: np.ndarray) -> tuple[list[bytes], np.ndarray]:
+        """Returns the packets for every whole frame available and the PCM they cover."""
+        pcm = np.concatenate([self._pending, pcm]) if len(self._pending) else pcm
+        whole = len(pcm) - len(pcm) % SAMPLES_PER_FRAME
+        self._pending = pcm[whole:].copy()
+        covered = pcm[:whole]
+
+        packets = []
+        for start in range(0, whole, SAMPLES_PER_FRAME):
+            frame = AudioFrame.from_ndarray(
+                covered[start:start + SAMPLES_PER_FRAME].reshape(1, -1),
+                format="s16",
+                layout="mono",
+            )
+            frame.sample_rate = SAMPLE_RATE
+            frame.pts = self._pts
+            frame.time_base = TIME_BASE
+            self._pts += SAMPLES_PER_FRAME
+            payloads, _ = self._encoder.encode(frame)
+            # One packet per frame; the first call may still be buffering
+            packets.append(payloads[0] if payloads else silent_opus_payload())
+        return packets, covered
+
+    def flush(self) -> tuple[list[bytes], np.ndarray]:
+        """Encode the held-back samples as a final zero-padded frame."""
+        if not len(self._pending):
+            return [], np.zeros(0, dtype=np.int16)
+        padded = np.zeros(SAMPLES_PER_FRAME, dtype=np.int16)
+        padded[:len(self._pending)] = self._pending
+        self._pending = np.zeros(0, dtype=np.int16)
+        return self.encode(padded)
+
+
+def encode_opus(pcm: np.ndarray) -> list[bytes]:
+    """
+    Encode 48kHz mono int16 PCM into 20ms Opus packets, one per frame
+    (the last frame is zero-padded).
+    """
+    encoder = OpusStreamEncoder()
+    packets, _ = encoder.encode(pcm)
+    tail, _ = encoder.flush()
+    return packets + tail
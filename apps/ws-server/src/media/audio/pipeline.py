@@ -1,12 +1,14 @@
 """Audio pipeline: VAD + buffering + speech segmentation. Feeds agent.on_user_speech."""
 
 import webrtcvad
-from src.core.helper import get_vad_result, send_over_ws
+from src.core.helper import get_vad_result
 from src.constant import (
+    FRAME_SIZE,
     MAX_SPEECH_DURATION,
     MIN_SPEECH_DURATION,
     MIN_SPEECH_FRAMES,
     SILENCE_THRESHOLD,
+    SPECULATIVE_SILENCE_FRAMES,
 )
 
 
@@ -15,6 +17,19 @@ class AudioPipeline:
         self.session = session
         self.vad = webrtcvad.Vad(2)
 
+    async def ingest(self, pcm_16k):
+        """
+        Feed 16kHz mono int16 PCM of any length (a WebRTC frame after
+        resampling, a WebSocket audio message, ...); it is processed in
+        FRAME_SIZE chunks and the remainder kept for the next call.
+        """
+        buffer = self.session.state.audio_buffer
+        buffer.add(pcm_16k)
+        while len(buffer.buffer) >= FRAME_SIZE:
+            chunk = buffer.buffer[:FRAME_SIZE]
+            buffer.buffer = buffer.buffer[FRAME_SIZE:]
+            await self.process_chunk(chunk)
+
     async def process_chunk(self, chunk):
         """
         Process one FRAME_SIZE chunk of 16kHz PCM. Updates session.state and
@@ -22,32 +37,42 @@ class AudioPipeline:
         """
         state = self.session.state
         vad_result = get_vad_result(chunk, self.vad)
+        paused = state.is_speaking and state.silence_frames >= SPECULATIVE_SILENCE_FRAMES
 
         if vad_result:
             state.speech_frame_count += 1
             state.silence_frames = 0
+            if paused:
+                await self.session.agent.on_speech_resumed()
         else:
             if state.is_speaking:
                 state.silence_frames += 1
+                if state.silence_frames == SPECULATIVE_SILENCE_FRAMES:
+                    # Likely end of turn: lets the agent start on a reply early
+                    await self.session.agent.on_speech_paused(state.speech_buffer)
             state.speech_frame_count = max(0, state.speech_frame_count - 1)
 
         should_record = state.speech_frame_count >= MIN_SPEECH_FRAMES
 
         if should_record:
             if not state.is_speaking:
-                # Only treat as "user started" when no TTS is queued (avoid echo/noise cutting off opening)
-                tts_has_audio = self.session.tts_track and self.session.tts_track.get_queue_size() > 0
+                # Only treat as "user started" when no TTS is queued (avoid echo/noise cutting off opening).
+                # A backchannel filler doesn't count: the candidate may talk over it, and it is cut.
+                tts_track = self.session.tts_track
+                playing_filler = tts_track and tts_track.is_playing_filler()
+                tts_has_audio = tts_track and tts_track.get_queue_size() > 0 and not playing_filler
                 if state.speech_frame_count >= MIN_SPEECH_DURATION and not tts_has_audio:
                     print("[CHECKPOINT] user_started_speaking")
                     state.is_speaking = True
                     state.speech_buffer = []
                     state.total_speech_frames = 0
-                    if self.session.tts_track and self.session.tts_track.get_queue_size() > 0:
+                    await self.session.agent.on_speech_started()
+                    if tts_track and tts_track.get_queue_size() > 0 and not playing_filler:
                         print("[CHECKPOINT] tts_interrupted")
-                        self.session.tts_track.clear_queue()
+                        tts_track.clear_queue()
                     # Notify frontend so mic UI stays in sync (user is speaking)
                     if self.session.ws:
-                        await send_over_ws(self.session.ws, {
+                        self.session.post({
                             "type": "user_speaking",
                             "speaking": True,
                         })
@@ -59,7 +84,7 @@ class AudioPipeline:
                     print("⏱️  Max duration, processing")
                     # Mute mic first so frontend turns off mic immediately
                     if self.session.ws:
-                        await send_over_ws(self.session.ws, {
+                        self.session.post({
                             "type": "user_speaking",
                             "speaking": False,
                         })
@@ -73,7 +98,7 @@ class AudioPipeline:
                     print("[CHECKPOINT] user_stopped_speaking")
                     # Notify frontend first so mic turns off smoothly (user stopped)
                     if self.session.ws:
-                        await send_over_ws(self.session.ws, {
+                        self.session.post({
                             "type": "user_speaking",
                             "speaking": False,
                         })
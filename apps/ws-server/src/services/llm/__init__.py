@@ -0,0 +1,35 @@
+import os
+from typing import Optional
+
+from src.services.llm.base import LLMBackend
+from src.services.llm.gateway import LLMGateway
+
+__all__ = ["LLMBackend", "LLMGateway", "create_backend", "llm_gateway"]
+
+
+def create_backend(name: Optional[str]) -> LLMBackend:
+    """
+    Build a backend by name: "azure" (default), "local" (offline stand-in),
+    "record" (azure, recording to LLM_RECORDINGS_DIR) or "replay" (serve recordings).
+    """
+    name = (name or "azure").strip().lower()
+    recordings = os.getenv("LLM_RECORDINGS_DIR", ".cache/llm")
+    # Imported lazily so offline backends run without Azure credentials
+    if name == "azure":
+        from src.services.llm.azure import AzureLLMBackend
+        return AzureLLMBackend()
+    if name == "local":
+        from src.services.llm.local import LocalLLMBackend
+        return LocalLLMBackend()
+    if name == "record":
+        from src.services.llm.azure import AzureLLMBackend
+        from src.services.llm.replay import RecordingLLMBackend
+        return RecordingLLMBackend(AzureLLMBackend(), recordings)
+    if name == "replay":
+        from src.services.llm.replay import ReplayLLMBackend
+        return ReplayLLMBackend(recordings)
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+# Global LLM gateway
+llm_gateway = LLMGateway(create_backend(os.getenv("LLM_BACKEND")))
@@ -0,0 +1,53 @@
+"""Azure OpenAI backend over an explicitly sized, long keep-alive httpx pool."""
+
+import asyncio
+import os
+
+import httpx
+from openai import AsyncAzureOpenAI
+
+from src.services.llm.base import LLMBackend
+
+
+class AzureLLMBackend(LLMBackend):
+    name = "azure"
+
+    def __init__(self):
+        self.endpoint = os.getenv("OPENAI_URL", "")
+        self.model = os.getenv("OPENAI_MODEL", "")
+        self.prewarm_connections = int(os.getenv("LLM_PREWARM_CONNECTIONS", "2"))
+
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "64")),
+                max_keepalive_connections=int(os.getenv("LLM_MAX_KEEPALIVE", "16")),
+                keepalive_expiry=float(os.getenv("LLM_KEEPALIVE_SEC", "120")),
+            ),
+            timeout=httpx.Timeout(float(os.getenv("LLM_TIMEOUT_SEC", "20")), connect=5.0),
+        )
+        self.client = AsyncAzureOpenAI(
+            api_version=os.getenv("OPENAI_API_VERSION", ""),
+            api_key=os.getenv("OPENAI_API_KEY", ""),
+            azure_endpoint=self.endpoint,
+            http_client=self._http,
+            max_retries=0,  # retries and hedging are handled by the gateway, within the deadline
+        )
+
+    async def create(self, messages: list, stream: bool, timeout: float, **params):
+        return await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=stream,
+            timeout=timeout,
+            **params,
+        )
+
+    async def prewarm(self) -> int:
+        """DNS + TCP + TLS for a few pooled connections."""
+        if not self.endpoint or self.prewarm_connections <= 0:
+            return 0
+        results = await asyncio.gather(
+            *(self._http.get(self.endpoint) for _ in range(self.prewarm_connections)),
+            return_exceptions=True,
+        )
+        return sum(1 for r in results if not isinstance(r, Exception))
@@ -0,0 +1,37 @@
+"""LLM backend interface. LLMGateway owns deadlines, concurrency, retries and metrics; backends only call a model."""
+
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator
+
+
+class LLMBackend(ABC):
+    name = "base"
+
+    @abstractmethod
+    async def create(self, messages: list, stream: bool, timeout: float, **params) -> Any:
+        """
+        Chat completion, shaped like the OpenAI SDK's: a ChatCompletion, or with
+        stream=True an async iterator of ChatCompletionChunk that has close().
+        Raises on failure; `timeout` is the time left before the caller gives up.
+        """
+        ...
+
+    async def prewarm(self) -> int:
+        """Open connections ahead of the first request. Returns how many were opened."""
+        return 0
+
+
+class ChunkStream:
+    """Async iterator of chunks with the close() the OpenAI SDK's AsyncStream has."""
+
+    def __init__(self, chunks: AsyncIterator[Any]):
+        self._chunks = chunks
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self._chunks.__anext__()
+
+    async def close(self):
+        await self._chunks.aclose()
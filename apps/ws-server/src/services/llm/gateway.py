@@ -0,0 +1,267 @@
+"""
+LLM gateway: every chat completion in the process goes through here.
+
+Wraps an LLMBackend (Azure OpenAI by default, see create_backend) with
+connection prewarming at startup, a process-wide concurrency limit with
+queueing metrics, per-call deadlines, one retry on transient errors and a
+hedged second request once the first runs past a latency percentile.
+
+Latency is tracked per call kind (a one-line summary and a question plan
+have very different tails), and background calls pass hedge=False so they
+never spend a second request.
+"""
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+import openai
+from dotenv import load_dotenv
+
+from src.core import metrics
+from src.services.llm.base import LLMBackend
+
+load_dotenv()
+
+# Errors worth a second attempt; anything else (bad request, auth) fails fast
+RETRYABLE_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+class LLMGateway:
+    def __init__(self, backend: LLMBackend):
+        self.backend = backend
+
+        # Latency policy (env-tunable)
+        self.timeout = float(os.getenv("LLM_TIMEOUT_SEC", "20"))
+        self.first_chunk_timeout = float(os.getenv("LLM_FIRST_CHUNK_TIMEOUT_SEC", "8"))
+        self.max_concurrency = max(1, int(os.getenv("LLM_MAX_CONCURRENCY", "32")))
+        self.max_attempts = max(1, int(os.getenv("LLM_MAX_ATTEMPTS", "2")))
+        # Percentile of recent latency after which a hedged request is sent (0 disables)
+        self.hedge_percentile = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+        self.hedge_min_samples = 20
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self._latency = metrics.histogram("llm.latency_sec")
+        self._first_chunk = metrics.histogram("llm.first_chunk_sec")
+        self._queue_wait = metrics.histogram("llm.queue_wait_sec")
+        self._requests = metrics.counter("llm.requests")
+        self._errors = metrics.counter("llm.errors")
+        self._timeouts = metrics.counter("llm.timeouts")
+        self._retries = metrics.counter("llm.retries")
+        self._hedged_requests = metrics.counter("llm.hedged")
+        self._hedge_wins = metrics.counter("llm.hedge_wins")
+        self._in_flight = metrics.gauge("llm.in_flight")
+        self._queued = metrics.gauge("llm.queued")
+        print(f"🧠 LLM backend: {self.backend.name}")
+
+    async def prewarm(self):
+        """Open pooled connections (DNS + TCP + TLS) before the first turn needs them."""
+        start = time.perf_counter()
+        opened = await self.backend.prewarm()
+        if opened:
+            print(f"🔥 LLM connections prewarmed: {opened} in {time.perf_counter() - start:.2f}s")
+
+    async def complete(
+        self,
+        messages: list,
+        timeout: Optional[float] = None,
+        kind: str = "reply",
+        hedge: bool = True,
+        **params,
+    ) -> Any:
+        """
+        Chat completion within `timeout` seconds (default LLM_TIMEOUT_SEC).
+        Hedged on the latency of earlier calls of the same `kind` unless
+        hedge=False. Raises on failure.
+        """
+        timeout = timeout or self.timeout
+        latency = self._kind_latency(kind)
+        async with self._slot():
+            start = time.perf_counter()
+            deadline = start + timeout
+            try:
+                response = await asyncio.wait_for(
+                    self._hedged(
+                        lambda: self._create(messages, deadline, params),
+                        deadline,
+                        latency if hedge else None,
+                    ),
+                    timeout=timeout,
+                )
+            except Exception as e:
+                self._record_error(e)
+                raise
+            elapsed = time.perf_counter() - start
+            self._latency.observe(elapsed)
+            latency.observe(elapsed)
+            return response
+
+    async def stream(self, messages: list, timeout: Optional[float] = None, **params) -> AsyncIterator[Any]:
+        """
+        Streamed chat completion (interviewer replies). The first chunk must
+        arrive within LLM_FIRST_CHUNK_TIMEOUT_SEC (hedged on that latency),
+        the whole stream within `timeout`. Raises on failure.
+        """
+        timeout = timeout or self.timeout
+        async with self._slot():
+            start = time.perf_counter()
+            deadline = start + timeout
+            first_deadline = min(deadline, start + self.first_chunk_timeout)
+            try:
+                response, first = await asyncio.wait_for(
+                    self._hedged(
+                        lambda: self._open_stream(messages, deadline, params),
+                        first_deadline,
+                        self._first_chunk,
+                        discard=lambda opened: opened[0].close(),
+                    ),
+                    timeout=first_deadline - start,
+                )
+            except Exception as e:
+                self._record_error(e)
+                raise
+            self._first_chunk.observe(time.perf_counter() - start)
+
+            try:
+                yield first
+                while True:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError("LLM stream deadline exceeded")
+                    try:
+                        chunk = await asyncio.wait_for(response.__anext__(), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+                    yield chunk
+                self._latency.observe(time.perf_counter() - start)
+            except Exception as e:
+                self._record_error(e)
+                raise
+            finally:
+                await response.close()
+
+    # -------------------------
+    # Internals
+    # -------------------------
+
+    def _slot(self):
+        return _Slot(self)
+
+    def _record_error(self, error: BaseException):
+        self._errors.inc()
+        if isinstance(error, (asyncio.TimeoutError, openai.APITimeoutError)):
+            self._timeouts.inc()
+
+    async def _create(self, messages: list, deadline: float, params: dict, stream: bool = False):
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("LLM deadline exceeded before request was sent")
+        self._requests.inc()
+        return await self.backend.create(messages=messages, stream=stream, timeout=remaining, **params)
+
+    async def _open_stream(self, messages: list, deadline: float, params: dict):
+        """Start a stream and wait for its first chunk."""
+        response = await self._create(messages, deadline, params, stream=True)
+        try:
+            return response, await response.__anext__()
+        except BaseException:
+            await response.close()
+            raise
+
+    def _kind_latency(self, kind: str) -> metrics.Histogram:
+        return metrics.histogram(f"llm.latency_sec.{kind}")
+
+    def _hedge_delay(self, latency: Optional[metrics.Histogram]) -> Optional[float]:
+        """Latency after which a second request is worth sending, None if hedging is off."""
+        if latency is None or self.hedge_percentile <= 0 or len(latency) < self.hedge_min_samples:
+            return None
+        return latency.percentile(self.hedge_percentile)
+
+    async def _hedged(
+        self,
+        attempt: Callable[[], Awaitable[Any]],
+        deadline: float,
+        latency: Optional[metrics.Histogram],
+        discard: Optional[Callable[[Any], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Run attempt(); if it is still running at the hedge percentile, race a
+        second one (never when latency is None), and if it fails fast with a
+        transient error, retry it.
+        At most max_attempts requests are sent. `discard` cleans up a losing
+        result (e.g. closes a stream).
+        """
+        start = time.perf_counter()
+        delay = self._hedge_delay(latency)
+        first = asyncio.create_task(attempt())
+        pending = {first}
+        launched = 1
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                wait = None
+                if launched < self.max_attempts and delay is not None:
+                    wait = max(0.0, start + delay - time.perf_counter())
+                done, pending = await asyncio.wait(pending, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # First request is in the slow tail - race a second one
+                    self._hedged_requests.inc()
+                    launched += 1
+                    pending.add(asyncio.create_task(attempt()))
+                    continue
+                winners = [task for task in done if task.exception() is None]
+                if winners:
+                    if winners[0] is not first and launched > 1:
+                        self._hedge_wins.inc()
+                    for extra in winners[1:]:
+                        if discard:
+                            await discard(extra.result())
+                    return winners[0].result()
+                error = next(iter(done)).exception()
+                if (
+                    not pending
+                    and launched < self.max_attempts
+                    and isinstance(error, RETRYABLE_ERRORS)
+                    and deadline - time.perf_counter() > 0
+                ):
+                    self._retries.inc()
+                    launched += 1
+                    pending.add(asyncio.create_task(attempt()))
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+                if discard:
+                    task.add_done_callback(lambda t: _discard_late(t, discard))
+
+
+def _discard_late(task: asyncio.Task, discard: Callable[[Any], Awaitable[Any]]):
+    """A cancelled attempt may still have produced a result; release it."""
+    if not task.cancelled() and task.exception() is None:
+        asyncio.ensure_future(discard(task.result()))
+
+
+class _Slot:
+    """Concurrency slot: waits on the gateway semaphore and tracks queue depth."""
+
+    def __init__(self, gateway: LLMGateway):
+        self.gateway = gateway
+
+    async def __aenter__(self):
+        gateway = self.gateway
+        gateway._queued.inc()
+        start = time.perf_counter()
+        try:
+            await gateway._semaphore.acquire()
+        finally:
+            gateway._queued.dec()
+        gateway._queue_wait.observe(time.perf_counter() - start)
+        gateway._in_flight.inc()
+
+    async def __aexit__(self, *exc):
+        self.gateway._in_flight.dec()
+        self.gateway._semaphore.release()
@@ -0,0 +1,137 @@
+"""
+Local LLM stand-in: no credentials or network.
+
+Answers the same requests the interviewer sends (replies, history summaries,
+question plans) with plausible, deterministic text. A reply to a substantial
+answer acknowledges it and moves on with [NEXT]; a brief one gets a follow-up.
+Time to first token is lognormal and tokens stream at a fixed rate, so the
+turn loop can be load-tested and profiled offline.
+"""
+
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import time
+import zlib
+from typing import Optional
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from src.core.tokens import count_message_tokens, count_tokens
+from src.services.llm.base import ChunkStream, LLMBackend
+
+ACKNOWLEDGEMENTS = [
+    "Thanks, that's a clear explanation.",
+    "Great, I like how you framed the trade-offs there.",
+    "That makes sense, thanks for walking me through it.",
+    "Good point about the edge cases.",
+]
+FOLLOW_UPS = [
+    "Could you go a little deeper on how you'd handle failures there?",
+    "Can you give me a concrete example from a project you've worked on?",
+    "What would you change if the traffic grew ten times?",
+    "How would you test that approach?",
+]
+PLAN_TOPICS = [
+    "Walk me through how you would design {area} for a growing product.",
+    "Tell me about a hard problem you solved involving {area}.",
+    "How do you decide between competing approaches in {area}?",
+    "What does good testing look like for {area}?",
+    "How would you debug a production issue related to {area}?",
+]
+
+
+class LocalLLMBackend(LLMBackend):
+    name = "local"
+
+    def __init__(self):
+        self.ttft_ms = float(os.getenv("LOCAL_LLM_TTFT_MS", "400"))  # median
+        self.ttft_sigma = float(os.getenv("LOCAL_LLM_TTFT_SIGMA", "0.35"))  # lognormal spread
+        self.tokens_per_sec = float(os.getenv("LOCAL_LLM_TOKENS_PER_SEC", "50"))
+        self.advance_words = int(os.getenv("LOCAL_LLM_ADVANCE_WORDS", "20"))
+
+    async def create(self, messages: list, stream: bool, timeout: float, **params):
+        rng = random.Random(zlib.crc32(json.dumps(messages, sort_keys=True).encode()))
+        text = self.reply(messages, rng)
+        ttft = self.first_token_latency(rng)
+        if ttft > timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError("Local LLM latency exceeded deadline")
+
+        usage = {
+            "prompt_tokens": count_message_tokens(messages),
+            "completion_tokens": count_tokens(text),
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        if stream:
+            return ChunkStream(self._stream(text, ttft, usage, params))
+
+        await asyncio.sleep(ttft + count_tokens(text) / self.tokens_per_sec)
+        return ChatCompletion.model_validate({
+            "id": "local", "object": "chat.completion", "created": int(time.time()), "model": self.name,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage,
+        })
+
+    def first_token_latency(self, rng: random.Random) -> float:
+        return self.ttft_ms * math.exp(rng.gauss(0, self.ttft_sigma)) / 1000
+
+    async def _stream(self, text: str, ttft: float, usage: dict, params: dict):
+        await asyncio.sleep(ttft)
+        # BPE-sized pieces with their leading space, so markers split like real tokens
+        for piece in re.findall(r" ?\S{1,4}", text):
+            yield self._chunk([{"index": 0, "delta": {"content": piece}, "finish_reason": None}])
+            await asyncio.sleep(1 / self.tokens_per_sec)
+        if (params.get("stream_options") or {}).get("include_usage"):
+            yield self._chunk([], usage)
+
+    def _chunk(self, choices: list, usage: Optional[dict] = None) -> ChatCompletionChunk:
+        return ChatCompletionChunk.model_validate({
+            "id": "local", "object": "chat.completion.chunk", "created": int(time.time()), "model": self.name,
+            "choices": choices, "usage": usage,
+        })
+
+    # -------------------------
+    # Reply text
+    # -------------------------
+
+    def reply(self, messages: list, rng: random.Random) -> str:
+        system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+        last = messages[-1]["content"] if messages else ""
+        if system.startswith("Summarize"):
+            return self._summary(last)
+        if "JSON array" in last:
+            return self._question_plan(last, rng)
+        return self._interviewer_reply(messages, rng)
+
+    def _interviewer_reply(self, messages: list, rng: random.Random) -> str:
+        answer = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        if len(answer.split()) < self.advance_words:
+            return rng.choice(FOLLOW_UPS)
+
+        turn_context = messages[-1]["content"] if messages[-1]["role"] == "system" else ""
+        next_question = re.search(r"incorporate this next question: (.+)", turn_context)
+        if next_question:
+            follow = f"Let's move on. {next_question.group(1).strip()}"
+        elif "last question" in turn_context:
+            follow = "That was my last question. Thank you for your time, we'll be in touch about next steps."
+        else:
+            follow = "Let's move on. " + rng.choice(PLAN_TOPICS).format(area="the systems you've built")
+        return f"{rng.choice(ACKNOWLEDGEMENTS)} {follow} [NEXT]"
+
+    def _summary(self, transcript: str) -> str:
+        answers = [line.split(":", 1)[1].strip() for line in transcript.splitlines() if line.startswith("Candidate:")]
+        gist = " ".join(" ".join(answers).split()[:20])
+        return f"The candidate answered: {gist}..." if gist else "The candidate did not answer."
+
+    def _question_plan(self, prompt: str, rng: random.Random) -> str:
+        count = re.search(r"next (\d+) interview questions", prompt)
+        focus = re.search(r"Focus areas: (.+)", prompt)
+        areas = [a.strip() for a in focus.group(1).split(",")] if focus else ["software engineering"]
+        n = int(count.group(1)) if count else 5
+        questions = [rng.choice(PLAN_TOPICS).format(area=areas[i % len(areas)]) for i in range(n)]
+        return json.dumps(questions)
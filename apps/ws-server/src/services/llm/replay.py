@@ -0,0 +1,154 @@
+"""
+Record/replay LLM backends for reproducible load tests.
+
+RecordingLLMBackend wraps a real backend and writes every request with its
+response (and, for streams, each chunk's arrival time) to LLM_RECORDINGS_DIR.
+ReplayLLMBackend serves those recordings for matching requests, reproducing
+the recorded latency unless LLM_REPLAY_TIMING=0. Requests are matched with
+per-turn measurements (e.g. "User paused for 3.4s") masked out; a request
+that still has no recording gets the next unused one of the same kind (same
+system prompt, streaming or not) in recording order, so a replayed session
+follows the recorded one instead of failing the turn. A summary recording is
+never served for, say, a question plan: with none of the kind left the
+request fails.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from src.services.llm.base import ChunkStream, LLMBackend
+
+
+# Measured values (pause lengths, durations) differ on every run of the same script
+_VOLATILE = re.compile(r"\d+\.\d+")
+
+
+def request_key(messages: list, stream: bool, params: dict) -> str:
+    """Recordings are matched on the request (messages + sampling params) with measured values masked."""
+    messages = [{**m, "content": _VOLATILE.sub("#", m.get("content") or "")} for m in messages]
+    canonical = json.dumps({"messages": messages, "stream": stream, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+def request_kind(messages: list, stream: bool) -> str:
+    """What the request is for (interviewer turn, summary, question plan, ...): its leading system prompt."""
+    system = (messages[0].get("content") or "") if messages and messages[0].get("role") == "system" else ""
+    return f"{stream}:{_VOLATILE.sub('#', system)}"
+
+
+class RecordingLLMBackend(LLMBackend):
+    def __init__(self, inner: LLMBackend, directory: str):
+        self.inner = inner
+        self.name = f"{inner.name}+record"
+        self.directory = Path(directory)
+
+    async def prewarm(self) -> int:
+        return await self.inner.prewarm()
+
+    async def create(self, messages: list, stream: bool, timeout: float, **params):
+        key = request_key(messages, stream, params)
+        start = time.perf_counter()
+        response = await self.inner.create(messages, stream=stream, timeout=timeout, **params)
+        record = {
+            "request": {"messages": messages, "stream": stream, "params": params},
+            "recorded_at": time.time(),
+        }
+        if not stream:
+            record["latency"] = time.perf_counter() - start
+            record["response"] = response.model_dump(exclude_none=True)
+            await asyncio.to_thread(self._write, key, record)
+            return response
+        return ChunkStream(self._record_stream(key, record, response, start))
+
+    async def _record_stream(self, key: str, record: dict, response, start: float):
+        chunks = []
+        try:
+            async for chunk in response:
+                chunks.append({"at": time.perf_counter() - start, "chunk": chunk.model_dump(exclude_none=True)})
+                yield chunk
+        finally:
+            await response.close()
+        # Only complete streams are worth replaying
+        record["chunks"] = chunks
+        await asyncio.to_thread(self._write, key, record)
+
+    def _write(self, key: str, record: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f"{key}.json.tmp"
+        tmp.write_text(json.dumps(record, default=str))
+        os.replace(tmp, self.directory / f"{key}.json")
+
+
+class ReplayLLMBackend(LLMBackend):
+    name = "replay"
+
+    def __init__(self, directory: str, timing: Optional[bool] = None):
+        self.directory = Path(directory)
+        self.timing = timing if timing is not None else os.getenv("LLM_REPLAY_TIMING", "1") != "0"
+        self._records: Dict[str, dict] = {}
+        self._order: Optional[List[str]] = None  # keys in recording order, for the fallback
+        self._used: Set[str] = set()
+
+    async def create(self, messages: list, stream: bool, timeout: float, **params):
+        key = request_key(messages, stream, params)
+        record = self._records.get(key)
+        if record is None:
+            try:
+                record = await asyncio.to_thread(self._read, key)
+            except LookupError:
+                key, record = await asyncio.to_thread(self._next_unused, request_kind(messages, stream))
+                print(f"⚠️  No exact LLM recording for this request, replaying {key} (next in order)")
+            self._records[key] = record
+        self._used.add(key)
+
+        if not stream:
+            await self._wait(record["latency"], timeout)
+            return ChatCompletion.model_validate(record["response"])
+        if record["chunks"]:
+            await self._wait(record["chunks"][0]["at"], timeout)
+        return ChunkStream(self._replay_stream(record["chunks"]))
+
+    async def _replay_stream(self, chunks: list):
+        start = time.perf_counter() - (chunks[0]["at"] if chunks else 0)
+        for item in chunks:
+            if self.timing:
+                await asyncio.sleep(max(0.0, item["at"] - (time.perf_counter() - start)))
+            yield ChatCompletionChunk.model_validate(item["chunk"])
+
+    async def _wait(self, latency: float, timeout: float):
+        if not self.timing:
+            return
+        if latency > timeout:
+            await asyncio.sleep(timeout)
+            raise asyncio.TimeoutError("Recorded LLM latency exceeded deadline")
+        await asyncio.sleep(latency)
+
+    def _read(self, key: str) -> dict:
+        path = self.directory / f"{key}.json"
+        if not path.exists():
+            raise LookupError(f"No LLM recording for request {key} in {self.directory}")
+        return json.loads(path.read_text())
+
+    def _next_unused(self, kind: str):
+        """(key, record) of the oldest recording of this request_kind() not replayed yet."""
+        if self._order is None:
+            recorded = []
+            for path in self.directory.glob("*.json"):
+                record = json.loads(path.read_text())
+                recorded.append((record.get("recorded_at", path.stat().st_mtime), path.stem, record))
+            recorded.sort(key=lambda item: item[0])
+            self._order = [key for _, key, _ in recorded]
+            self._records.update({key: record for _, key, record in recorded})
+        for key in self._order:
+            request = self._records[key]["request"]
+            if key not in self._used and request_kind(request["messages"], request["stream"]) == kind:
+                return key, self._records[key]
+        raise LookupError(f"No unused LLM recording of this kind of request left in {self.directory}")
@@ -1,5 +1,10 @@
 from src.services.redis.client import RedisClient
+from src.services.redis.async_client import AsyncRedisClient
+from src.services.redis.outbox import EventOutbox
 
-redis_client = RedisClient.get_instance()
+# The server uses async_redis_client. Scripts that want the sync client call
+# RedisClient.get_instance(), which connects on first use, not at import
+async_redis_client = AsyncRedisClient.get_instance()
+event_outbox = EventOutbox(async_redis_client)
 
-__all__ = ["RedisClient", "redis_client"]
+__all__ = ["RedisClient", "AsyncRedisClient", "async_redis_client", "EventOutbox", "event_outbox"]
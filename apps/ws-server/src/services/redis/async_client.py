@@ -0,0 +1,71 @@
+import logging
+import os
+from typing import List, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRedisClient:
+    """
+    asyncio counterpart of RedisClient for the server: commands run on a
+    shared connection pool without blocking the event loop, so a slow Redis
+    delays only the coroutine waiting on it. Connects lazily on first use.
+    Writes go through the event outbox (outbox.py), which pipelines them.
+    """
+
+    _instance: Optional["AsyncRedisClient"] = None
+
+    def __init__(self):
+        self.pool = aioredis.ConnectionPool(
+            host=os.getenv('REDIS_HOST') or 'localhost',
+            port=int(os.getenv('REDIS_PORT') or 6379),
+            password=os.getenv('REDIS_PASSWORD'),
+            decode_responses=True,
+            socket_connect_timeout=5,
+            socket_timeout=5,
+            retry_on_timeout=True,
+            max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', '64')),
+        )
+        self.redis = aioredis.Redis(connection_pool=self.pool)
+
+    @classmethod
+    def get_instance(cls) -> "AsyncRedisClient":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    # -------------------------
+    # Redis operations
+    # -------------------------
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self.redis.get(key)
+
+    async def set(self, key: str, value: str, ttl_seconds: int):
+        await self.redis.setex(key, ttl_seconds, value)
+
+    async def delete(self, key: str):
+        await self.redis.delete(key)
+
+    # -------------------------
+    # List operations
+    # -------------------------
+
+    async def get_list_range(self, key: str, start: int, stop: int) -> List[str]:
+        """LRANGE key start stop (stop inclusive)."""
+        return await self.redis.lrange(key, start, stop)
+
+    # -------------------------
+    # Shutdown
+    # -------------------------
+
+    async def close(self):
+        try:
+            await self.redis.aclose()
+            await self.pool.disconnect()
+            logger.info("Async Redis connection pool closed")
+        except redis.RedisError as e:
+            logger.error("Error closing async Redis pool", exc_info=e)
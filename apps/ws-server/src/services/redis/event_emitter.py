@@ -1,15 +1,37 @@
 """
 Emit interview events to Redis stream for Node.js worker to consume.
 Stream key: interview_events (must match Node worker)
+
+Schema v2: a session's conversation is appended once, message by message, to
+the list interview-messages-{sessionId} (list index = message seq). Events
+reference it as {"key", "from", "to"} (a [from, to) seq range) instead of
+embedding the whole history, so each event stays small however long the
+interview runs. Payloads of at least EVENT_COMPRESS_MIN_BYTES are sent
+zlib-compressed (enc=zlib+base64); 0 disables compression.
+
+emit_* only enqueue: list appends and events go through the event outbox
+(services/redis/outbox.py), which flushes them in order off the turn path and
+spools them to disk while Redis is down.
 """
+import base64
 import json
 import logging
+import os
+import time
+import zlib
 from typing import Any, Dict, List, Optional
 
-from src.services.redis import redis_client
+from src.services.redis import event_outbox
 
 logger = logging.getLogger(__name__)
 STREAM_KEY = "interview_events"
+EVENT_SCHEMA_VERSION = 2
+MESSAGES_TTL_SEC = int(os.getenv("INTERVIEW_MESSAGES_TTL_SEC", str(7 * 24 * 3600)))
+EVENT_COMPRESS_MIN_BYTES = int(os.getenv("EVENT_COMPRESS_MIN_BYTES", "0"))
+
+
+def messages_key(session_id) -> str:
+    return f"interview-messages-{session_id}"
 
 
 def _get_session_context(session) -> Dict[str, Any]:
@@ -25,35 +47,72 @@ def _get_session_context(session) -> Dict[str, Any]:
     }
 
 
-def emit_start_interview(session) -> Optional[str]:
+def append_messages(session, conversation_history: Optional[List[Dict]]) -> int:
+    """
+    Queue the messages not sent yet for the session's message list; returns
+    how many the list holds. session.messages_emitted is the cursor, and the
+    outbox keeps the append ahead of anything queued after it.
+    """
+    history = conversation_history or []
+    start, end = session.messages_emitted, len(history)
+    if end > start:
+        values = [
+            json.dumps({"seq": seq, "role": m["role"], "content": m["content"], "timestamp": m.get("timestamp")})
+            for seq, m in enumerate(history[start:end], start)
+        ]
+        event_outbox.rpush(messages_key(session.session_id), values, MESSAGES_TTL_SEC, start=start)
+        session.messages_emitted = end
+    return session.messages_emitted
+
+
+def _history_ref(session, conversation_history: Optional[List[Dict]]) -> Dict[str, Any]:
+    """Append new messages and return a reference to the whole history."""
+    return {"key": messages_key(session.session_id), "from": 0, "to": append_messages(session, conversation_history)}
+
+
+def _encode_event(event_type: str, payload: Dict[str, Any]) -> Dict[str, str]:
+    data = json.dumps(payload, default=str)
+    fields = {"event": event_type, "v": str(EVENT_SCHEMA_VERSION), "ts": str(time.time())}
+    if EVENT_COMPRESS_MIN_BYTES and len(data) >= EVENT_COMPRESS_MIN_BYTES:
+        fields["enc"] = "zlib+base64"
+        data = base64.b64encode(zlib.compress(data.encode())).decode()
+    fields["payload"] = data
+    return fields
+
+
+def _emit(event_type: str, payload: Dict[str, Any]):
+    event_outbox.xadd(STREAM_KEY, _encode_event(event_type, payload))
+
+
+def emit_start_interview(session) -> None:
     """Emit when user verified and session loaded."""
     ctx = _get_session_context(session)
     if not ctx.get("sessionId"):
         logger.warning("Cannot emit start_interview: missing sessionId")
-        return None
-    return redis_client.xadd_event(STREAM_KEY, "start_interview", ctx)
+        return
+    _emit("start_interview", ctx)
 
 
-def emit_end_interview(session, conversation_history: List[Dict] = None) -> Optional[str]:
+def emit_end_interview(session, conversation_history: List[Dict] = None) -> None:
     """Emit when interview completes successfully."""
     ctx = _get_session_context(session)
     if not ctx.get("sessionId"):
-        return None
-    payload = {**ctx, "conversationHistory": conversation_history or []}
-    return redis_client.xadd_event(STREAM_KEY, "end_interview", payload)
+        return
+    payload = {**ctx, "history": _history_ref(session, conversation_history)}
+    _emit("end_interview", payload)
 
 
-def emit_abandon_interview(session, reason: str, conversation_history: List[Dict] = None) -> Optional[str]:
+def emit_abandon_interview(session, reason: str, conversation_history: List[Dict] = None) -> None:
     """Emit when interview is closed/abandoned (user clicked close, unexpected disconnect)."""
     ctx = _get_session_context(session)
     if not ctx.get("sessionId"):
-        return None
+        return
     payload = {
         **ctx,
         "reason": reason or "unknown",
-        "conversationHistory": conversation_history or [],
+        "history": _history_ref(session, conversation_history),
     }
-    return redis_client.xadd_event(STREAM_KEY, "abandon_interview", payload)
+    _emit("abandon_interview", payload)
 
 
 def emit_question_evaluate(
@@ -72,11 +131,11 @@ def emit_question_evaluate(
     interview_question_id: Optional[int] = None,
     category: Optional[str] = None,
     difficulty: Optional[str] = None,
-) -> Optional[str]:
+) -> None:
     """Emit when a question is evaluated (user answered, we advanced to next)."""
     ctx = _get_session_context(session)
     if not ctx.get("sessionId"):
-        return None
+        return
     payload = {
         **ctx,
         "questionNumber": question_number,
@@ -88,23 +147,23 @@ def emit_question_evaluate(
         "answerEndedAt": answer_ended_at,
         "thinkingTime": thinking_time_sec,
         "answerDuration": answer_duration_sec,
-        "conversationHistory": conversation_history,
+        "history": _history_ref(session, conversation_history),
         "metrics": metrics or {},
         "interviewQuestionId": interview_question_id,
         "category": category,
         "difficulty": difficulty,
     }
-    return redis_client.xadd_event(STREAM_KEY, "question_evaluate", payload)
+    _emit("question_evaluate", payload)
 
 
-def emit_generate_report(session, conversation_history: List[Dict], full_payload: Dict = None) -> Optional[str]:
+def emit_generate_report(session, conversation_history: List[Dict], full_payload: Dict = None) -> None:
     """Emit at successful end - worker generates detailed report and stores."""
     ctx = _get_session_context(session)
     if not ctx.get("sessionId"):
-        return None
+        return
     payload = {
         **ctx,
-        "conversationHistory": conversation_history or [],
+        "history": _history_ref(session, conversation_history),
         **(full_payload or {}),
     }
-    return redis_client.xadd_event(STREAM_KEY, "generate_report", payload)
+    _emit("generate_report", payload)
@@ -0,0 +1,323 @@
+"""
+Event outbox: emit_* enqueue Redis writes here instead of awaiting them, and a
+background task flushes them in order, in batches, over one pipeline.
+
+When Redis is unreachable the unsent entries are appended to a local spool
+file (one JSON entry per line, one file per process) and replayed in order
+before anything newer once Redis answers again, so events survive an outage
+or a restart. A spool left by a process that died is adopted on start.
+
+A batch that fails midway is resent whole. Message list appends carry the
+index they start at and are skipped when the list already holds them, so a
+resend never duplicates transcript entries (history refs and checkpoints
+count on those indices); stream events are at-least-once. An entry Redis
+rejects (WRONGTYPE, a gap in a message list, ...) would fail on every retry:
+it is written to a dead-letter file next to the spool instead.
+"""
+import asyncio
+import glob
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+import redis
+
+from src.core import metrics
+from src.services.redis.async_client import AsyncRedisClient
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = int(os.getenv("EVENT_OUTBOX_BATCH_SIZE", "100"))
+OUTBOX_FLUSH_INTERVAL_SEC = float(os.getenv("EVENT_OUTBOX_FLUSH_INTERVAL_SEC", "0.05"))
+OUTBOX_RETRY_SEC = float(os.getenv("EVENT_OUTBOX_RETRY_SEC", "2"))
+SPOOL_DIR = os.getenv("EVENT_SPOOL_DIR") or tempfile.gettempdir()
+SPOOL_PATH = os.path.join(SPOOL_DIR, f"interview-events-{os.getpid()}.spool")
+
+# RPUSH of ARGV[3..] only if the list holds exactly ARGV[2] (start) entries:
+# fewer means an earlier append was lost, more means this one already landed
+_APPEND_AT = """
+local n = redis.call('LLEN', KEYS[1])
+local start = tonumber(ARGV[2])
+if n > start then return 0 end
+if n < start then return redis.error_reply('OUTBOX_GAP list holds ' .. n .. ' entries, append starts at ' .. start) end
+redis.call('RPUSH', KEYS[1], unpack(ARGV, 3))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return #ARGV - 2
+"""
+
+# SETEX unless the stored value is a JSON document with a newer "epoch"
+# (ARGV[3]): a stale writer never overwrites its successor's state
+_SET_UNLESS_NEWER = """
+local cur = redis.call('GET', KEYS[1])
+if cur then
+  local ok, doc = pcall(cjson.decode, cur)
+  if ok and type(doc) == 'table' and tonumber(doc.epoch) and tonumber(doc.epoch) > tonumber(ARGV[3]) then
+    return 0
+  end
+end
+redis.call('SETEX', KEYS[1], ARGV[1], ARGV[2])
+return 1
+"""
+
+
+class EventOutbox:
+    """
+    Ordered queue of Redis writes. Entries are plain dicts so they can be
+    spooled as-is:
+      {"op": "xadd", "key": stream, "fields": {...}, "max_len": n}
+      {"op": "rpush", "key": list_key, "values": [...], "ttl": seconds, "start": index}
+      {"op": "set", "key": key, "value": str, "ttl": seconds, "epoch": n}
+    """
+
+    def __init__(self, client: AsyncRedisClient, spool_path: str = SPOOL_PATH,
+                 batch_size: int = OUTBOX_BATCH_SIZE):
+        self.client = client
+        self.spool_path = spool_path
+        self.dead_letter_path = spool_path + ".dead"
+        self.batch_size = batch_size
+        self._queue: deque = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._spooled = os.path.exists(spool_path) and os.path.getsize(spool_path) > 0
+        self._depth = metrics.gauge("redis.outbox.depth")
+        self._flush_latency = metrics.histogram("redis.outbox.flush_sec")
+        self._sent = metrics.counter("redis.outbox.sent")
+        self._spool_writes = metrics.counter("redis.outbox.spooled")
+        self._flush_errors = metrics.counter("redis.outbox.flush_errors")
+        self._dead_lettered = metrics.counter("redis.outbox.dead_lettered")
+
+    # -------------------------
+    # Enqueue (O(1), never blocks)
+    # -------------------------
+
+    def xadd(self, stream_key: str, fields: Dict[str, str], max_len: Optional[int] = 10000):
+        self._put({"op": "xadd", "key": stream_key, "fields": fields, "max_len": max_len})
+
+    def rpush(self, key: str, values: List[str], ttl_seconds: int, start: Optional[int] = None):
+        """Append to a list; with `start` (the list length before it) a resend is a no-op."""
+        self._put({"op": "rpush", "key": key, "values": values, "ttl": ttl_seconds, "start": start})
+
+    def set(self, key: str, value: str, ttl_seconds: int, epoch: Optional[int] = None):
+        """SETEX; with `epoch`, skipped if the stored JSON value has a newer "epoch"."""
+        self._put({"op": "set", "key": key, "value": value, "ttl": ttl_seconds, "epoch": epoch})
+
+    def _put(self, entry: dict):
+        self._queue.append(entry)
+        self._depth.set(len(self._queue))
+        self._ensure_running()
+        self._wakeup.set()
+
+    def __len__(self):
+        return len(self._queue)
+
+    # -------------------------
+    # Background flush
+    # -------------------------
+
+    def start(self):
+        """Start the flusher; a spool left by a previous run is replayed right away."""
+        self._adopt_orphan_spools()
+        self._ensure_running()
+        if self._spooled:
+            self._wakeup.set()
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            # Let the rest of the turn's emits land so they share a pipeline
+            await asyncio.sleep(OUTBOX_FLUSH_INTERVAL_SEC)
+            while not await self.flush():
+                await asyncio.sleep(OUTBOX_RETRY_SEC)
+
+    async def flush(self) -> bool:
+        """Send the spool backlog, then the queue. False if Redis is unreachable (queue spooled)."""
+        if self._spooled and not await self._replay_spool():
+            await self._spool_queue()
+            return False
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            try:
+                sent = await self._send(batch)
+            except asyncio.CancelledError:
+                self._queue.extendleft(reversed(batch))
+                raise
+            if not sent:
+                self._queue.extendleft(reversed(batch))
+                await self._spool_queue()
+                return False
+            self._depth.set(len(self._queue))
+        return True
+
+    async def _send(self, batch: List[dict]) -> bool:
+        """
+        Write a batch over one pipeline. False if Redis is unreachable (resend
+        it all later); entries Redis rejected are dead-lettered, not retried.
+        """
+        started = time.perf_counter()
+        try:
+            async with self.client.redis.pipeline(transaction=False) as pipe:
+                commands = [_pipe_entry(pipe, entry) for entry in batch]
+                results = await pipe.execute(raise_on_error=False)
+        except (redis.RedisError, OSError) as e:
+            self._flush_errors.inc()
+            logger.warning("Event outbox flush failed (%d entries): %s", len(batch), e)
+            return False
+
+        rejected = []
+        pos = 0
+        for entry, count in zip(batch, commands):
+            errors = [r for r in results[pos:pos + count] if isinstance(r, Exception)]
+            pos += count
+            if any(not isinstance(e, redis.ResponseError) for e in errors):
+                self._flush_errors.inc()
+                logger.warning("Event outbox flush failed (%d entries): %s", len(batch), errors[0])
+                return False
+            if errors:
+                rejected.append((entry, errors[0]))
+        if rejected:
+            await asyncio.to_thread(self._append_dead_letters, rejected)
+            self._dead_lettered.inc(len(rejected))
+            logger.error("Redis rejected %d outbox entries (first: %s), written to %s",
+                         len(rejected), rejected[0][1], self.dead_letter_path)
+        self._flush_latency.observe(time.perf_counter() - started)
+        self._sent.inc(len(batch) - len(rejected))
+        return True
+
+    # -------------------------
+    # Spool
+    # -------------------------
+
+    async def _spool_queue(self):
+        if not self._queue:
+            return
+        entries = list(self._queue)
+        self._queue.clear()
+        self._depth.set(0)
+        await asyncio.to_thread(self._append_spool, entries)
+        self._spooled = True
+        self._spool_writes.inc(len(entries))
+        logger.warning("Redis unreachable: spooled %d events to %s", len(entries), self.spool_path)
+
+    def _append_spool(self, entries: List[dict]):
+        with open(self.spool_path, "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_spool(self, path: Optional[str] = None) -> List[dict]:
+        with open(path or self.spool_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _append_dead_letters(self, rejected: list):
+        with open(self.dead_letter_path, "a", encoding="utf-8") as f:
+            f.writelines(
+                json.dumps({"entry": entry, "error": str(error), "at": time.time()}) + "\n"
+                for entry, error in rejected
+            )
+
+    def _adopt_orphan_spools(self):
+        """Take over the spools of processes that died before replaying them."""
+        pattern = os.path.join(os.path.dirname(self.spool_path) or ".", "interview-events-*.spool")
+        for path in sorted(glob.glob(pattern)):
+            if path == self.spool_path or _process_alive(path):
+                continue
+            claimed = f"{path}.{os.getpid()}"
+            try:
+                os.rename(path, claimed)  # atomic: only one adopter wins
+            except OSError:
+                continue
+            try:
+                entries = self._read_spool(claimed)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Could not read orphan spool %s: %s", claimed, e)
+                continue
+            if entries:
+                self._append_spool(entries)
+                self._spooled = True
+                logger.info("Adopted %d spooled events from %s", len(entries), path)
+            os.remove(claimed)
+
+    def _rewrite_spool(self, entries: List[dict]):
+        tmp = self.spool_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.spool_path)
+
+    async def _replay_spool(self) -> bool:
+        """Resend spooled entries in order; the spool is removed once empty."""
+        try:
+            entries = await asyncio.to_thread(self._read_spool)
+        except FileNotFoundError:
+            self._spooled = False
+            return True
+        for start in range(0, len(entries), self.batch_size):
+            if not await self._send(entries[start:start + self.batch_size]):
+                if start:
+                    await asyncio.to_thread(self._rewrite_spool, entries[start:])
+                return False
+        await asyncio.to_thread(os.remove, self.spool_path)
+        self._spooled = False
+        logger.info("Replayed %d spooled events", len(entries))
+        return True
+
+    # -------------------------
+    # Shutdown
+    # -------------------------
+
+    async def close(self):
+        """Stop the flusher and deliver (or spool) whatever is still queued."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+def _pipe_entry(pipe, entry: dict) -> int:
+    """Queue one outbox entry on the pipeline; returns how many commands it took."""
+    if entry["op"] == "xadd":
+        kwargs = {"maxlen": entry["max_len"], "approximate": True} if entry.get("max_len") else {}
+        pipe.xadd(entry["key"], entry["fields"], **kwargs)
+        return 1
+    if entry["op"] == "set":
+        if entry.get("epoch") is not None:
+            pipe.eval(_SET_UNLESS_NEWER, 1, entry["key"], entry["ttl"], entry["value"], entry["epoch"])
+        else:
+            pipe.setex(entry["key"], entry["ttl"], entry["value"])
+        return 1
+    if entry.get("start") is not None:
+        pipe.eval(_APPEND_AT, 1, entry["key"], entry["ttl"], entry["start"], *entry["values"])
+        return 1
+    pipe.rpush(entry["key"], *entry["values"])  # spooled before appends carried their index
+    pipe.expire(entry["key"], entry["ttl"])
+    return 2
+
+
+def _process_alive(spool_path: str) -> bool:
+    """Whether the process a spool file is named after is still running."""
+    try:
+        pid = int(os.path.basename(spool_path)[len("interview-events-"):-len(".spool")])
+    except ValueError:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # alive, run by another user
+    return True
@@ -0,0 +1,20 @@
+from typing import Optional
+
+from src.services.tts.base import TTSBackend
+
+__all__ = ["TTSBackend", "create_backend"]
+
+
+def create_backend(name: Optional[str], sample_rate: int) -> Optional[TTSBackend]:
+    """Build a backend by name ("google" or "local"). Returns None for an empty name."""
+    if not name:
+        return None
+    name = name.strip().lower()
+    if name == "google":
+        # Imported lazily so the local backend runs without the Google SDK or credentials
+        from src.services.tts.google import GoogleTTSBackend
+        return GoogleTTSBackend(sample_rate)
+    if name == "local":
+        from src.services.tts.local import LocalTTSBackend
+        return LocalTTSBackend(sample_rate)
+    raise ValueError(f"Unknown TTS backend: {name}")
@@ -0,0 +1,23 @@
+"""TTS backend interface. TTSService owns deadlines, concurrency and metrics; backends only synthesize."""
+
+from abc import ABC, abstractmethod
+
+
+class TTSBackend(ABC):
+    name = "base"
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+
+    @property
+    def voice_id(self) -> str:
+        """Identifies the voice this backend produces; keys cached audio."""
+        return self.name
+
+    @abstractmethod
+    async def synthesize(self, text: str, timeout: float) -> bytes:
+        """
+        Synthesize text to raw PCM (16-bit, mono, at self.sample_rate).
+        Raises on failure; `timeout` is the time left before the caller gives up.
+        """
+        ...
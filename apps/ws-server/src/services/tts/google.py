@@ -0,0 +1,61 @@
+"""Google Cloud Text-to-Speech backend (async gRPC client over a channel pool)."""
+
+import asyncio
+import os
+from google.api_core.exceptions import DeadlineExceeded
+from google.cloud import texttospeech
+from src.services.tts.base import TTSBackend
+
+
+class GoogleTTSBackend(TTSBackend):
+    name = "google"
+
+    def __init__(self, sample_rate: int):
+        super().__init__(sample_rate)
+        self.pool_size = max(1, int(os.getenv("TTS_CHANNEL_POOL_SIZE", "2")))
+
+        # Channels are created on first use, inside the running event loop
+        self._clients: list = []
+        self._next_client = 0
+
+        # Voice configuration
+        self.voice = texttospeech.VoiceSelectionParams(
+            language_code="en-US",
+            name=os.getenv("TTS_VOICE", "en-US-Neural2-D"),  # Male, calm interviewer voice
+            # Other good options:
+            # "en-US-Neural2-A" - Male, more energetic
+            # "en-US-Neural2-C" - Female, professional
+            # "en-US-Neural2-F" - Female, warm
+        )
+
+        # Audio configuration - use LINEAR16 for better quality and easier processing
+        self.audio_config = texttospeech.AudioConfig(
+            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
+            sample_rate_hertz=self.sample_rate,  # match the output track to skip resampling
+            speaking_rate=1.0,  # Normal speed (0.25 to 4.0)
+            pitch=0.0,  # Normal pitch (-20.0 to 20.0)
+        )
+
+    @property
+    def voice_id(self) -> str:
+        return f"{self.name}:{self.voice.name}"
+
+    def _get_client(self) -> texttospeech.TextToSpeechAsyncClient:
+        """Round-robin over the channel pool, creating channels lazily."""
+        if not self._clients:
+            self._clients = [texttospeech.TextToSpeechAsyncClient() for _ in range(self.pool_size)]
+        client = self._clients[self._next_client % len(self._clients)]
+        self._next_client += 1
+        return client
+
+    async def synthesize(self, text: str, timeout: float) -> bytes:
+        try:
+            response = await self._get_client().synthesize_speech(
+                input=texttospeech.SynthesisInput(text=text),
+                voice=self.voice,
+                audio_config=self.audio_config,
+                timeout=timeout,
+            )
+        except DeadlineExceeded as e:
+            raise asyncio.TimeoutError(str(e)) from e
+        return response.audio_content
@@ -0,0 +1,134 @@
+"""
+Cache for fixed interviewer phrases (opening, encouragement, closing, apology).
+
+Each phrase is synthesized once per voice and kept as 48kHz PCM plus the
+matching 20ms Opus packets, in memory and under TTS_CACHE_DIR, so playing it
+costs neither a TTS request nor a per-frame encode.
+"""
+
+import asyncio
+import hashlib
+import os
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.core import metrics
+from src.media.audio.opus import SAMPLE_RATE, encode_opus
+from src.tts_service import TTSService, tts_service
+from src.websocket.audio_bufffer import StreamingResampler
+
+
+@dataclass
+class CachedPhrase:
+    text: str
+    pcm: bytes  # 16-bit mono at 48kHz
+    packets: list[bytes]  # 20ms Opus packets covering pcm
+
+    @property
+    def duration(self) -> float:
+        return len(self.packets) * 0.020
+
+
+class PhraseCache:
+    def __init__(self, service: TTSService, cache_dir: Optional[str] = None):
+        self.service = service
+        self.enabled = os.getenv("TTS_PHRASE_CACHE", "1") != "0"
+        self.cache_dir = Path(cache_dir or os.getenv("TTS_CACHE_DIR", ".cache/tts"))
+        self._phrases: dict[str, CachedPhrase] = {}
+        self._loading: dict[str, asyncio.Task] = {}
+        self._hits = metrics.counter("tts.phrase_cache.hits")
+        self._misses = metrics.counter("tts.phrase_cache.misses")
+
+    def _key(self, text: str) -> str:
+        voice = f"{self.service.backend.voice_id}:{self.service.sample_rate}"
+        return hashlib.sha1(f"{voice}\n{text}".encode()).hexdigest()
+
+    def get(self, text: str) -> Optional[CachedPhrase]:
+        """In-memory lookup only; never synthesizes."""
+        if not self.enabled:
+            return None
+        phrase = self._phrases.get(self._key(text))
+        if phrase:
+            self._hits.inc()
+        return phrase
+
+    async def load(self, text: str) -> Optional[CachedPhrase]:
+        """
+        Return the cached phrase, reading it from disk or synthesizing it on a
+        miss. None if synthesis failed (primary and fallback).
+        """
+        if not self.enabled or not text:
+            return None
+        key = self._key(text)
+        if key in self._phrases:
+            self._hits.inc()
+            return self._phrases[key]
+        # Concurrent sessions asking for the same phrase share one synthesis
+        task = self._loading.get(key)
+        if task is None:
+            self._misses.inc()
+            task = asyncio.create_task(self._load(key, text))
+            self._loading[key] = task
+            task.add_done_callback(lambda _: self._loading.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def warm(self, texts: Iterable[str]):
+        """Load phrases ahead of time (e.g. on startup)."""
+        phrases = await asyncio.gather(*(self.load(text) for text in texts), return_exceptions=True)
+        loaded = sum(1 for phrase in phrases if isinstance(phrase, CachedPhrase))
+        print(f"🗂️  Phrase cache warmed: {loaded}/{len(phrases)} phrases")
+
+    async def _load(self, key: str, text: str) -> Optional[CachedPhrase]:
+        phrase = await asyncio.to_thread(self._read, key, text)
+        if phrase is None:
+            audio, voice = await self.service.synthesize_with_voice(text)
+            if not audio:
+                return None
+            phrase = await asyncio.to_thread(self._encode, text, audio)
+            if voice != self.service.backend.voice_id:
+                # Served by the fallback: play it this once, but don't keep it
+                # under the primary voice's key
+                return phrase
+            try:
+                await asyncio.to_thread(self._write, key, phrase)
+            except OSError as e:
+                print(f"⚠️  Could not persist cached phrase: {e}")
+        self._phrases[key] = phrase
+        return phrase
+
+    def _encode(self, text: str, audio: bytes) -> CachedPhrase:
+        pcm = np.frombuffer(audio, dtype=np.int16)
+        if self.service.sample_rate != SAMPLE_RATE:
+            resampler = StreamingResampler(self.service.sample_rate, SAMPLE_RATE)
+            pcm = np.concatenate([resampler.process(pcm), resampler.flush()])
+        return CachedPhrase(text, pcm.tobytes(), encode_opus(pcm))
+
+    def _read(self, key: str, text: str) -> Optional[CachedPhrase]:
+        pcm_path = self.cache_dir / f"{key}.pcm"
+        opus_path = self.cache_dir / f"{key}.opus"
+        if not (pcm_path.exists() and opus_path.exists()):
+            return None
+        data = opus_path.read_bytes()
+        packets, offset = [], 0
+        while offset < len(data):
+            (size,) = struct.unpack_from(">H", data, offset)
+            packets.append(data[offset + 2:offset + 2 + size])
+            offset += 2 + size
+        return CachedPhrase(text, pcm_path.read_bytes(), packets)
+
+    def _write(self, key: str, phrase: CachedPhrase):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        packets = b"".join(struct.pack(">H", len(packet)) + packet for packet in phrase.packets)
+        # The .opus file lands last, so a half-written entry is never read back
+        for suffix, data in (("pcm", phrase.pcm), ("opus", packets)):
+            tmp = self.cache_dir / f"{key}.{suffix}.tmp"
+            tmp.write_bytes(data)
+            os.replace(tmp, self.cache_dir / f"{key}.{suffix}")
+
+
+# Global phrase cache
+phrase_cache = PhraseCache(tts_service)
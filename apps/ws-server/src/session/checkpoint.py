@@ -0,0 +1,162 @@
+"""
+Session checkpoints in Redis, so an interview survives a dropped connection
+or a node restart/deploy: the candidate reconnects (to any node) within
+SESSION_RESUME_GRACE_SEC and continues where they left off.
+
+After each turn the new transcript entries are appended to the session's
+message list (interview-messages-{sessionId}, shared with the event emitter)
+and the small scalar state (flow position, metrics, history boundaries and
+summaries, message count) is written to interview-checkpoint-{sessionId}.
+Both go through the event outbox, so saving never waits on Redis and the
+messages always land before the checkpoint that counts them.
+
+On disconnect the checkpoint is marked disconnected and abandon_interview is
+only emitted if nobody resumed it once the grace period is over. A session
+that is still live (not marked disconnected, and its node's heartbeat still
+holds interview-session-node-{sessionId}) is never resumed, and a checkpoint
+is only written if the stored one isn't from a newer epoch, so a stale
+connection can't overwrite its successor's state.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+from src.services.redis import async_redis_client, event_outbox
+from src.services.redis.event_emitter import append_messages, emit_abandon_interview, messages_key
+from src.session.registry import session_owner_key
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_TTL_SEC = int(os.getenv("SESSION_CHECKPOINT_TTL_SEC", "3600"))
+SESSION_RESUME_GRACE_SEC = int(os.getenv("SESSION_RESUME_GRACE_SEC", "120"))
+
+_METRIC_FIELDS = (
+    "question_start_time", "total_questions_asked", "total_answer_time",
+    "long_pauses", "quick_answers", "struggling_indicators",
+)
+
+_pending_abandons: set = set()
+
+
+def checkpoint_key(session_id) -> str:
+    return f"interview-checkpoint-{session_id}"
+
+
+def save_checkpoint(session, disconnected: bool = False) -> None:
+    """Queue the session's current state. Call after each turn; never blocks."""
+    if not session.flow_manager:
+        return
+    state = session.state
+    checkpoint = {
+        "user_id": session.user_id,
+        "epoch": session.checkpoint_epoch,
+        "messages": append_messages(session, state.conversation_history),
+        "completed": session.interview_completed,
+        "interview_started": state.interview_started,
+        "flow": session.flow_manager.checkpoint_state(),
+        "history": state.history.checkpoint_state(),
+        "metrics": {name: getattr(session.metrics, name) for name in _METRIC_FIELDS},
+        "saved_at": time.time(),
+        "disconnected_at": time.time() if disconnected else None,
+    }
+    # A disconnected checkpoint only has to outlive the grace period
+    ttl = SESSION_RESUME_GRACE_SEC + 30 if disconnected else CHECKPOINT_TTL_SEC
+    event_outbox.set(checkpoint_key(session.session_id), json.dumps(checkpoint), ttl, epoch=session.checkpoint_epoch)
+
+
+async def load_checkpoint(session_id) -> Optional[Dict[str, Any]]:
+    raw = await async_redis_client.get(checkpoint_key(session_id))
+    if not raw:
+        return None
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ignoring unreadable checkpoint for session {session_id}: {e}")
+        return None
+
+
+async def load_owner(session_id) -> Optional[str]:
+    """Node whose heartbeat currently claims the session, if any."""
+    return await async_redis_client.get(session_owner_key(session_id))
+
+
+def is_live(checkpoint: Optional[Dict[str, Any]], owner: Optional[str]) -> bool:
+    """Another connection still serves this session (a second tab, or a socket not yet seen to drop)."""
+    return (bool(checkpoint) and not checkpoint.get("completed")
+            and checkpoint.get("disconnected_at") is None and owner is not None)
+
+
+def can_resume(checkpoint: Optional[Dict[str, Any]], user_id, owner: Optional[str] = None) -> bool:
+    """
+    owner is load_owner(): without it a checkpoint not marked disconnected is
+    taken for a node that died (its heartbeat expired).
+    """
+    if not checkpoint or checkpoint.get("completed") or checkpoint.get("user_id") != user_id:
+        return False
+    if is_live(checkpoint, owner):
+        return False
+    disconnected_at = checkpoint.get("disconnected_at")
+    return disconnected_at is None or time.time() - disconnected_at <= SESSION_RESUME_GRACE_SEC
+
+
+async def restore_session(session, checkpoint: Dict[str, Any]) -> None:
+    """
+    Rebuild a session (whose flow_manager is loaded) from a checkpoint: the
+    transcript, flow position, metrics and history view. Bumps the epoch so
+    the previous connection's pending abandon is called off.
+    """
+    count = checkpoint.get("messages", 0)
+    raw = await async_redis_client.get_list_range(messages_key(session.session_id), 0, count - 1) if count else []
+    state = session.state
+    state.conversation_history.extend(
+        {"role": m["role"], "content": m["content"], "timestamp": m.get("timestamp")}
+        for m in map(json.loads, raw)
+    )
+    state.interview_started = checkpoint.get("interview_started", True)
+    state.history.restore_state(checkpoint.get("history") or {})
+    session.flow_manager.restore_state(checkpoint.get("flow") or {})
+    for name, value in (checkpoint.get("metrics") or {}).items():
+        if name in _METRIC_FIELDS:
+            setattr(session.metrics, name, value)
+    session.messages_emitted = len(state.conversation_history)
+    session.checkpoint_epoch = checkpoint.get("epoch", 0) + 1
+    session.resumed = True
+    save_checkpoint(session)
+    logger.info(f"Session {session.session_id} resumed at question {session.flow_manager.current_question_index}"
+                f" with {session.messages_emitted} messages")
+
+
+async def supersede(session, checkpoint: Dict[str, Any]) -> None:
+    """
+    Start the session over a checkpoint of it that can't be resumed (completed
+    or past the grace period): the old transcript list is dropped and the
+    epoch moves past the stored one, which would otherwise refuse our saves.
+    """
+    await async_redis_client.delete(messages_key(session.session_id))
+    session.checkpoint_epoch = checkpoint.get("epoch", 0) + 1
+
+
+def schedule_abandon(session, reason: str = "connection_closed") -> None:
+    """
+    Mark the session disconnected and emit abandon_interview after the grace
+    period, unless a reconnect (on this node or another) resumed it meanwhile.
+    """
+    save_checkpoint(session, disconnected=True)
+    task = asyncio.create_task(_abandon_after_grace(session, reason, session.checkpoint_epoch))
+    _pending_abandons.add(task)
+    task.add_done_callback(_pending_abandons.discard)
+
+
+async def _abandon_after_grace(session, reason: str, epoch: int) -> None:
+    await asyncio.sleep(SESSION_RESUME_GRACE_SEC)
+    try:
+        checkpoint = await load_checkpoint(session.session_id)
+    except Exception as e:
+        logger.warning(f"Checkpoint lookup failed, treating session {session.session_id} as abandoned: {e}")
+        checkpoint = None
+    if checkpoint and (checkpoint.get("epoch", 0) != epoch or checkpoint.get("completed")):
+        return  # resumed elsewhere
+    emit_abandon_interview(session, reason=reason, conversation_history=session.state.conversation_history)
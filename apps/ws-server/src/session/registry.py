@@ -0,0 +1,217 @@
+"""
+Session registry and admission control.
+
+active_sessions is this process's live sessions. Every NODE_HEARTBEAT_SEC the
+node refreshes the owner record of each of its sessions
+(interview-session-node-{sessionId}) and publishes its load to Redis
+(ws-node-{nodeId}, listed in the ws-nodes set):
+  - active sessions
+  - STT real-time factor (p95 of transcription time / audio length over the
+    last LOAD_WINDOW_SEC)
+  - event loop lag (p95 of how late a periodic wakeup fired, same window)
+
+Capacity is projected from the measured load: STT gets slower roughly in
+proportion to the sessions sharing the CPU, so a node running n sessions at
+real-time factor r can take about n * STT_RTF_LIMIT / r before replies lag,
+capped at NODE_MAX_SESSIONS. New sessions are refused (close code 4029,
+CAPACITY_CLOSE_CODE) when no headroom is left or the loop is already lagging.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import redis
+
+from src.core import metrics
+from src.services.redis import async_redis_client, event_outbox
+
+logger = logging.getLogger(__name__)
+
+NODE_ID = os.getenv("NODE_ID") or f"{socket.gethostname()}-{os.getpid()}"
+NODE_PUBLIC_URL = os.getenv("NODE_PUBLIC_URL")  # ws URL clients may be redirected to
+NODE_MAX_SESSIONS = int(os.getenv("NODE_MAX_SESSIONS", "20"))
+NODE_HEARTBEAT_SEC = float(os.getenv("NODE_HEARTBEAT_SEC", "5"))
+STT_RTF_LIMIT = float(os.getenv("STT_RTF_LIMIT", "0.5"))
+LOOP_LAG_LIMIT_SEC = float(os.getenv("LOOP_LAG_LIMIT_SEC", "0.1"))
+LOAD_WINDOW_SEC = float(os.getenv("NODE_LOAD_WINDOW_SEC", "60"))
+CAPACITY_CLOSE_CODE = 4029
+
+NODES_KEY = "ws-nodes"
+_LOOP_LAG_INTERVAL_SEC = 0.5
+
+
+def node_key(node_id: str) -> str:
+    return f"ws-node-{node_id}"
+
+
+def session_owner_key(session_id) -> str:
+    return f"interview-session-node-{session_id}"
+
+
+# user_id -> live session on this node
+active_sessions: Dict[str, Any] = {}
+
+
+class SessionRegistry:
+    def __init__(self, node_id: str = NODE_ID):
+        self.node_id = node_id
+        self._tasks: list = []
+        self._sessions = metrics.gauge("node.active_sessions")
+        self._loop_lag = metrics.histogram("node.loop_lag_sec")
+        self._stt_rtf = metrics.histogram("stt.rtf")
+        self._refused = metrics.counter("node.admission_refused")
+        self._recent_rtf: deque = deque(maxlen=256)  # (monotonic time, value)
+        self._recent_lag: deque = deque(maxlen=256)
+
+    # -------------------------
+    # Sessions
+    # -------------------------
+
+    def register(self, session) -> None:
+        active_sessions[session.user_id] = session
+        self._sessions.set(len(active_sessions))
+        # Claim the session now rather than at the next heartbeat, so a second tab can't resume it meanwhile
+        event_outbox.set(session_owner_key(session.session_id), self.node_id, _owner_ttl())
+
+    def unregister(self, session) -> None:
+        # A reconnect may already have replaced this user's session
+        if active_sessions.get(session.user_id) is session:
+            del active_sessions[session.user_id]
+        self._sessions.set(len(active_sessions))
+
+    # -------------------------
+    # Load and admission
+    # -------------------------
+
+    def observe_stt(self, processing_sec: float, audio_sec: float) -> None:
+        if audio_sec > 0:
+            rtf = processing_sec / audio_sec
+            self._stt_rtf.observe(rtf)
+            self._recent_rtf.append((time.monotonic(), rtf))
+
+    def load(self) -> Dict[str, Any]:
+        sessions = len(active_sessions)
+        rtf = _recent_p95(self._recent_rtf)
+        lag = _recent_p95(self._recent_lag) or 0.0
+        capacity = NODE_MAX_SESSIONS
+        if sessions and rtf:
+            capacity = min(capacity, int(sessions * STT_RTF_LIMIT / rtf))
+        headroom = max(0, capacity - sessions)
+        if lag > LOOP_LAG_LIMIT_SEC:
+            headroom = 0
+        return {
+            "node": self.node_id,
+            "url": NODE_PUBLIC_URL,
+            "active_sessions": sessions,
+            "stt_rtf_p95": rtf,
+            "loop_lag_p95_sec": lag,
+            "capacity": capacity,
+            "headroom": headroom,
+            "ts": time.time(),
+        }
+
+    def admit(self) -> bool:
+        """Whether this node can take one more session."""
+        if self.load()["headroom"] > 0:
+            return True
+        self._refused.inc()
+        return False
+
+    async def admission(self, session) -> Optional[Dict[str, Any]]:
+        """
+        None if this node takes the session, else how to refuse it: abort()
+        arguments with CAPACITY_CLOSE_CODE and the node to retry on, if any.
+        Reconnects are always taken back, refusing them would lose the interview.
+        """
+        if session.resumed or self.admit():
+            return None
+        return {
+            "code": CAPACITY_CLOSE_CODE,
+            "error": "NODE_AT_CAPACITY",
+            "message": "The interview service is busy. Please try again in a moment.",
+            "reason": "Node at capacity",
+            "redirect": await self.redirect_url(),
+        }
+
+    async def redirect_url(self) -> Optional[str]:
+        """Public URL of the live node with the most headroom, if any has some."""
+        try:
+            best = None
+            for node_id in await async_redis_client.redis.smembers(NODES_KEY):
+                if node_id == self.node_id:
+                    continue
+                raw = await async_redis_client.get(node_key(node_id))
+                if not raw:
+                    continue
+                node = json.loads(raw)
+                if node.get("url") and node.get("headroom", 0) > 0 and (
+                        best is None or node["headroom"] > best["headroom"]):
+                    best = node
+            return best["url"] if best else None
+        except redis.RedisError as e:
+            logger.warning(f"Node lookup failed: {e}")
+            return None
+
+    # -------------------------
+    # Background: heartbeat and loop lag
+    # -------------------------
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._heartbeat()), asyncio.create_task(self._measure_loop_lag())]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        try:
+            async with async_redis_client.redis.pipeline(transaction=False) as pipe:
+                pipe.srem(NODES_KEY, self.node_id)
+                pipe.delete(node_key(self.node_id))
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not deregister node {self.node_id}: {e}")
+
+    async def _heartbeat(self) -> None:
+        ttl = _owner_ttl()
+        while True:
+            try:
+                async with async_redis_client.redis.pipeline(transaction=False) as pipe:
+                    pipe.setex(node_key(self.node_id), ttl, json.dumps(self.load()))
+                    pipe.sadd(NODES_KEY, self.node_id)
+                    for session in list(active_sessions.values()):
+                        pipe.setex(session_owner_key(session.session_id), ttl, self.node_id)
+                    await pipe.execute()
+            except redis.RedisError as e:
+                logger.warning(f"Node heartbeat failed: {e}")
+            await asyncio.sleep(NODE_HEARTBEAT_SEC)
+
+    async def _measure_loop_lag(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + _LOOP_LAG_INTERVAL_SEC
+            await asyncio.sleep(_LOOP_LAG_INTERVAL_SEC)
+            lag = max(0.0, loop.time() - expected)
+            self._loop_lag.observe(lag)
+            self._recent_lag.append((time.monotonic(), lag))
+
+
+def _owner_ttl() -> int:
+    """Owner and node records outlive a few missed heartbeats, then expire with a dead node."""
+    return max(1, int(NODE_HEARTBEAT_SEC * 3))
+
+
+def _recent_p95(samples: deque) -> Optional[float]:
+    """p95 of the (time, value) samples from the last LOAD_WINDOW_SEC, None if there are none."""
+    cutoff = time.monotonic() - LOAD_WINDOW_SEC
+    values = sorted(value for at, value in samples if at >= cutoff)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(round(0.95 * len(values))) - 1)]
+
+
+session_registry = SessionRegistry()
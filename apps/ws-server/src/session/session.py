@@ -1,7 +1,10 @@
+import asyncio
+
 from src.speech_state import SpeechState
 from src.interview_agent.software_engineer import InterviewMetrics
 from src.core.helper import send_over_ws, verify_jwt
 from src.tts_service import tts_service
+from src.services.tts.phrase_cache import phrase_cache
 from src.interview_agent.flow_manager import InterviewFlowManager, SessionNotFoundError
 
 
@@ -13,6 +16,10 @@ class InterviewSession:
         self.metrics = InterviewMetrics()
         self.flow_manager: InterviewFlowManager | None = None
         self.interview_completed = False  # True when we sent closing message (successful end)
+        self.messages_emitted = 0  # conversation_history entries already in the event message list
+        self.checkpoint_epoch = 0  # bumped on each resume (session/checkpoint.py)
+        self.resumed = False  # rebuilt from a checkpoint after a reconnect
+        self.accepted_at: float | None = None  # perf_counter() when the WebSocket was accepted
         self.transport = None  # set by manager (Transport abstraction)
         self.ws = None  # set by WebRTC/WS layer (legacy; prefer transport)
         self.tts_track = None  # set by WebRTC layer (legacy; prefer transport)
@@ -20,6 +27,13 @@ class InterviewSession:
         self.audio_pipeline = None  # set by manager after agent (AudioPipeline)
         self.video_pipeline = None  # optional: VideoPipeline(self) for video interviews
 
+    def post(self, msg: dict):
+        """Queue a message for the client; the caller never waits on the client's network."""
+        if self.transport:
+            self.transport.post(msg)
+        elif self.ws:
+            asyncio.ensure_future(send_over_ws(self.ws, msg))
+
     async def send_text(self, text: str):
         """Send text response to client (e.g. LLM response)."""
         msg = {"type": "llm_response", "response": text}
@@ -37,23 +51,52 @@ class InterviewSession:
         except Exception as e:
             print(e)
             return None
-    async def speak(self, text: str, silence_before_ms: int = 300, silence_after_ms: int = 0):
-        """Generate TTS and queue for playback."""
+    async def speak(self, text: str, silence_before_ms: int = 300, silence_after_ms: int = 0, cache: bool = False):
+        """
+        Generate TTS and queue for playback. Returns a playback id for wait_for_playback().
+        With cache=True the phrase is kept in the phrase cache for other sessions
+        (use for fixed text such as an agent's opening message).
+        """
         if not text:
-            return
+            return None
+        playback_id = None
+        if cache and phrase_cache.enabled:
+            # load() already synthesized on a miss; a failure there isn't retried
+            phrase = await phrase_cache.load(text)
+            synthesize = False
+        else:
+            phrase = phrase_cache.get(text)
+            synthesize = phrase is None
         if self.transport:
             if silence_before_ms:
                 self.transport.add_silence(silence_before_ms)
-            audio = await tts_service.synthesize_speech(text)
-            if audio:
-                await self.transport.play_audio(audio)
+            if phrase:
+                playback_id = await self.transport.play_phrase(phrase)
+            elif synthesize:
+                audio = await tts_service.synthesize_speech(text)
+                if audio:
+                    playback_id = await self.transport.play_audio(audio, tts_service.sample_rate)
             if silence_after_ms:
                 self.transport.add_silence(silence_after_ms)
         elif self.tts_track:
             if silence_before_ms:
                 self.tts_track.add_silence(silence_before_ms)
-            audio = await tts_service.synthesize_speech(text)
-            if audio:
-                self.tts_track.add_audio(audio)
+            if phrase:
+                playback_id = self.tts_track.add_packets(phrase.packets, phrase.pcm)
+            elif synthesize:
+                audio = await tts_service.synthesize_speech(text)
+                if audio:
+                    playback_id = await self.tts_track.add_audio(audio, tts_service.sample_rate)
             if silence_after_ms:
                 self.tts_track.add_silence(silence_after_ms)
+        return playback_id
+
+    async def wait_for_playback(self, playback_id) -> bool:
+        """Wait until queued audio has played. False if it was interrupted first."""
+        if playback_id is None:
+            return True
+        if self.transport:
+            return await self.transport.wait_for_playback(playback_id)
+        if self.tts_track:
+            return await self.tts_track.wait_for_utterance(playback_id)
+        return True
@@ -1,4 +1,5 @@
 from src.websocket.audio_bufffer import AudioBuffer
+from src.interview_agent.history import HistoryManager
 
 class SpeechState:
     def __init__(self):
@@ -11,6 +12,7 @@ class SpeechState:
 
         # Add conversation tracking: Later move to redis
         self.conversation_history = []
+        self.history = HistoryManager(self.conversation_history)  # token-budgeted view for the LLM
         self.interview_started = False
         self.current_question_count = 0
 
@@ -1,15 +1,30 @@
 import asyncio
 from faster_whisper import WhisperModel
 import numpy as np
+import random
 import time
 from fastapi import WebSocket
 from src.speech_state import SpeechState
-from src.interview_agent.ai_brain import get_interviewer_response
-from src.interview_agent.software_engineer import InterviewMetrics, provide_encouragement
+from src.interview_agent.ai_brain import SentenceSplitter, SpeculativeReply, stream_interviewer_response
+from src.interview_agent.intents import READY, REPEAT_QUESTION, match_intent, same_answer
+from src.interview_agent.software_engineer import InterviewMetrics, assess_answer_pace, provide_encouragement
 from src.websocket.webrtc_tts_track import TTSAudioTrack
 from src.tts_service import tts_service
+from src.services.tts.phrase_cache import CachedPhrase, phrase_cache
+from src.constant import (
+    AUDIO_FREQ, CLOSING_MESSAGE, BACKCHANNEL_ENABLED, BACKCHANNEL_DELAY_MS, BACKCHANNEL_PHRASES, READY_REPLY,
+    SPECULATIVE_REPLY_ENABLED, SPECULATIVE_MAX_EDIT_RATIO,
+)
+from src.core import metrics as service_metrics
 from src.core.helper import send_over_ws
 from src.services.redis.event_emitter import emit_question_evaluate, emit_end_interview, emit_generate_report
+from src.session.checkpoint import save_checkpoint
+from src.session.registry import session_registry
+
+_backchannels = service_metrics.counter("backchannel.played")
+_fast_intents = service_metrics.counter("intent.fast_path")
+_fast_intent_latency = service_metrics.histogram("intent.response_sec")
+_turns_cancelled = service_metrics.counter("turn.cancelled")
 
 model = WhisperModel('small.en', device='cpu', compute_type='int8')
 
@@ -65,7 +80,17 @@ def transcribe_audio_sync(speech: np.ndarray) -> str:
         return ""
 
 async def transcribe_audio(speech: np.ndarray) -> str:
-    return await asyncio.to_thread(transcribe_audio_sync, speech)
+    started = time.perf_counter()
+    text = await asyncio.to_thread(transcribe_audio_sync, speech)
+    # Includes waiting for a worker thread: that's where contention between sessions shows
+    session_registry.observe_stt(time.perf_counter() - started, len(speech) / AUDIO_FREQ)
+    return text
+
+
+def _discard_speculation(task: asyncio.Task):
+    """Done-callback for an abandoned speculation task: cancel a reply it had already started."""
+    if not task.cancelled() and not task.exception() and task.result():
+        task.result().discard()
 
 
 class StreamingSpeechProcessor:
@@ -84,7 +109,13 @@ class StreamingSpeechProcessor:
         self.monitoring_task = None
         self.has_received_answer = False
         self.ai_speaking = False  # Track if AI is currently speaking
-        self.speech_end_task = None  # Task to notify when speech ends
+        self.speech_ended_at = 0.0  # monotonic time the last segment was handed over
+        self.backchannel_task = None
+        self._last_reply = None  # (text, audio) of the last reply that played in full
+        self._turn = None  # task running the current turn: STT, LLM, TTS and playback
+        self._unanswered = None  # (user_text, context) of a turn cancelled before it replied
+        self._spoke_in = None  # track generation the current reply started speaking in
+        self._speculation = None  # task -> SpeculativeReply started at the last pause
         
     async def start(self):
         self.is_processing = True
@@ -95,24 +126,24 @@ class StreamingSpeechProcessor:
         self.is_processing = False
         if self.monitoring_task:
             self.monitoring_task.cancel()
-        if self.speech_end_task:
-            self.speech_end_task.cancel()
+        self._cancel_turn()
+        self._drop_speculation()
         
     async def add_speech_segment(self, speech_buffer: list):
         """Add to queue without blocking"""
         if speech_buffer:
+            self.speech_ended_at = time.monotonic()
+            # Newer speech supersedes a reply still being prepared or played
+            self._cancel_turn()
             # User started speaking - interrupt AI if speaking
             if self.ai_speaking and self.tts_track:
                 print("🛑 User interrupted - clearing AI speech queue")
+                # Clearing the queue also releases anyone waiting on the interrupted utterance
                 self.tts_track.clear_queue()
                 self.ai_speaking = False
                 
-                # Cancel the speech end notification task
-                if self.speech_end_task:
-                    self.speech_end_task.cancel()
-                
                 # Notify frontend that AI stopped
-                await send_over_ws(self.ws, {
+                self._post({
                     "type": "ai_speaking",
                     "speaking": False
                 })
@@ -129,11 +160,30 @@ class StreamingSpeechProcessor:
                     self.processing_queue.get(),
                     timeout=0.5
                 )
-                await self._process_segment(speech_buffer)
             except asyncio.TimeoutError:
                 continue
-            except Exception as e:
-                print(f"❌ Processing error: {e}")
+            # One turn at a time; add_speech_segment cancels it when the candidate speaks again
+            self._turn = asyncio.create_task(self._process_segment(speech_buffer))
+            await asyncio.wait({self._turn})
+            self._drop_speculation()  # one this turn didn't use
+            if not self._turn.cancelled() and self._turn.exception():
+                print(f"❌ Processing error: {self._turn.exception()}")
+            if self.session:
+                save_checkpoint(self.session)
+
+    def _post(self, msg: dict):
+        """Queue a message for the client without waiting on its network."""
+        if self.session:
+            self.session.post(msg)
+        else:
+            asyncio.ensure_future(send_over_ws(self.ws, msg))
+
+    def _cancel_turn(self):
+        """Cancel the in-flight turn, including its LLM stream and TTS requests."""
+        if self._turn and not self._turn.done():
+            print("🛑 Cancelling in-flight turn")
+            _turns_cancelled.inc()
+            self._turn.cancel()
                 
     async def _process_segment(self, speech_buffer: list):
         """Process speech segment"""
@@ -143,25 +193,36 @@ class StreamingSpeechProcessor:
         duration = get_duration(full_speech)
         
         if duration < 0.3:
+            await self._answer_unanswered()
             return
             
         # Get answer duration
         answer_duration = self.metrics.get_answer_duration()
         
-        # Send processing indicator (full utterance built; analyzing now)
-        await send_over_ws(self.ws, {
-            "type": "processing",
-            "status": "analyzing"
-        })
-        
-        # Transcribe
-        text = await transcribe_audio(full_speech)
+        # Transcribe. If newer speech cancels this turn meanwhile, what was said
+        # still goes into the history: the next turn replies to both.
+        stt = asyncio.ensure_future(transcribe_audio(full_speech))
+        try:
+            # Send processing indicator (full utterance built; analyzing now)
+            self._post({
+                "type": "processing",
+                "status": "analyzing"
+            })
+            text = await asyncio.shield(stt)
+        except asyncio.CancelledError:
+            text = await stt
+            if text:
+                self.state.add_message("user", text)
+                self._unanswered = (self._unanswered_text(text), {})
+            raise
         
-        if text:
+        if not text:
+            await self._answer_unanswered()
+        else:
             print(f'✅ [{answer_duration:.1f}s] User: "{text}"')
             
             # Send transcript
-            await send_over_ws(self.ws, {
+            self._post({
                 "type": "transcript",
                 "text": text,
                 "is_final": True,
@@ -170,6 +231,12 @@ class StreamingSpeechProcessor:
             
             # Add to history
             self.state.add_message("user", text)
+
+            # "Can you repeat that?" and the like don't need the LLM
+            local = self._local_reply(match_intent(text)) if not self._unanswered else None
+            if local:
+                await self._speak_local_reply(*local)
+                return
             
             # Analyze answer
             analysis = self.metrics.analyze_answer_pace(answer_duration, text)
@@ -180,11 +247,95 @@ class StreamingSpeechProcessor:
                 "long_pause": answer_duration if answer_duration > 10 else None
             }
             
-            # Start AI response (non-blocking)
-            asyncio.create_task(self._generate_response(text, context))
+            # Fill the silence if the reply takes a while
+            self._schedule_backchannel(self.speech_ended_at)
+
+            user_text = self._unanswered_text(text)
+            self._unanswered = (user_text, context)
+            speculation = await self._take_speculation(user_text)
+            await self._generate_response(user_text, context, speculation)
+
+    def on_speech_paused(self, speech_buffer: list):
+        """Start a speculative reply on what the candidate said so far (SPECULATIVE_REPLY_ENABLED)."""
+        if not SPECULATIVE_REPLY_ENABLED or not self.flow_manager or self.flow_manager.is_interview_complete():
+            return
+        # Only a fresh answer: an in-flight turn or an owed reply would change the prompt
+        if self._speculation or self._unanswered or (self._turn and not self._turn.done()):
+            return
+        self._speculation = asyncio.create_task(self._speculate(list(speech_buffer)))
+
+    def on_speech_resumed(self):
+        """The candidate kept talking: the speculative reply answers the wrong thing."""
+        self._drop_speculation()
+
+    def _drop_speculation(self):
+        task, self._speculation = self._speculation, None
+        if task:
+            task.add_done_callback(_discard_speculation)
+            task.cancel()
+
+    async def _speculate(self, speech_buffer: list):
+        text = await transcribe_audio(np.concatenate(speech_buffer))
+        if not text or match_intent(text):
+            return None
+        start = self.metrics.question_start_time
+        duration = time.time() - start if start else 0.0
+        context = {
+            "answer_analysis": assess_answer_pace(duration, text),
+            "long_pause": duration if duration > 10 else None
+        }
+        system_prompt, merged_context = self._reply_context(context)
+        messages = self.state.history.prompt_messages() + [{"role": "user", "content": text}]
+        print(f'🔮 Speculative reply on: "{text}"')
+        return SpeculativeReply(text, stream_interviewer_response(messages, system_prompt, self.metrics, merged_context))
+
+    async def _take_speculation(self, final_text: str):
+        """The speculative reply if it was ready and answers `final_text`, else None (and it's discarded)."""
+        task = self._speculation
+        if task is None:
+            return None
+        if not task.done():
+            # Still transcribing the pause: no head start left to gain
+            self._drop_speculation()
+            return None
+        self._speculation = None
+        speculation = task.result() if not task.cancelled() and not task.exception() else None
+        if speculation is None:
+            return None
+        if not same_answer(speculation.text, final_text, SPECULATIVE_MAX_EDIT_RATIO):
+            print(f'🔮 Speculation missed: "{speculation.text}" vs "{final_text}"')
+            speculation.discard(missed=True)
+            return None
+        speculation.use()
+        return speculation
+
+    def _unanswered_text(self, text: str) -> str:
+        """`text`, after anything the candidate said in turns that were cancelled before replying."""
+        return f"{self._unanswered[0]} {text}" if self._unanswered else text
+
+    async def _answer_unanswered(self):
+        """A turn with no words (noise) still replies to an earlier turn it cancelled."""
+        if self._unanswered:
+            self._schedule_backchannel(self.speech_ended_at)
+            await self._generate_response(*self._unanswered)
             
-    async def _generate_response(self, user_text: str, context: dict):
-        """Generate CONVERSATIONAL AI response: acknowledge + follow-up OR acknowledge + next question."""
+    def _reply_context(self, context: dict):
+        """(system prompt, turn context) for the interviewer LLM at the current question."""
+        current_ctx, next_q, system_prompt, llm_context = self.flow_manager.get_context_for_interviewer_response()
+        merged_context = {
+            **context,
+            **llm_context,
+            "current_question_context": current_ctx,
+        }
+        if next_q:
+            merged_context["next_question"] = next_q
+        return system_prompt, merged_context
+
+    async def _generate_response(self, user_text: str, context: dict, speculation: SpeculativeReply = None):
+        """
+        Generate CONVERSATIONAL AI response: acknowledge + follow-up OR acknowledge + next question.
+        With `speculation`, continues that already-started reply instead of making a new request.
+        """
         try:
             if not self.flow_manager:
                 print("❌ No flow manager - cannot generate response")
@@ -193,40 +344,77 @@ class StreamingSpeechProcessor:
             if self.flow_manager.is_interview_complete():
                 print("[CHECKPOINT] Interview complete - wrapping up")
                 # Use AI-generated closing if we got one, else fallback
-                ai_response = "Thank you for your time. That concludes our interview. We'll be in touch!"
+                ai_response = CLOSING_MESSAGE
                 self.state.add_message("assistant", ai_response)
+                self._unanswered = None
                 if self.session:
                     self.session.interview_completed = True
                     emit_end_interview(self.session, self.state.conversation_history)
                     emit_generate_report(self.session, self.state.conversation_history)
-                await send_over_ws(self.ws, {"type": "llm_response", "response": ai_response})
+                self._post({"type": "llm_response", "response": ai_response})
                 if self.tts_track:
                     await self._play_tts(ai_response)
                 return
 
-            await send_over_ws(self.ws, {
+            self._post({
                 "type": "ai_status",
                 "status": "thinking"
             })
 
-            current_ctx, next_q, system_prompt, llm_context = self.flow_manager.get_context_for_interviewer_response()
+            # Stream the reply: each complete sentence goes to the client and to
+            # TTS while the rest is still being generated
+            if speculation:
+                stream = speculation.stream
+            else:
+                system_prompt, merged_context = self._reply_context(context)
+                stream = stream_interviewer_response(
+                    self.state.history.prompt_messages(),
+                    system_prompt,
+                    self.metrics,
+                    merged_context,
+                )
+            splitter = SentenceSplitter()
+            sentences: asyncio.Queue = asyncio.Queue()
+            # A barge-in clears the track and bumps its generation: from then on
+            # this turn's audio is stale and the rest of the reply isn't needed
+            generation = self.tts_track.generation if self.tts_track else 0
+            speaker = asyncio.create_task(self._play_tts_stream(sentences, generation)) if self.tts_track else None
 
-            merged_context = {
-                **context,
-                **llm_context,
-                "current_question_context": current_ctx,
-            }
-            if next_q:
-                merged_context["next_question"] = next_q
+            async def forward(sentence: str):
+                self._post({
+                    "type": "llm_response",
+                    "response": stream.text,
+                    "partial": True
+                })
+                sentences.put_nowait(sentence)
 
-            ai_response, move_to_next = await get_interviewer_response(
-                self.state.conversation_history,
-                system_prompt,
-                self.metrics,
-                merged_context,
-            )
+            deltas = aiter(speculation or stream)
+            cancelled = False
+            try:
+                async for delta in deltas:
+                    if self._interrupted(generation):
+                        print("🛑 Reply interrupted - stopping generation")
+                        break
+                    for sentence in splitter.feed(delta):
+                        await forward(sentence)
+                else:
+                    for sentence in splitter.flush():
+                        await forward(sentence)
+            except asyncio.CancelledError:
+                # Turn cancelled: closing the stream below aborts the LLM request
+                cancelled = True
+                if speaker:
+                    speaker.cancel()
+            finally:
+                await deltas.aclose()
+                sentences.put_nowait(None)
+            if cancelled and self._spoke_in != generation:
+                raise asyncio.CancelledError  # the candidate heard none of it: still owed a reply
 
+            # Whatever was spoken is part of the conversation, even if cut off
+            ai_response, move_to_next = stream.text, stream.move_to_next
             self.state.add_message("assistant", ai_response)
+            self._unanswered = None
 
             if move_to_next:
                 # Emit question_evaluate before advancing (we have correct question number)
@@ -247,24 +435,26 @@ class StreamingSpeechProcessor:
                         answer_ended_at=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
                         thinking_time_sec=0,
                         answer_duration_sec=int(answer_dur) if answer_dur else None,
-                        conversation_history=self.state.conversation_history.copy(),
+                        conversation_history=self.state.conversation_history,
                         metrics={
                             "struggling_indicators": self.metrics.struggling_indicators,
                             "confidence_score": context.get("answer_analysis", {}).get("is_confident", False),
                         },
                     )
                 self.flow_manager.advance_to_next_question()
+                self.state.history.mark_question_boundary()
                 self.metrics.start_question()
 
-            # Send text response
-            await send_over_ws(self.ws, {
+            # Final text replaces the partials on the client
+            self._post({
                 "type": "llm_response",
                 "response": ai_response
             })
+            if cancelled:
+                raise asyncio.CancelledError
 
-            # Generate and play TTS audio
-            if self.tts_track:
-                await self._play_tts(ai_response)
+            if speaker and (audio := await speaker):
+                self._last_reply = (ai_response, audio)
 
         except Exception as e:
             print(f"❌ AI response error: {e}")
@@ -278,35 +468,34 @@ class StreamingSpeechProcessor:
             
             # Notify frontend that AI is about to speak
             self.ai_speaking = True
-            await send_over_ws(self.ws, {
+            self._post({
                 "type": "ai_speaking",
                 "speaking": True
             })
             
-            # Generate TTS audio
-            tts_audio = await tts_service.synthesize_speech(text)
+            # Fixed phrases are already synthesized and Opus-encoded
+            phrase = phrase_cache.get(text)
+            if phrase:
+                self.tts_track.add_silence(300)  # 300ms pause before speaking
+                utterance_id = self.tts_track.add_packets(phrase.packets, phrase.pcm)
+                tts_audio = phrase.pcm
+            else:
+                tts_audio = await tts_service.synthesize_speech(text)
+                if tts_audio:
+                    self.tts_track.add_silence(300)  # 300ms pause before speaking
+                    utterance_id = await self.tts_track.add_audio(tts_audio, tts_service.sample_rate)
             
             if tts_audio:
-                # Add to queue
-                self.tts_track.add_silence(300)  # 300ms pause before speaking
-                self.tts_track.add_audio(tts_audio)
-                
                 # Get total duration in queue
                 duration = self.tts_track.get_queue_duration()
                 print(f"✅ TTS audio queued ({duration:.2f}s)")
                 
-                # Schedule notification for when speech ends
-                # Cancel previous task if it exists
-                if self.speech_end_task:
-                    self.speech_end_task.cancel()
-                
-                self.speech_end_task = asyncio.create_task(
-                    self._notify_speech_ended(duration)
-                )
+                # Unmute the frontend as soon as the track has played the last sample
+                await self._notify_speech_ended(utterance_id)
             else:
                 print("❌ Failed to generate TTS audio")
                 self.ai_speaking = False
-                await send_over_ws(self.ws, {
+                self._post({
                     "type": "ai_speaking",
                     "speaking": False
                 })
@@ -314,28 +503,182 @@ class StreamingSpeechProcessor:
         except Exception as e:
             print(f"❌ TTS error: {e}")
             self.ai_speaking = False
-            await send_over_ws(self.ws, {
+            self._post({
                 "type": "ai_speaking",
                 "speaking": False
             })
     
-    async def _notify_speech_ended(self, duration: float):
-        """Notify frontend when AI finishes speaking"""
+    def _local_reply(self, intent: str):
+        """
+        (reply, audio) for a turn matched by the intent matcher, answered
+        without an LLM call; None if it needs the full pipeline after all.
+        """
+        if intent == REPEAT_QUESTION:
+            reply = next((m["content"] for m in reversed(self.state.conversation_history) if m["role"] == "assistant"), None)
+            if not reply:
+                return None
+            # The audio of the last reply is reused when it played in full
+            audio = self._last_reply[1] if self._last_reply and self._last_reply[0] == reply else None
+            self.state.add_message("assistant", reply)
+        elif intent == READY:
+            # Only at the opening. "I'm ready" doesn't answer question 0 (the
+            # self-introduction), so there is nothing to evaluate: ask for the
+            # introduction and stay on it, as the LLM would
+            if not self.flow_manager or self.flow_manager.current_question_index != 0:
+                return None
+            reply, audio = READY_REPLY, None
+            self.state.add_message("assistant", reply)
+        else:
+            return None
+
+        print(f"⚡ Fast path ({intent}): {reply[:50]}")
+        _fast_intents.inc()
+        return reply, audio
+
+    async def _speak_local_reply(self, reply: str, audio: list = None):
+        self._post({"type": "llm_response", "response": reply})
+        if not self.tts_track:
+            return
+        generation = self.tts_track.generation
+        sentences: asyncio.Queue = asyncio.Queue()
+        for item in audio or [reply]:
+            sentences.put_nowait(item)
+        sentences.put_nowait(None)
+        spoken = await self._play_tts_stream(sentences, generation, _fast_intent_latency)
+        if spoken:
+            self._last_reply = (reply, spoken)
+
+    def _interrupted(self, generation: int) -> bool:
+        """True once the track was cleared (user barged in) after `generation` was taken."""
+        return bool(self.tts_track) and self.tts_track.generation != generation
+
+    async def _play_tts_stream(self, sentences: asyncio.Queue, generation: int, latency=None):
+        """
+        Speak sentences as they arrive (None ends the reply). Synthesis starts as
+        soon as a sentence is queued; audio is queued on the track in order until
+        the turn's `generation` is interrupted. Items that are already audio (a
+        CachedPhrase or PCM bytes) are queued as they are. `latency`, if given,
+        gets the time from end of speech to the first queued audio.
+
+        Returns the reply's audio if all of it was queued, else None.
+        """
+        synth_tasks: asyncio.Queue = asyncio.Queue()
+
+        async def synthesize(sentence):
+            if not isinstance(sentence, str):
+                return sentence
+            return phrase_cache.get(sentence) or await tts_service.synthesize_speech(sentence)
+
+        async def start_synthesis():
+            while (sentence := await sentences.get()) is not None:
+                synth_tasks.put_nowait(asyncio.create_task(synthesize(sentence)))
+            synth_tasks.put_nowait(None)
+
+        producer = asyncio.create_task(start_synthesis())
+        utterance_id = None
+        started = False
+        spoken, complete = [], True
         try:
-            # Wait for the audio to finish playing
-            await asyncio.sleep(duration + 0.5)  # Add 0.5s buffer
-            
+            while (task := await synth_tasks.get()) is not None:
+                if self._interrupted(generation):
+                    # User interrupted; drop the rest of the reply
+                    task.cancel()
+                    continue
+                if not started:
+                    # Notify frontend that AI is about to speak
+                    started = True
+                    self._spoke_in = generation
+                    self._cancel_backchannel()
+                    self.ai_speaking = True
+                    self._post({
+                        "type": "ai_speaking",
+                        "speaking": True
+                    })
+                    self.tts_track.add_silence(300)  # 300ms pause before speaking
+                audio = await task
+                if self._interrupted(generation):
+                    continue
+                if isinstance(audio, CachedPhrase):
+                    utterance_id = self.tts_track.add_packets(audio.packets, audio.pcm)
+                elif audio:
+                    utterance_id = await self.tts_track.add_audio(audio, tts_service.sample_rate)
+                else:
+                    complete = False
+                    continue
+                if latency and not spoken:
+                    latency.observe(time.monotonic() - self.speech_ended_at)
+                spoken.append(audio)
+        except Exception as e:
+            print(f"❌ TTS error: {e}")
+            complete = False
+        finally:
+            # On cancellation (or error) nothing else is queued: stop the TTS requests too
+            producer.cancel()
+            while not synth_tasks.empty():
+                if task := synth_tasks.get_nowait():
+                    task.cancel()
+
+        if utterance_id is not None:
+            # Unmute the frontend as soon as the track has played the last sentence
+            await self._notify_speech_ended(utterance_id)
+        elif started and not self._interrupted(generation):
+            print("❌ Failed to generate TTS audio")
             self.ai_speaking = False
-            await send_over_ws(self.ws, {
+            self._post({
                 "type": "ai_speaking",
                 "speaking": False
             })
-            print("🔇 AI finished speaking")
-            
-        except asyncio.CancelledError:
-            # Task was cancelled (likely due to user interruption)
-            print("🛑 Speech notification cancelled (interrupted)")
-            pass
+        if spoken and complete and not self._interrupted(generation):
+            return spoken
+        return None
+
+    def on_speech_started(self):
+        """The candidate started talking again: no filler over them."""
+        self._cancel_backchannel()
+
+    def _schedule_backchannel(self, speech_ended_at: float):
+        if not (BACKCHANNEL_ENABLED and self.tts_track):
+            return
+        self._cancel_backchannel()
+        self.backchannel_task = asyncio.create_task(self._backchannel_after(speech_ended_at))
+
+    def _cancel_backchannel(self):
+        if self.backchannel_task:
+            self.backchannel_task.cancel()
+            self.backchannel_task = None
+        if self.tts_track:
+            self.tts_track.cut_filler()
+
+    async def _backchannel_after(self, speech_ended_at: float):
+        """Play a cached filler if no reply audio is queued within BACKCHANNEL_DELAY_MS of end of speech."""
+        delay = speech_ended_at + BACKCHANNEL_DELAY_MS / 1000 - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.ai_speaking or not self.tts_track.is_empty():
+            return
+        # Only phrases already in the cache: no API calls at turn time
+        phrase = phrase_cache.get(random.choice(BACKCHANNEL_PHRASES))
+        if phrase and self.tts_track.add_filler(phrase.packets, phrase.pcm) is not None:
+            _backchannels.inc()
+            print(f"💬 Backchannel: {phrase.text}")
+
+    async def _notify_speech_ended(self, utterance_id: int):
+        """Notify frontend when the track reports the utterance has finished playing"""
+        finished = await self.tts_track.wait_for_utterance(utterance_id)
+        if not finished:
+            # Queue was cleared (user interruption already notified the frontend)
+            print("🛑 Speech interrupted before it finished")
+            return
+        if self.tts_track.pending_utterances() > 0:
+            # Another utterance is queued behind this one; its own notification will unmute
+            return
+        
+        self.ai_speaking = False
+        self._post({
+            "type": "ai_speaking",
+            "speaking": False
+        })
+        print("🔇 AI finished speaking")
             
     async def _monitor_pauses(self):
         """Monitor for long pauses and provide encouragement"""
@@ -369,7 +712,7 @@ class StreamingSpeechProcessor:
                 
                 if encouragement:
                     print(f"💭 Sending encouragement after {time_since_activity:.1f}s of silence")
-                    await send_over_ws(self.ws, {
+                    self._post({
                         "type": "interviewer_tip",
                         "message": encouragement
                     })
@@ -2,5 +2,14 @@ from src.transport.base import Transport
 from src.transport.websocket import WebSocketTransport
 from src.transport.webrtc_output import WebRTCOutput
 from src.transport.composite import CompositeTransport
+from src.transport.websocket_audio import AUDIO_CODECS, InboundAudioDecoder, WebSocketAudioOutput
 
-__all__ = ["Transport", "WebSocketTransport", "WebRTCOutput", "CompositeTransport"]
+__all__ = [
+    "Transport",
+    "WebSocketTransport",
+    "WebRTCOutput",
+    "CompositeTransport",
+    "WebSocketAudioOutput",
+    "InboundAudioDecoder",
+    "AUDIO_CODECS",
+]
@@ -1,6 +1,8 @@
 """Transport abstraction: Session does not depend on WebSocket/WebRTC directly."""
 
+import asyncio
 from abc import ABC, abstractmethod
+from src.constant import TTS_SAMPLE_RATE
 
 
 class Transport(ABC):
@@ -10,8 +12,8 @@ class Transport(ABC):
         ...
 
     @abstractmethod
-    async def play_audio(self, audio: bytes):
-        """Queue audio for playback (e.g. TTS)."""
+    async def play_audio(self, audio: bytes, sample_rate: int = TTS_SAMPLE_RATE):
+        """Queue 16-bit mono PCM for playback (e.g. TTS). May return a playback id."""
         ...
 
     @abstractmethod
@@ -19,6 +21,22 @@ class Transport(ABC):
         """Add silence before/after audio (e.g. pacing)."""
         ...
 
+    def post(self, msg: dict):
+        """Send a message without waiting for it to go out."""
+        asyncio.ensure_future(self.send(msg))
+
+    def close(self):
+        """Release per-connection resources (e.g. a writer task). No-op if not applicable."""
+        pass
+
+    async def play_phrase(self, phrase):
+        """Queue a CachedPhrase. Transports without a pre-encoded path play its PCM."""
+        return await self.play_audio(phrase.pcm, 48000)
+
     def clear_tts_queue(self):
         """Clear any queued TTS (e.g. on user interrupt). No-op if not applicable."""
         pass
+
+    async def wait_for_playback(self, playback_id) -> bool:
+        """Wait until audio returned by play_audio has played. True if not applicable."""
+        return True
@@ -1,5 +1,6 @@
 """Composite transport: WebSocket for messages + WebRTC for audio."""
 
+from src.constant import TTS_SAMPLE_RATE
 from src.transport.base import Transport
 
 
@@ -11,8 +12,18 @@ class CompositeTransport(Transport):
     async def send(self, msg: dict):
         await self._message.send(msg)
 
-    async def play_audio(self, audio: bytes):
-        await self._audio.play_audio(audio)
+    def post(self, msg: dict):
+        self._message.post(msg)
+
+    def close(self):
+        self._message.close()
+        self._audio.close()
+
+    async def play_audio(self, audio: bytes, sample_rate: int = TTS_SAMPLE_RATE):
+        return await self._audio.play_audio(audio, sample_rate)
+
+    async def play_phrase(self, phrase):
+        return await self._audio.play_phrase(phrase)
 
     def add_silence(self, duration_ms: int):
         self._audio.add_silence(duration_ms)
@@ -21,6 +32,9 @@ class CompositeTransport(Transport):
         if hasattr(self._audio, "clear_tts_queue"):
             self._audio.clear_tts_queue()
 
+    async def wait_for_playback(self, playback_id) -> bool:
+        return await self._audio.wait_for_playback(playback_id)
+
     def get_queue_size(self):
         return getattr(self._audio, "get_queue_size", lambda: 0)()
 
@@ -1,5 +1,6 @@
 """WebRTC TTS output: play audio on the peer connection track."""
 
+from src.constant import TTS_SAMPLE_RATE
 from src.transport.base import Transport
 from src.websocket.webrtc_tts_track import TTSAudioTrack
 
@@ -11,9 +12,16 @@ class WebRTCOutput(Transport):
     async def send(self, msg: dict):
         pass  # WebRTC track doesn't send JSON
 
-    async def play_audio(self, audio: bytes):
+    def post(self, msg: dict):
+        pass
+
+    async def play_audio(self, audio: bytes, sample_rate: int = TTS_SAMPLE_RATE):
         if audio:
-            self.tts_track.add_audio(audio)
+            return await self.tts_track.add_audio(audio, sample_rate)
+        return None
+
+    async def play_phrase(self, phrase):
+        return self.tts_track.add_packets(phrase.packets, phrase.pcm)
 
     def add_silence(self, duration_ms: int):
         self.tts_track.add_silence(duration_ms)
@@ -21,6 +29,9 @@ class WebRTCOutput(Transport):
     def clear_tts_queue(self):
         self.tts_track.clear_queue()
 
+    async def wait_for_playback(self, playback_id) -> bool:
+        return await self.tts_track.wait_for_utterance(playback_id)
+
     def get_queue_size(self):
         return self.tts_track.get_queue_size()
 
@@ -1,18 +1,126 @@
-"""WebSocket transport: send JSON messages only."""
+"""
+WebSocket transport: JSON messages to the client.
+
+Messages go through a bounded per-session queue drained by a writer task, so
+audio processing never waits on the client's network: a slow or backgrounded
+tab only makes its own queue grow. A state message (ai_speaking, partial LLM
+text, ...) that is superseded before it was sent is skipped, and when the
+queue is full the oldest message is dropped.
+"""
+
+import asyncio
+import time
+from collections import deque
 
 from fastapi import WebSocket
-from src.core.helper import send_over_ws
+from src.constant import TTS_SAMPLE_RATE, WS_SEND_QUEUE_SIZE
+from src.core import metrics
+from src.core.helper import encode_json
 from src.transport.base import Transport
 
+# Message types that only carry the latest state: a newer one makes an unsent one moot
+STATE_MESSAGE_TYPES = ("ai_speaking", "user_speaking", "ai_status", "processing")
+
+_queue_depth = metrics.histogram("ws.send_queue_depth")
+_send_latency = metrics.histogram("ws.send_sec")
+_dropped = metrics.counter("ws.send_dropped")
+_coalesced = metrics.counter("ws.send_coalesced")
+
+
+def _coalesce_key(msg: dict):
+    kind = msg.get("type")
+    if kind in STATE_MESSAGE_TYPES:
+        return kind
+    if kind == "llm_response" and msg.get("partial"):
+        return "llm_partial"  # each partial carries the whole reply so far
+    return None
+
 
 class WebSocketTransport(Transport):
-    def __init__(self, ws: WebSocket):
+    def __init__(self, ws: WebSocket, max_queue: int = WS_SEND_QUEUE_SIZE):
         self.ws = ws
+        self.max_queue = max_queue
+        self._queue: deque = deque()  # [coalesce key, message]; message None once superseded
+        self._unsent = {}  # coalesce key -> its queued entry
+        self._ready = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._writer = None
+        self._closed = False
 
     async def send(self, msg: dict):
-        await send_over_ws(self.ws, msg)
+        self.post(msg)
+
+    def post(self, msg: dict):
+        if self._closed:
+            return
+        key = _coalesce_key(msg)
+        superseded = self._unsent.get(key) if key else None
+        if superseded is not None:
+            superseded[1] = None
+            _coalesced.inc()
+        if len(self._queue) >= self.max_queue:
+            oldest = self._queue.popleft()
+            if oldest[1] is not None:
+                _dropped.inc()
+            if oldest[0] and self._unsent.get(oldest[0]) is oldest:
+                del self._unsent[oldest[0]]
+        entry = [key, msg]
+        self._queue.append(entry)
+        if key:
+            self._unsent[key] = entry
+        _queue_depth.observe(len(self._queue))
+        if self._writer is None:
+            self._writer = asyncio.get_running_loop().create_task(self._write())
+        self._idle.clear()
+        self._ready.set()
+
+    async def _write(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._queue:
+                entry = self._queue.popleft()
+                key, msg = entry
+                if key and self._unsent.get(key) is entry:
+                    del self._unsent[key]
+                if msg is None:
+                    continue
+                started = time.perf_counter()
+                try:
+                    await self.ws.send_text(encode_json(msg))
+                except Exception as e:
+                    print('Failed to send data over websocket.')
+                    print(e)
+                    self._closed = True  # the client is gone: stop queueing for it
+                    self._queue.clear()
+                    self._unsent.clear()
+                    self._idle.set()
+                    return
+                _send_latency.observe(time.perf_counter() - started)
+            self._idle.set()
+
+    async def flush(self, timeout: float = 1.0) -> bool:
+        """Wait until everything queued has been written. False on timeout."""
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def close(self):
+        self._closed = True
+        self._queue.clear()
+        self._unsent.clear()
+        if self._writer:
+            self._writer.cancel()
+            self._writer = None
+        self._idle.set()
 
-    async def play_audio(self, audio: bytes):
+    async def play_audio(self, audio: bytes, sample_rate: int = TTS_SAMPLE_RATE):
         pass  # WebSocket alone doesn't play audio
 
     def add_silence(self, duration_ms: int):
@@ -0,0 +1,130 @@
+"""
+Audio over the WebSocket as binary messages: a lighter alternative to WebRTC
+for a one-to-one voice stream on a socket that is open anyway (no ICE,
+DTLS-SRTP or RTP; PCM mode needs no codec at all).
+
+Selected with ?audio=pcm or ?audio=opus on the /ws URL (default: webrtc).
+Every binary message is one 20ms frame, in both directions:
+  pcm:  16kHz mono s16le (640 bytes)
+  opus: one 48kHz mono Opus packet
+Text messages stay JSON (WebSocketTransport).
+
+Outbound audio still comes from a TTSAudioTrack paced by the shared media
+clock, so playback ids, interruptions and fillers work as on the WebRTC path.
+Silent frames aren't sent: the client plays each frame as it arrives and a
+gap is silence.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+import av
+import numpy as np
+from aiortc.mediastreams import MediaStreamError
+from av import Packet
+
+from src.core import metrics
+from src.media.audio.opus import OpusStreamEncoder, silent_opus_payload
+from src.transport.webrtc_output import WebRTCOutput
+from src.websocket.audio_bufffer import StreamingResampler, downsample_48k_to_16k
+from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+AUDIO_CODECS = ("pcm", "opus")
+PCM_FRAME_SAMPLES = 320  # 20ms at 16kHz
+
+_frames_sent = metrics.counter("ws_audio.frames_sent")
+_frames_received = metrics.counter("ws_audio.frames_received")
+_decode_errors = metrics.counter("ws_audio.decode_errors")
+
+
+class InboundAudioDecoder:
+    """Client frames (pcm or opus) to 16kHz mono int16 PCM for AudioPipeline.ingest()."""
+
+    def __init__(self, codec: str):
+        self.codec = codec
+        self._opus = None
+        if codec == "opus":
+            self._opus = av.CodecContext.create("libopus", "r")
+            self._opus.format = "s16"
+            self._opus.layout = "mono"
+            self._opus.sample_rate = 48000
+
+    def decode(self, data: bytes) -> np.ndarray:
+        _frames_received.inc()
+        if self._opus is None:
+            return np.frombuffer(data[:len(data) - len(data) % 2], dtype="<i2").astype(np.int16)
+        try:
+            frames = self._opus.decode(Packet(data))
+        except (av.error.FFmpegError, ValueError) as e:
+            _decode_errors.inc()
+            print(f"⚠️  Dropping undecodable Opus frame: {e}")
+            return np.zeros(0, dtype=np.int16)
+        if not frames:
+            return np.zeros(0, dtype=np.int16)
+        pcm_48k = np.concatenate([frame.to_ndarray().reshape(-1) for frame in frames])
+        return downsample_48k_to_16k(pcm_48k)
+
+
+class WebSocketAudioOutput(WebRTCOutput):
+    """
+    Plays TTS like WebRTCOutput (same track API), but a sender task takes the
+    track's frames off the media clock and writes them as binary messages.
+    """
+
+    def __init__(self, tts_track: TTSAudioTrack, send_bytes: Callable[[bytes], Awaitable], codec: str = "pcm"):
+        super().__init__(tts_track)
+        self.codec = codec
+        self._send_bytes = send_bytes
+        self._sender: Optional[asyncio.Task] = None
+        self._resampler = StreamingResampler(tts_track.sample_rate, 16000)
+        self._pcm = np.zeros(0, dtype=np.int16)  # resampled, not yet sent as a full frame
+        self._encoder: Optional[OpusStreamEncoder] = None
+        if codec == "opus":
+            # Cached phrases and silence go out as their pre-encoded packets
+            tts_track.passthrough_enabled = True
+
+    def start(self):
+        if self._sender is None:
+            self._sender = asyncio.create_task(self._send_frames())
+
+    def close(self):
+        if self._sender:
+            self._sender.cancel()
+            self._sender = None
+
+    async def _send_frames(self):
+        while True:
+            try:
+                frame = await self.tts_track.recv()
+            except MediaStreamError:
+                return
+            payload = self._payload(frame)
+            if payload is None:
+                continue
+            try:
+                await self._send_bytes(payload)
+            except Exception as e:
+                print(f"Audio send failed, stopping WebSocket audio output: {e}")
+                return
+            _frames_sent.inc()
+
+    def _payload(self, frame) -> Optional[bytes]:
+        """Binary message for one 20ms frame, or None for silence."""
+        if isinstance(frame, Packet):
+            payload = bytes(frame)
+            return None if payload == silent_opus_payload() else payload
+        samples = frame.to_ndarray().reshape(-1)
+        if self.codec == "opus":
+            if not samples.any():
+                return None
+            if self._encoder is None:
+                self._encoder = OpusStreamEncoder()
+            packets, _ = self._encoder.encode(samples)
+            return packets[0] if packets else None
+        # The resampler keeps filter state across frames, so run it on silence too.
+        # Its output length varies at first (filter delay): re-frame to PCM_FRAME_SAMPLES.
+        self._pcm = np.concatenate([self._pcm, self._resampler.process(samples)])
+        if len(self._pcm) < PCM_FRAME_SAMPLES:
+            return None
+        pcm, self._pcm = self._pcm[:PCM_FRAME_SAMPLES], self._pcm[PCM_FRAME_SAMPLES:]
+        return pcm.tobytes() if pcm.any() else None
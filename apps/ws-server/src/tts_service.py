@@ -1,61 +1,143 @@
 import asyncio
+import os
+import time
+from typing import Optional
 import numpy as np
-from google.cloud import texttospeech
+from src.constant import TTS_SAMPLE_RATE
+from src.core import metrics
+from src.services.tts import TTSBackend, create_backend
 
 class TTSService:
-    """Google Cloud Text-to-Speech service"""
+    """
+    Text-to-Speech service. Delegates synthesis to a TTSBackend selected by
+    TTS_BACKEND ("google" by default, "local" for offline synthetic speech).
+
+    Applies a deadline to every request, a process-wide concurrency limit and an
+    optional hedged second request once the first runs past a latency
+    percentile. If TTS_FALLBACK_BACKEND is set, failed requests are retried on
+    that backend so sessions keep getting audio when the primary is unreachable.
+    """
     
-    def __init__(self):
-        self.client = texttospeech.TextToSpeechClient()
-        
-        # Voice configuration
-        self.voice = texttospeech.VoiceSelectionParams(
-            language_code="en-US",
-            name="en-US-Neural2-D",  # Male, calm interviewer voice
-            # Other good options:
-            # "en-US-Neural2-A" - Male, more energetic
-            # "en-US-Neural2-C" - Female, professional
-            # "en-US-Neural2-F" - Female, warm
-        )
-        
-        # Audio configuration - use LINEAR16 for better quality and easier processing
-        self.audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.LINEAR16,
-            sample_rate_hertz=16000,  # 16kHz for WebRTC compatibility
-            speaking_rate=1.0,  # Normal speed (0.25 to 4.0)
-            pitch=0.0,  # Normal pitch (-20.0 to 20.0)
-        )
+    def __init__(self, sample_rate: int = TTS_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.backend: TTSBackend = create_backend(os.getenv("TTS_BACKEND", "google"), sample_rate)
+        self.fallback: Optional[TTSBackend] = create_backend(os.getenv("TTS_FALLBACK_BACKEND"), sample_rate)
+
+        # Latency policy (env-tunable)
+        self.timeout = float(os.getenv("TTS_TIMEOUT_SEC", "8"))
+        self.max_concurrency = max(1, int(os.getenv("TTS_MAX_CONCURRENCY", "16")))
+        # Percentile of recent latency after which a hedged request is sent (0 disables)
+        self.hedge_percentile = float(os.getenv("TTS_HEDGE_PERCENTILE", "95"))
+        self.hedge_min_samples = 20
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        self._latency = metrics.histogram("tts.latency_sec")
+        self._requests = metrics.counter("tts.requests")
+        self._errors = metrics.counter("tts.errors")
+        self._timeouts = metrics.counter("tts.timeouts")
+        self._hedged = metrics.counter("tts.hedged")
+        self._hedge_wins = metrics.counter("tts.hedge_wins")
+        self._fallbacks = metrics.counter("tts.fallbacks")
+        self._in_flight = metrics.gauge("tts.in_flight")
+        print(f"🔊 TTS backend: {self.backend.name}" + (f" (fallback: {self.fallback.name})" if self.fallback else ""))
     
     async def synthesize_speech(self, text: str) -> bytes:
         """
         Convert text to speech audio
         
         Returns:
-            bytes: Raw PCM audio data (16-bit, 16kHz, mono)
+            bytes: Raw PCM audio data (16-bit, mono, at self.sample_rate), or b'' on failure
+        """
+        audio, _ = await self.synthesize_with_voice(text)
+        return audio
+
+    async def synthesize_with_voice(self, text: str) -> tuple[bytes, Optional[str]]:
+        """
+        Like synthesize_speech, also returning the voice_id of the backend that
+        produced the audio (the fallback's when the primary failed), or None on failure.
         """
         if not text:
-            return b''
+            return b'', None
         
-        # Run synthesis in thread pool (blocking operation)
-        return await asyncio.to_thread(self._synthesize_blocking, text)
-    
-    def _synthesize_blocking(self, text: str) -> bytes:
-        """Blocking synthesis call"""
+        async with self._semaphore:
+            self._requests.inc()
+            self._in_flight.inc()
+            start = time.perf_counter()
+            try:
+                # Backends bound each request; wait_for bounds the whole hedged call
+                audio = await asyncio.wait_for(
+                    self._synthesize_hedged(text, deadline=start + self.timeout),
+                    timeout=self.timeout,
+                )
+                self._latency.observe(time.perf_counter() - start)
+                print(f"🔊 Generated TTS audio: {len(audio)} bytes")
+                return audio, self.backend.voice_id
+            except asyncio.TimeoutError as e:
+                self._timeouts.inc()
+                self._errors.inc()
+                print(f"❌ TTS timed out after {time.perf_counter() - start:.2f}s: {e}")
+            except Exception as e:
+                self._errors.inc()
+                print(f"❌ TTS Error: {e}")
+            finally:
+                self._in_flight.dec()
+
+        return await self._synthesize_fallback(text)
+
+    async def _synthesize_fallback(self, text: str) -> tuple[bytes, Optional[str]]:
+        """Degraded mode: serve the utterance from the fallback backend, if configured."""
+        if not self.fallback:
+            return b'', None
+        self._fallbacks.inc()
         try:
-            synthesis_input = texttospeech.SynthesisInput(text=text)
-            
-            response = self.client.synthesize_speech(
-                input=synthesis_input,
-                voice=self.voice,
-                audio_config=self.audio_config
-            )
-            
-            print(f"🔊 Generated TTS audio: {len(response.audio_content)} bytes")
-            return response.audio_content
-            
+            audio = await self.fallback.synthesize(text, timeout=self.timeout)
+            print(f"🔊 Generated fallback TTS audio ({self.fallback.name}): {len(audio)} bytes")
+            return audio, self.fallback.voice_id
         except Exception as e:
-            print(f"❌ TTS Error: {e}")
-            return b''
+            print(f"❌ Fallback TTS Error: {e}")
+            return b'', None
+
+    def _hedge_delay(self) -> Optional[float]:
+        """Latency after which a second request is worth sending, None if hedging is off."""
+        if self.hedge_percentile <= 0 or len(self._latency) < self.hedge_min_samples:
+            return None
+        return self._latency.percentile(self.hedge_percentile)
+
+    async def _synthesize_hedged(self, text: str, deadline: float) -> bytes:
+        first = asyncio.create_task(self._request(text, deadline))
+        delay = self._hedge_delay()
+        if delay is None or delay >= deadline - time.perf_counter():
+            return await first
+
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        # First request is in the slow tail - race a second one (another channel for Google)
+        self._hedged.inc()
+        second = asyncio.create_task(self._request(text, deadline))
+        pending = {first, second}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self._hedge_wins.inc()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _request(self, text: str, deadline: float) -> bytes:
+        """Single backend request bounded by the caller's deadline."""
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("TTS deadline exceeded before request was sent")
+        return await self.backend.synthesize(text, timeout=remaining)
     
     async def text_to_pcm_chunks(self, text: str, chunk_duration_ms: int = 20) -> list:
         """
@@ -77,8 +159,7 @@ class TTSService:
         audio_array = np.frombuffer(audio_data, dtype=np.int16)
         
         # Calculate chunk size in samples
-        sample_rate = 16000
-        chunk_size = int(sample_rate * chunk_duration_ms / 1000)
+        chunk_size = int(self.sample_rate * chunk_duration_ms / 1000)
         
         # Split into chunks
         chunks = []
@@ -1,4 +1,5 @@
-from typing import Union
+from math import gcd
+from typing import Optional, Union
 
 import numpy as np
 from scipy import signal
@@ -38,3 +39,79 @@ def downsample_48k_to_16k(pcm_48k: np.ndarray) -> np.ndarray:
     return result
 
 
+class StreamingResampler:
+    """
+    Polyphase FIR resampler that keeps filter state between calls, so an
+    utterance can be converted block by block instead of in one FFT pass.
+    Output of chunked processing is identical to processing the whole signal.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, taps_per_phase: int = 24):
+        g = gcd(in_rate, out_rate)
+        self.up = out_rate // g
+        self.down = in_rate // g
+
+        # Low-pass at the narrower of the two Nyquist bands, gain-compensated for zero stuffing
+        num_taps = taps_per_phase * max(self.up, self.down) + 1
+        taps = signal.firwin(num_taps, 1.0 / max(self.up, self.down), window=("kaiser", 5.0)) * self.up
+
+        # Split into `up` phases of `taps_per_phase` coefficients: phases[p, k] = taps[p + k*up]
+        self._phase_len = -(-num_taps // self.up)
+        padded = np.zeros(self._phase_len * self.up, dtype=np.float32)
+        padded[:num_taps] = taps
+        self._phases = padded.reshape(self._phase_len, self.up).T.copy()
+
+        self._history = np.zeros(self._phase_len - 1, dtype=np.float32)
+        self._in_pos = 0  # input samples consumed so far
+        self._out_pos = 0  # next output sample index
+        # Skip the filter's group delay so output lines up with input
+        self._group_delay = (num_taps - 1) // 2 // self.down
+        self._delay = self._group_delay
+        self._emitted = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample the next block of int16 samples. Returns int16 samples."""
+        if self.up == self.down:
+            return samples.astype(np.int16, copy=True)
+        out = self._process(samples.astype(np.float32))
+        return self._emit(out)
+
+    def flush(self) -> np.ndarray:
+        """Drain the filter tail once the last block has been processed."""
+        if self.up == self.down:
+            return np.array([], dtype=np.int16)
+        expected = -(-self._in_pos * self.up // self.down)
+        tail_in = -(-(self._group_delay + 1) * self.down // self.up) + 1
+        out = self._process(np.zeros(tail_in, dtype=np.float32), advance=False)
+        return self._emit(out, limit=expected)
+
+    def _process(self, x: np.ndarray, advance: bool = True) -> np.ndarray:
+        ext = np.concatenate([self._history, x])
+        in_end = self._in_pos + len(x)
+        out_end = -(-in_end * self.up // self.down)
+
+        out = np.array([], dtype=np.float32)
+        if out_end > self._out_pos:
+            m = np.arange(self._out_pos, out_end)
+            base = m * self.down // self.up
+            phase = m * self.down - base * self.up
+
+            # window[m, k] = x[base_m - k], read from history + new block
+            local = (base - self._in_pos + self._phase_len - 1)[:, None] - np.arange(self._phase_len)
+            out = np.einsum("ij,ij->i", ext[local], self._phases[phase])
+            self._out_pos = out_end
+
+        self._history = ext[len(ext) - len(self._history):]
+        # Zero padding fed by flush() is not real input
+        self._in_pos = in_end if advance else self._in_pos
+        return out
+
+    def _emit(self, out: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+        if self._delay:
+            skip = min(self._delay, len(out))
+            out = out[skip:]
+            self._delay -= skip
+        if limit is not None:
+            out = out[:max(0, limit - self._emitted)]
+        self._emitted += len(out)
+        return np.clip(np.round(out), -32768, 32767).astype(np.int16)
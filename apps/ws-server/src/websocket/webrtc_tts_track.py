@@ -1,11 +1,46 @@
 import asyncio
-import time
 import numpy as np
 from aiortc import MediaStreamTrack
-from av import AudioFrame
+from aiortc.mediastreams import MediaStreamError
+from av import AudioFrame, Packet
 from fractions import Fraction
 from collections import deque
-from scipy import signal
+from dataclasses import dataclass
+from typing import Callable, Optional
+from src.constant import TTS_SAMPLE_RATE, TTS_SILENCE_SUPPRESSION
+from src.core import metrics
+from src.media.audio.clock import media_clock
+from src.media.audio.opus import OpusStreamEncoder, make_packet, silent_opus_payload
+from src.websocket.audio_bufffer import StreamingResampler
+
+# Shared all-zero frame payload; AudioFrame.from_ndarray copies it
+_SILENCE = np.zeros(960, dtype=np.int16)
+_FILLER_FADE_SAMPLES = 480  # 10ms fade when a filler is cut on the PCM path
+
+_frames_encoded = metrics.counter("tts_track.frames_encoded")
+_frames_suppressed = metrics.counter("tts_track.frames_suppressed")
+_frames_cached = metrics.counter("tts_track.frames_cached")  # packets encoded before playback
+
+
+@dataclass
+class _PacketRun:
+    """Pre-encoded Opus packets queued with their PCM, for when aiortc's encoder must run."""
+    packets: list[bytes]
+    pcm: np.ndarray  # len(packets) * 960 samples at 48kHz
+
+    def __len__(self):
+        return len(self.pcm)
+
+
+@dataclass
+class _Utterance:
+    """Span of the output stream, in samples, occupied by one queued utterance."""
+    id: int
+    start: Optional[int]  # None until its turn to be queued comes
+    finished: asyncio.Future
+    end: Optional[int] = None  # None while samples are still being queued
+    started: bool = False
+
 
 class TTSAudioTrack(MediaStreamTrack):
     """
@@ -15,7 +50,28 @@ class TTSAudioTrack(MediaStreamTrack):
     
     def __init__(self):
         super().__init__()
-        self.audio_queue = deque()
+        self.audio_queue = deque()  # int16 chunks (or _PacketRun) at self.sample_rate
+        self._head_offset = 0  # samples already played from audio_queue[0]
+        self._queued_samples = 0
+        self._generation = 0  # bumped on clear_queue so in-flight adds are dropped
+
+        # Playback cursor: samples ever queued vs. samples handed to the encoder
+        self._write_pos = 0
+        self._play_pos = 0
+        self._utterances: deque[_Utterance] = deque()
+        self._next_utterance_id = 0
+        self._drain_waiters: list[asyncio.Future] = []
+        self._listeners: list[Callable[[str, Optional[int]], None]] = []
+        self._filler: Optional[_Utterance] = None  # backchannel cut by the next queued audio
+
+        # Adds are queued in call order. add_audio() calls convert one at a time
+        # (the lock is FIFO), and a sync add made while any is unfinished waits
+        # in _deferred until the add_audio() calls before it are done, so two
+        # callers never interleave their samples.
+        self._enqueue_lock = asyncio.Lock()
+        self._audio_calls = 0
+        self._audio_pending: set[int] = set()  # add_audio() calls not finished yet
+        self._deferred: deque = deque()  # (last add_audio() call before it, generation, fn)
         
         # Use 48kHz mono - will let WebRTC handle stereo conversion if needed
         self.sample_rate = 48000
@@ -24,43 +80,60 @@ class TTSAudioTrack(MediaStreamTrack):
         self._timestamp = 0
         self._frame_count = 0
 
-        # Track timing to maintain real-time playback
-        self._start_time = None
+        # Frames handed out so far; the media clock paces against this
+        self._clock_origin = 0
         self._frames_sent = 0
+
+        # Pre-encoded output. Only safe once the peer negotiated Opus, since
+        # aiortc forwards returned packets without re-encoding.
+        self.passthrough_enabled = False
+        self._encoder: Optional[OpusStreamEncoder] = None  # for frames not encoded at enqueue
+        self.frames_encoded = 0
+        self.frames_suppressed = 0
+        self.frames_cached = 0
         
         print(f"🎵 TTSAudioTrack initialized: {self.sample_rate}Hz, {self.channels}ch, {self.samples_per_frame} samples/frame")
     
     async def recv(self):
         """
-        Called by WebRTC to get the next audio frame (every ~20ms)
+        Called by WebRTC to get the next audio frame (every ~20ms).
+        Pacing comes from the shared media clock, which builds the frame on its tick.
         """
+        if self.readyState != "live":
+            raise MediaStreamError
+        return await media_clock.next_frame(self)
 
-        # 1. Handle Timing/Pacing
-        if self._start_time is None:
-            self._start_time = time.time()
-            
-        # Calculate when the NEXT frame should be sent
-        # (frames_sent * 0.020 seconds)
-        next_frame_time = self._start_time + (self._frames_sent * 0.020)
-        now = time.time()
-
-        # Wait until it's actually time to send this frame
-        wait_time = next_frame_time - now
-        if wait_time > 0:
-            await asyncio.sleep(wait_time)
-        
-        # 2. Get samples from the queue
+    def _next_frame(self):
+        """
+        Build the next 20ms frame from the queue (silence if empty).
+
+        Once packets can be sent, everything after the first frame goes out as
+        an Opus packet on the same 48kHz RTP timeline: cached phrases and audio
+        encoded at enqueue as-is, silence as one pre-encoded silent packet. The
+        rest is encoded here. aiortc's encoder is never fed again after a gap:
+        its resampler would stamp that frame with a stale (backwards) timestamp.
+        """
         num_samples = self.samples_per_frame
-        samples = np.zeros(num_samples, dtype=np.int16)
-        
-        # Efficiently pull from deque
-        available = len(self.audio_queue)
-        actual_to_pull = min(available, num_samples)
-        
-        for i in range(actual_to_pull):
-            samples[i] = self.audio_queue.popleft()
+        if self._queued_samples > 0:
+            payload = self._pull_packet()
+            if payload is not None:
+                self._update_playback()
+                self.frames_cached += 1
+                _frames_cached.inc()
+                return self._send_packet(payload)
+            samples = self._pull_samples(num_samples)
+            self._update_playback()
+        else:
+            samples = _SILENCE
+
+        if self._can_send_packets():
+            if TTS_SILENCE_SUPPRESSION and not samples.any():
+                self.frames_suppressed += 1
+                _frames_suppressed.inc()
+                return self._send_packet(silent_opus_payload())
+            return self._send_packet(self._encode(samples))
         
-        # 3. Create the AudioFrame
+        # Create the AudioFrame
         # Reshape to (channels, samples)
         samples_2d = samples.reshape(1, -1)
         frame = AudioFrame.from_ndarray(samples_2d, format='s16', layout='mono')
@@ -73,100 +146,363 @@ class TTSAudioTrack(MediaStreamTrack):
         # Increment for next call
         self._timestamp += num_samples
         self._frames_sent += 1
+        self.frames_encoded += 1
+        _frames_encoded.inc()
         
         return frame
+
+    def _can_send_packets(self) -> bool:
+        # The first frame must go through the encoder: it anchors the RTP
+        # timestamps to our pts, which the pre-encoded packets then follow.
+        return self.passthrough_enabled and self.frames_encoded > 0
+
+    def _encode(self, samples: np.ndarray) -> bytes:
+        """Encode one frame on the track's own encoder (audio that wasn't encoded at enqueue)."""
+        if self._encoder is None:
+            self._encoder = OpusStreamEncoder()
+        packets, _ = self._encoder.encode(samples)
+        self.frames_encoded += 1
+        _frames_encoded.inc()
+        return packets[0]
+
+    def _pull_packet(self) -> Optional[bytes]:
+        """Next cached Opus packet, if the queue head is a packet run on a frame boundary."""
+        if not self.audio_queue or not self._can_send_packets():
+            return None
+        head = self.audio_queue[0]
+        if not isinstance(head, _PacketRun) or self._head_offset % self.samples_per_frame:
+            return None
+        payload = head.packets[self._head_offset // self.samples_per_frame]
+        self._pull_samples(self.samples_per_frame)  # advance the cursor past its PCM
+        return payload
+
+    def _send_packet(self, payload: bytes) -> Packet:
+        packet = make_packet(payload, self._timestamp)
+        self._timestamp += self.samples_per_frame
+        self._frames_sent += 1
+        return packet
+
+    def _pull_samples(self, num_samples: int) -> np.ndarray:
+        """Copy up to num_samples from the chunk queue, padding with silence."""
+        samples = np.zeros(num_samples, dtype=np.int16)
+        filled = 0
+        while filled < num_samples and self.audio_queue:
+            chunk = self.audio_queue[0]
+            if isinstance(chunk, _PacketRun):
+                chunk = chunk.pcm
+            take = min(num_samples - filled, len(chunk) - self._head_offset)
+            samples[filled:filled + take] = chunk[self._head_offset:self._head_offset + take]
+            filled += take
+            self._head_offset += take
+            if self._head_offset >= len(chunk):
+                self.audio_queue.popleft()
+                self._head_offset = 0
+        self._queued_samples -= filled
+        self._play_pos += filled
+        return samples
+
+    def _pad_to_frame(self):
+        """Pad the queue with silence so the next packet run starts on a frame boundary."""
+        pad = -self._queued_samples % self.samples_per_frame
+        if pad:
+            self._enqueue(np.zeros(pad, dtype=np.int16))
+
+    def _enqueue(self, samples):
+        if len(samples) == 0:
+            return
+        self.audio_queue.append(samples)
+        self._queued_samples += len(samples)
+        self._write_pos += len(samples)
+
+    # -------------------------
+    # Playback events
+    # -------------------------
+
+    def add_listener(self, callback: Callable[[str, Optional[int]], None]):
+        """
+        Register callback(event, utterance_id) for playback events:
+        "utterance_started", "utterance_finished", "utterance_interrupted", "queue_drained".
+        """
+        self._listeners.append(callback)
+
+    def _emit(self, event: str, utterance_id: Optional[int] = None):
+        for callback in self._listeners:
+            try:
+                callback(event, utterance_id)
+            except Exception as e:
+                print(f"❌ Playback listener error: {e}")
+
+    def _update_playback(self):
+        """Fire utterance/drain events the playback cursor has just passed."""
+        while self._utterances:
+            utterance = self._utterances[0]
+            if utterance.start is None:
+                break  # reserved, waiting for an earlier add_audio() to finish converting
+            if not utterance.started and self._play_pos > utterance.start:
+                utterance.started = True
+                self._emit("utterance_started", utterance.id)
+            if utterance.end is None or self._play_pos < utterance.end:
+                break
+            self._utterances.popleft()
+            if not utterance.finished.done():
+                utterance.finished.set_result(True)
+            self._emit("utterance_finished", utterance.id)
+
+        if self._queued_samples == 0:
+            self._resolve_drain_waiters()
+            self._emit("queue_drained")
+
+    def _resolve_drain_waiters(self):
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._drain_waiters.clear()
+
+    async def wait_for_utterance(self, utterance_id: int) -> bool:
+        """
+        Wait until the utterance's last sample has been played.
+        Returns False if it was interrupted (queue cleared) first.
+        """
+        for utterance in self._utterances:
+            if utterance.id == utterance_id:
+                return await asyncio.shield(utterance.finished)
+        # Already played out (or never queued)
+        return True
+
+    async def wait_until_drained(self):
+        """Wait until everything currently queued has been played (or cleared)."""
+        if self._queued_samples == 0:
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._drain_waiters.append(waiter)
+        await waiter
+
+    def pending_utterances(self) -> int:
+        return len(self._utterances)
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever the queue is cleared; audio produced for an older generation is stale."""
+        return self._generation
     
-        # # Get audio data from queue or silence
-        # if len(self.audio_queue) >= self.samples_per_frame:
-        #     samples = np.array([self.audio_queue.popleft() for _ in range(self.samples_per_frame)], dtype=np.int16)
-        # else:
-        #     # Drain remaining samples and pad with silence
-        #     remaining_samples = []
-        #     while len(self.audio_queue) > 0:
-        #         remaining_samples.append(self.audio_queue.popleft())
-            
-        #     if len(remaining_samples) > 0:
-        #         padding = np.zeros(self.samples_per_frame - len(remaining_samples), dtype=np.int16)
-        #         samples = np.concatenate([np.array(remaining_samples, dtype=np.int16), padding])
-        #     else:
-        #         samples = np.zeros(self.samples_per_frame, dtype=np.int16)
-        
-        # # Ensure samples is 1D array
-        # samples = samples.flatten()
-        
-        # # Reshape to (1, samples) for mono
-        # samples_2d = samples.reshape(1, -1)
-        
-        # # Create audio frame with explicit format
-        # frame = AudioFrame.from_ndarray(
-        #     samples_2d,
-        #     format='s16',
-        #     layout='mono'
-        # )
-        
-        # frame.sample_rate = self.sample_rate
-        # frame.pts = self._timestamp
-        # frame.time_base = Fraction(1, self.sample_rate)
-        
-        # # Update timestamp
-        # self._timestamp += self.samples_per_frame
-        # self._frame_count += 1
-        
-        # # Periodic logging
-        # if self._frame_count % 50 == 0:
-        #     queue_duration = len(self.audio_queue) / self.sample_rate
-        #     print(f"📤 Frame {self._frame_count}: Queue={len(self.audio_queue)} samples ({queue_duration:.2f}s)")
-        
-        # await asyncio.sleep(0.001)
-        
-        # return frame
-    
-    def add_audio(self, audio_data: bytes):
+    async def add_audio(self, audio_data: bytes, sample_rate: int = TTS_SAMPLE_RATE) -> Optional[int]:
         """
-        Add PCM audio data (16kHz mono) - will be resampled to 48kHz
+        Add PCM audio data (16-bit mono). Audio already at the track rate is queued
+        as-is; other rates are resampled block by block in a worker thread, so
+        playback can start before the whole utterance is converted. When the peer
+        negotiated Opus, each block is also encoded to packets in that thread.
+        Concurrent calls are queued whole, one after the other, in call order.
+
+        Returns an utterance id for wait_for_utterance(), or None for empty audio.
         """
         if not audio_data:
             print("⚠️  Empty audio data")
-            return
-        
-        # Convert to int16 array
-        audio_16k = np.frombuffer(audio_data, dtype=np.int16)
-        
-        # Resample to 48kHz
-        audio_48k = self._resample_16k_to_48k(audio_16k)
+            return None
+        self._audio_calls += 1
+        call = self._audio_calls
+        self._audio_pending.add(call)
+        generation = self._generation
+        utterance = self._reserve_utterance()
+        try:
+            async with self._enqueue_lock:
+                if generation == self._generation:  # else cleared while an earlier call was converting
+                    await self._queue_audio(utterance, audio_data, sample_rate, generation)
+        finally:
+            self._audio_pending.discard(call)
+            self._run_deferred()
+        return utterance.id
+
+    async def _queue_audio(self, utterance: _Utterance, audio_data: bytes, sample_rate: int, generation: int):
+        self.cut_filler()  # real audio replaces any backchannel
         
-        # Add to queue
-        for sample in audio_48k:
-            self.audio_queue.append(sample)
+        audio = np.frombuffer(audio_data, dtype=np.int16)
+        resampler = StreamingResampler(sample_rate, self.sample_rate) if sample_rate != self.sample_rate else None
+        encoder = OpusStreamEncoder() if self.passthrough_enabled else None
+        if encoder:
+            self._pad_to_frame()
+        utterance.start = self._write_pos
+
+        if resampler is None and encoder is None:
+            self._enqueue(audio)
+            queued = len(audio)
+        else:
+            block = sample_rate // 2  # 500ms of input per step
+            queued = 0
+            for start in range(0, len(audio), block):
+                converted = await asyncio.to_thread(_convert, audio[start:start + block], resampler, encoder)
+                if generation != self._generation:
+                    # Queue was cleared (user interrupted) while we were converting
+                    return
+                self._enqueue(converted)
+                queued += len(converted)
+            tail = _convert_tail(resampler, encoder)
+            self._enqueue(tail)
+            queued += len(tail)
+        utterance.end = self._write_pos
         
-        duration = len(audio_48k) / self.sample_rate
-        print(f"🎵 Added {len(audio_16k)}@16kHz -> {len(audio_48k)}@48kHz ({duration:.2f}s)")
-        print(f"   Queue: {len(self.audio_queue)} samples ({len(self.audio_queue)/self.sample_rate:.2f}s)")
+        duration = queued / self.sample_rate
+        print(f"🎵 Added {len(audio)}@{sample_rate}Hz -> {queued}@{self.sample_rate}Hz ({duration:.2f}s)")
+        print(f"   Queue: {self._queued_samples} samples ({self.get_queue_duration():.2f}s)")
+
+    def _reserve_utterance(self) -> _Utterance:
+        """Take the next utterance id and its place in playback order; start is set once it's queued."""
+        utterance = _Utterance(
+            id=self._next_utterance_id,
+            start=None,
+            finished=asyncio.get_running_loop().create_future(),
+        )
+        self._next_utterance_id += 1
+        self._utterances.append(utterance)
+        return utterance
+
+    def _after_pending_audio(self, fn: Callable[[], None]):
+        """Run fn now, or once every add_audio() call made before this one has queued its audio."""
+        if self._audio_pending:
+            self._deferred.append((self._audio_calls, self._generation, fn))
+        else:
+            fn()
+
+    def _run_deferred(self):
+        first_pending = min(self._audio_pending, default=None)
+        while self._deferred:
+            after, generation, fn = self._deferred[0]
+            if first_pending is not None and after >= first_pending:
+                break
+            self._deferred.popleft()
+            if generation == self._generation:  # else cut off by clear_queue()
+                fn()
     
-    def _resample_16k_to_48k(self, audio_16k: np.ndarray) -> np.ndarray:
-        """Resample using scipy"""
-        audio_float = audio_16k.astype(np.float32)
-        num_samples = int(len(audio_16k) * 3)
-        audio_resampled = signal.resample(audio_float, num_samples)
-        audio_resampled = np.clip(audio_resampled, -32768, 32767)
-        return audio_resampled.astype(np.int16)
+    def add_packets(self, packets: list[bytes], pcm: bytes) -> Optional[int]:
+        """
+        Queue a pre-encoded utterance: 20ms Opus packets plus the same audio as
+        48kHz 16-bit PCM. Packets are sent as-is when the peer negotiated Opus;
+        otherwise (or before the encoder has run once) the PCM is encoded as usual.
+
+        Returns an utterance id for wait_for_utterance(), or None if empty.
+        """
+        if not packets:
+            return None
+        frame = self.samples_per_frame
+        run = np.zeros(len(packets) * frame, dtype=np.int16)
+        audio = np.frombuffer(pcm, dtype=np.int16)[:len(run)]
+        run[:len(audio)] = audio
+
+        utterance = self._reserve_utterance()
+
+        def queue():
+            self.cut_filler()
+            # Start the run on a frame boundary so every packet maps to one frame
+            self._pad_to_frame()
+            utterance.start = self._write_pos
+            self._enqueue(_PacketRun(packets, run))
+            utterance.end = self._write_pos
+            print(f"🎵 Added {len(packets)} cached Opus packets ({len(run) / self.sample_rate:.2f}s)")
+
+        self._after_pending_audio(queue)
+        return utterance.id
     
+    def add_filler(self, packets: list[bytes], pcm: bytes) -> Optional[int]:
+        """
+        Queue a short backchannel ("Mm-hmm") to mask response latency. Only
+        plays into an empty queue, and is cut as soon as anything else is added.
+        """
+        if self._queued_samples > 0 or self._audio_pending:
+            return None
+        utterance_id = self.add_packets(packets, pcm)
+        if utterance_id is not None:
+            self._filler = self._utterances[-1]
+        return utterance_id
+
+    def is_playing_filler(self) -> bool:
+        """True while a backchannel filler is all that's queued (it isn't interviewer speech)."""
+        return self._filler is not None and self._filler.end is not None and self._play_pos < self._filler.end
+
+    def cut_filler(self):
+        """Drop the unplayed rest of a backchannel filler, fading out on the PCM path."""
+        filler, self._filler = self._filler, None
+        if filler is None or filler.end is None or self._play_pos >= filler.end:
+            return
+        # Nothing else is queued: every add_* call cuts the filler first
+        keep = np.zeros(0, dtype=np.int16)
+        head = self.audio_queue[0] if self.audio_queue else None
+        if head is not None and not (isinstance(head, _PacketRun) and self._can_send_packets()):
+            pcm = head.pcm if isinstance(head, _PacketRun) else head
+            tail = pcm[self._head_offset:self._head_offset + _FILLER_FADE_SAMPLES]
+            keep = (tail * np.linspace(1.0, 0.0, len(tail))).astype(np.int16)
+        # Packets stop on a frame boundary; Opus smooths the transition itself
+
+        self.audio_queue.clear()
+        self._head_offset = 0
+        self._queued_samples = 0
+        self._write_pos = self._play_pos
+        if len(keep):
+            self.audio_queue.append(keep)
+            self._queued_samples = len(keep)
+            self._write_pos += len(keep)
+        filler.end = self._write_pos
+        if not len(keep):
+            self._update_playback()
+        print("✂️  Backchannel filler cut")
+
     def add_silence(self, duration_ms: int):
         """Add silence"""
         num_samples = int(self.sample_rate * duration_ms / 1000)
-        for _ in range(num_samples):
-            self.audio_queue.append(0)
-        print(f"🔇 Added {duration_ms}ms silence ({num_samples} samples)")
+
+        def queue():
+            self.cut_filler()
+            self._enqueue(np.zeros(num_samples, dtype=np.int16))
+            print(f"🔇 Added {duration_ms}ms silence ({num_samples} samples)")
+
+        self._after_pending_audio(queue)
     
     def get_queue_size(self):
-        return len(self.audio_queue)
+        return self._queued_samples
     
     def get_queue_duration(self):
-        return len(self.audio_queue) / self.sample_rate
+        return self._queued_samples / self.sample_rate
     
     def clear_queue(self):
+        self._filler = None
         self.audio_queue.clear()
+        self._head_offset = 0
+        self._queued_samples = 0
+        self._write_pos = self._play_pos
+        self._generation += 1
+
+        # Everything still pending was cut off
+        while self._utterances:
+            utterance = self._utterances.popleft()
+            if not utterance.finished.done():
+                utterance.finished.set_result(False)
+            self._emit("utterance_interrupted", utterance.id)
+        self._resolve_drain_waiters()
         print("🗑️  Queue cleared")
     
     def is_empty(self):
-        return len(self.audio_queue) == 0
\ No newline at end of file
+        return self._queued_samples == 0
+
+    def stop(self):
+        # recv() won't be called again, so nothing queued will ever play:
+        # release everyone waiting on an utterance or on the drain
+        self.clear_queue()
+        media_clock.unregister(self)
+        super().stop()
+
+
+def _convert(block: np.ndarray, resampler: Optional[StreamingResampler], encoder: Optional[OpusStreamEncoder]):
+    """Resample and/or encode one block of an utterance (runs in a worker thread)."""
+    if resampler:
+        block = resampler.process(block)
+    if encoder:
+        return _PacketRun(*encoder.encode(block))
+    return block
+
+
+def _convert_tail(resampler: Optional[StreamingResampler], encoder: Optional[OpusStreamEncoder]):
+    """The samples the resampler and encoder still hold at the end of an utterance."""
+    tail = resampler.flush() if resampler else np.zeros(0, dtype=np.int16)
+    if encoder:
+        packets, pcm = encoder.encode(tail)
+        flushed_packets, flushed_pcm = encoder.flush()
+        return _PacketRun(packets + flushed_packets, np.concatenate([pcm, flushed_pcm]))
+    return tail
@@ -1,7 +1,23 @@
 import json
 import asyncio
 from aiortc import RTCPeerConnection, RTCSessionDescription
+from aiortc.sdp import SessionDescription
 from fastapi import WebSocket, WebSocketDisconnect
+from src.websocket.webrtc_tts_track import TTSAudioTrack
+
+
+def enable_opus_passthrough(pc: RTCPeerConnection):
+    """Let TTS tracks send pre-encoded Opus packets once Opus is the negotiated codec."""
+    description = SessionDescription.parse(pc.localDescription.sdp)
+    audio = next((m for m in description.media if m.kind == "audio"), None)
+    if audio is None or not audio.rtp.codecs:
+        return
+    if audio.rtp.codecs[0].mimeType.lower() != "audio/opus":
+        print(f"⚠️  Negotiated {audio.rtp.codecs[0].mimeType}, silence suppression disabled")
+        return
+    for sender in pc.getSenders():
+        if isinstance(sender.track, TTSAudioTrack):
+            sender.track.passthrough_enabled = True
 
 
 async def handle_websocket_message(ws: WebSocket, pc: RTCPeerConnection, should_stop: asyncio.Event):
@@ -25,6 +41,7 @@ async def handle_websocket_message(ws: WebSocket, pc: RTCPeerConnection, should_
                 answer = await pc.createAnswer()
                 print(f"📋 Answer SDP:\n{answer.sdp}")
                 await pc.setLocalDescription(answer)
+                enable_opus_passthrough(pc)
 
                 await ws.send_text(json.dumps({
                     'type': pc.localDescription.type,